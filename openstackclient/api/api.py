@@ -13,15 +13,28 @@
 
 """Base API Library"""
 
+import copy
+import itertools
+
 import simplejson as json
 
 from keystoneauth1 import exceptions as ks_exceptions
-from keystoneauth1 import session as ks_session
 from osc_lib import exceptions
+from oslo_utils import uuidutils
 
+from openstackclient.common import cache
+from openstackclient.common import profiling
+from openstackclient.common import streaming
+from openstackclient.common import transport
 from openstackclient.i18n import _
 
 
+# Seconds that resources found by name or ID are remembered
+FIND_CACHE_TTL = 60
+
+_MISSING = object()
+
+
 class KeystoneSession(object):
     """Wrapper for the Keystone Session
 
@@ -72,7 +85,7 @@ class KeystoneSession(object):
         if not session:
             session = self.session
         if not session:
-            session = ks_session.Session()
+            session = transport.get_default_session()
 
         if self.endpoint:
             if url:
@@ -87,6 +100,13 @@ class KeystoneSession(object):
 class BaseAPI(KeystoneSession):
     """Base API"""
 
+    # Attributes the server filters each listing on, keyed by the listing
+    # path without leading or trailing slashes
+    _server_filters = {}
+    # Page size find_bulk() lists with if the listings take limit and
+    # marker, None lists everything in one request
+    _bulk_page_size = None
+
     def __init__(
         self,
         session=None,
@@ -108,6 +128,15 @@ class BaseAPI(KeystoneSession):
         super(BaseAPI, self).__init__(session=session, endpoint=endpoint)
 
         self.service_type = service_type
+        self._find_cache = cache.MemoryCache(FIND_CACHE_TTL)
+
+    def _request(self, method, url, session=None, **kwargs):
+        # A resource remembered by find_attr() may have been changed,
+        # deleted or replaced by one with the same name
+        if method not in ('GET', 'HEAD'):
+            self._find_cache.clear()
+        return super(BaseAPI, self)._request(
+            method, url, session=session, **kwargs)
 
     # The basic action methods all take a Session and return dict/lists
 
@@ -205,6 +234,7 @@ class BaseAPI(KeystoneSession):
     # Layered actions built on top of the basic action methods do not
     # explicitly take a Session but one may still be passed in kwargs
 
+    @profiling.in_phase('resolve')
     def find_attr(
         self,
         path,
@@ -220,6 +250,11 @@ class BaseAPI(KeystoneSession):
         unwrap these bodies and return a single dict without any resource
         wrappers.
 
+        A UUID-shaped value searched by name is fetched directly by ID;
+        other values take a single filtered list, and a second one by ID
+        only when nothing matched.  Found resources are remembered for
+        FIND_CACHE_TTL seconds.
+
         :param string path:
             The API-specific portion of the URL path
         :param string value:
@@ -241,6 +276,11 @@ class BaseAPI(KeystoneSession):
         if resource is None:
             resource = path
 
+        key = ('find_attr', path, attr, value, resource)
+        ret = self._find_cache.get(key)
+        if ret is not None:
+            return copy.deepcopy(ret)
+
         def getlist(kw):
             """Do list call, unwrap resource dict if present"""
             ret = self.list(path, **kw)
@@ -248,13 +288,22 @@ class BaseAPI(KeystoneSession):
                 ret = ret[resource]
             return ret
 
+        # A UUID is looked up directly, it is not expected as a name
+        if attr == 'name' and uuidutils.is_uuid_like(value):
+            ret = self._get_one(path, value)
+            if ret is not None:
+                self._find_cache.set(key, ret)
+                return copy.deepcopy(ret)
+
         # Search by attribute
         kwargs = {attr: value}
         data = getlist(kwargs)
         if isinstance(data, dict):
-            return data
+            self._find_cache.set(key, data)
+            return copy.deepcopy(data)
         if len(data) == 1:
-            return data[0]
+            self._find_cache.set(key, data[0])
+            return copy.deepcopy(data[0])
         if len(data) > 1:
             msg = _("Multiple %(resource)s exist with %(attr)s='%(value)s'")
             raise exceptions.CommandError(
@@ -263,11 +312,13 @@ class BaseAPI(KeystoneSession):
                        'value': value}
             )
 
-        # Search by id
-        kwargs = {'id': value}
-        data = getlist(kwargs)
-        if len(data) == 1:
-            return data[0]
+        # Search by id, unless it was already looked up
+        if not (attr == 'name' and uuidutils.is_uuid_like(value)):
+            kwargs = {'id': value}
+            data = getlist(kwargs)
+            if len(data) == 1:
+                self._find_cache.set(key, data[0])
+                return copy.deepcopy(data[0])
         msg = _("No %(resource)s with a %(attr)s or ID of '%(value)s' found")
         raise exceptions.CommandError(
             msg % {'resource': resource,
@@ -280,7 +331,12 @@ class BaseAPI(KeystoneSession):
         path,
         **kwargs
     ):
-        """Bulk load and filter locally
+        """Find the resources matching all the given attributes
+
+        The attributes the server can filter the listing on, as declared
+        in _server_filters, are sent as query parameters and only the
+        others are compared locally.  When _bulk_page_size is set the
+        listing is walked with limit and marker.
 
         :param string path:
             The API-specific portion of the URL path
@@ -289,22 +345,9 @@ class BaseAPI(KeystoneSession):
         :returns: list of resource dicts
         """
 
-        items = self.list(path)
-        if isinstance(items, dict):
-            # strip off the enclosing dict
-            key = list(items.keys())[0]
-            items = items[key]
-
-        ret = []
-        for o in items:
-            try:
-                if all(o[attr] == kwargs[attr] for attr in kwargs.keys()):
-                    ret.append(o)
-            except KeyError:
-                continue
-
-        return ret
+        return list(self._iter_bulk(path, kwargs))
 
+    @profiling.in_phase('resolve')
     def find_one(
         self,
         path,
@@ -312,13 +355,16 @@ class BaseAPI(KeystoneSession):
     ):
         """Find a resource by name or ID
 
+        The listing stops as soon as a second match shows the resource
+        is not unique.
+
         :param string path:
             The API-specific portion of the URL path
         :returns:
             resource dict
         """
 
-        bulk_list = self.find_bulk(path, **kwargs)
+        bulk_list = list(itertools.islice(self._iter_bulk(path, kwargs), 2))
         num_bulk = len(bulk_list)
         if num_bulk == 0:
             msg = _("none found")
@@ -328,6 +374,62 @@ class BaseAPI(KeystoneSession):
             raise RuntimeError(msg)
         return bulk_list[0]
 
+    def _iter_bulk(self, path, filters, server_filters=None, paginate=True):
+        """Yield the resources of a listing matching all of filters
+
+        :param dict filters:
+            the attributes and values to match
+        :param server_filters:
+            the attributes the server filters on, defaults to the ones
+            declared for path in _server_filters
+        :param bool paginate:
+            walk the listing with limit and marker if _bulk_page_size is
+            set, otherwise make a single request
+        """
+
+        key = path.strip('/')
+        if server_filters is None:
+            server_filters = self._server_filters.get(key, ())
+        params = dict(
+            (attr, value) for attr, value in filters.items()
+            if attr in server_filters
+        )
+        local_filters = [
+            (attr, value) for attr, value in filters.items()
+            if attr not in server_filters
+        ]
+
+        def _list(**kwargs):
+            return self._unwrap(self.list(path, **kwargs), key)
+
+        if paginate and self._bulk_page_size:
+            params['limit'] = self._bulk_page_size
+            items = streaming.iter_pages(_list, **params)
+        else:
+            items = _list(**params)
+
+        for o in items:
+            # A resource without one of the attributes does not match
+            if all(o.get(attr, _MISSING) == value
+                   for attr, value in local_filters):
+                yield o
+
+    @staticmethod
+    def _unwrap(items, key):
+        """Strip off the dict enclosing a listing
+
+        Prefer the entry named after a component of the listing path,
+        as some bodies also carry links, e.g. {'images': [], 'next': ...}
+        """
+
+        if not isinstance(items, dict):
+            return items
+        for name in key.split('/'):
+            if isinstance(items.get(name), list):
+                return items[name]
+        return items[list(items.keys())[0]]
+
+    @profiling.in_phase('resolve')
     def find(
         self,
         path,
@@ -336,6 +438,11 @@ class BaseAPI(KeystoneSession):
     ):
         """Find a single resource by name or ID
 
+        A UUID-shaped value is fetched directly by ID.  Other values are
+        searched with a list filtered by attr on the server, then fetched
+        as an ID if nothing matched.  Found resources are remembered for
+        FIND_CACHE_TTL seconds.
+
         :param string path:
             The API-specific portion of the URL path
         :param string value:
@@ -344,14 +451,55 @@ class BaseAPI(KeystoneSession):
             name of attribute for secondary search
         """
 
+        key = ('find', path, attr, value)
+        ret = self._find_cache.get(key)
+        if ret is not None:
+            return copy.deepcopy(ret)
+
+        # A UUID is fetched directly; other values are searched by attr
+        # first and only then tried as an ID
+        ret = None
+        if uuidutils.is_uuid_like(value) or not attr:
+            ret = self._get_one(path, value, unwrap=False)
+        if ret is None and attr:
+            data = list(itertools.islice(self._iter_bulk(
+                "/%s/detail" % path,
+                {attr: value},
+                server_filters=(attr,),
+                paginate=False,
+            ), 2))
+            if len(data) > 1:
+                msg = _("many found")
+                raise RuntimeError(msg)
+            if data:
+                ret = data[0]
+            elif not uuidutils.is_uuid_like(value):
+                ret = self._get_one(path, value, unwrap=False)
+        if ret is None:
+            msg = _("%s not found") % value
+            raise exceptions.NotFound(msg)
+
+        self._find_cache.set(key, ret)
+        return copy.deepcopy(ret)
+
+    def _get_one(self, path, value, unwrap=True):
+        """GET a single resource, return None if it does not exist
+
+        :param bool unwrap:
+            return the resource dict of a body wrapping it as the only
+            key, e.g. {'server': {...}}
+        """
+
         try:
-            ret = self._request('GET', "/%s/%s" % (path, value)).json()
+            ret = self._request('GET', "/%s/%s" % (path.strip('/'), value))
         except ks_exceptions.NotFound:
-            kwargs = {attr: value}
-            try:
-                ret = self.find_one("/%s/detail" % (path), **kwargs)
-            except ks_exceptions.NotFound:
-                msg = _("%s not found") % value
-                raise exceptions.NotFound(msg)
-
+            return None
+        try:
+            ret = ret.json()
+        except json.JSONDecodeError:
+            return None
+        if unwrap and isinstance(ret, dict) and len(ret) == 1:
+            body = list(ret.values())[0]
+            if isinstance(body, dict):
+                ret = body
         return ret
@@ -21,6 +21,13 @@ class APIv1(api.BaseAPI):
 
     _endpoint_suffix = 'v1'
 
+    _server_filters = {
+        'images': ('name', 'status', 'container_format', 'disk_format'),
+        'images/detail': ('name', 'status', 'container_format',
+                          'disk_format'),
+    }
+    _bulk_page_size = 1000
+
     def __init__(self, endpoint=None, **kwargs):
         super(APIv1, self).__init__(endpoint=endpoint, **kwargs)
 
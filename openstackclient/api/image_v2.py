@@ -13,7 +13,25 @@
 
 """Image v2 API Library"""
 
+import hashlib
+import json
+import os
+import threading
+
+from keystoneauth1 import exceptions as ks_exceptions
+from osc_lib import exceptions
+
 from openstackclient.api import image_v1
+from openstackclient.common import parallel
+from openstackclient.i18n import _
+
+
+# Bytes fetched by each range request of a concurrent image download
+DOWNLOAD_RANGE_SIZE = 16 * 1024 * 1024
+# Bytes read and written at a time while downloading
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Suffix of the file recording the progress of a concurrent download
+PROGRESS_SUFFIX = '.progress'
 
 
 class APIv2(image_v1.APIv1):
@@ -21,6 +39,11 @@ class APIv2(image_v1.APIv1):
 
     _endpoint_suffix = 'v2'
 
+    _server_filters = {
+        'images': ('name', 'status', 'visibility', 'owner',
+                   'container_format', 'disk_format', 'member_status'),
+    }
+
     def _munge_url(self):
         # Hack this until discovery is up, and ignore parent endpoint setting
         if 'v2' not in self.endpoint.split('/')[-1]:
@@ -72,3 +95,225 @@ class APIv2(image_v1.APIv1):
             url += "/detail"
 
         return self.list(url, **filter)['images']
+
+    def image_import_methods(self):
+        """Get the interoperable image import methods of the service
+
+        :returns:
+            list of import method names, empty if image import is not
+            available
+        """
+
+        try:
+            info = self.list('/info/import')
+        except ks_exceptions.NotFound:
+            return []
+        return info.get('import-methods', {}).get('value', [])
+
+    def image_stage(
+        self,
+        image_id,
+        data,
+    ):
+        """Upload image data to the staging area of an image
+
+        :param image_id:
+            ID of the image
+        :param data:
+            iterable of the data chunks, sent with chunked transfer encoding
+        """
+
+        self._request(
+            'PUT',
+            '/images/%s/stage' % image_id,
+            data=data,
+            headers={'Content-Type': 'application/octet-stream'},
+        )
+
+    def image_import(
+        self,
+        image_id,
+        method='glance-direct',
+        uri=None,
+    ):
+        """Start importing the data of an image
+
+        :param image_id:
+            ID of the image
+        :param method:
+            import method, 'glance-direct' imports the staged data and
+            'web-download' has the service fetch uri
+        :param uri:
+            URL of the data for the 'web-download' method
+        """
+
+        body = {'method': {'name': method}}
+        if uri:
+            body['method']['uri'] = uri
+        self._request(
+            'POST',
+            '/images/%s/import' % image_id,
+            json=body,
+        )
+
+    def image_download(
+        self,
+        image_id,
+        file,
+        size,
+        checksum=None,
+        workers=1,
+        range_size=DOWNLOAD_RANGE_SIZE,
+    ):
+        """Download the data of an image with concurrent range requests
+
+        The file is preallocated as a sparse file and every range is
+        written in place as it arrives.  Finished ranges are hashed in
+        order, so the MD5 is computed while downloading, and the length
+        of the finished prefix is recorded in <file>.progress.  A later
+        call for the same image data resumes from there.
+
+        :param image_id:
+            ID of the image
+        :param file:
+            local file name
+        :param integer size:
+            size of the image data
+        :param checksum:
+            checksum of the image, identifies the data a progress file
+            belongs to
+        :param integer workers:
+            number of ranges downloaded at the same time
+        :param integer range_size:
+            bytes fetched by each range request
+        :returns:
+            hashlib MD5 object of the data, or None if the service does
+            not support range requests, in which case file is removed
+        """
+
+        progress = file + PROGRESS_SUFFIX
+        state = {
+            'image': image_id,
+            'checksum': checksum,
+            'size': size,
+            'range_size': range_size,
+        }
+        done = 0
+        if os.path.isfile(progress) and os.path.isfile(file):
+            with open(progress) as f:
+                try:
+                    saved = json.load(f)
+                except ValueError:
+                    saved = {}
+            if all(saved.get(k) == v for k, v in state.items()):
+                done = min(saved.get('done', 0), size)
+
+        md5 = hashlib.md5()
+        supported = True
+        writer = _RangeWriter(file, size)
+        try:
+            # Ranges finished by the interrupted download
+            for chunk in writer.iter_read(0, done, DOWNLOAD_CHUNK_SIZE):
+                md5.update(chunk)
+
+            def _fetch(start):
+                end = min(start + range_size, size)
+                response = self._request(
+                    'GET',
+                    '/images/%s/file' % image_id,
+                    stream=True,
+                    headers={'Range': 'bytes=%d-%d' % (start, end - 1)},
+                )
+                if response.status_code != 206:
+                    response.close()
+                    raise _RangeNotSupported()
+                offset = start
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    writer.write(chunk, offset)
+                    offset += len(chunk)
+                if offset != end:
+                    msg = _("Short read downloading bytes %(start)d-%(end)d "
+                            "of image %(image)s") % {
+                        'start': start, 'end': end - 1, 'image': image_id}
+                    raise exceptions.CommandError(msg)
+                return end
+
+            results = parallel.imap(
+                _fetch, range(done, size, range_size), workers)
+            try:
+                for start, end, e in results:
+                    if isinstance(e, _RangeNotSupported):
+                        supported = False
+                        break
+                    if e is not None:
+                        raise e
+                    for chunk in writer.iter_read(
+                            start, end, DOWNLOAD_CHUNK_SIZE):
+                        md5.update(chunk)
+                    done = end
+                    state['done'] = done
+                    with open(progress, 'w') as f:
+                        json.dump(state, f)
+            finally:
+                # Let the running requests finish before closing the file
+                results.close()
+        finally:
+            writer.close()
+
+        if os.path.isfile(progress):
+            os.remove(progress)
+        if not supported:
+            os.remove(file)
+            return None
+        return md5
+
+
+class _RangeNotSupported(Exception):
+    """The service answered a range request with the whole data"""
+
+
+class _RangeWriter(object):
+    """Write and read back byte ranges of a preallocated file
+
+    os.pwrite() and os.pread() let several threads use the file at once;
+    where they are not available a lock serializes seek and write.
+    """
+
+    def __init__(self, file, size):
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self.fd = os.open(file, flags, 0o644)
+        # Extending the file leaves a hole, so nothing is written yet
+        os.ftruncate(self.fd, size)
+        self._lock = threading.Lock()
+
+    def write(self, data, offset):
+        if hasattr(os, 'pwrite'):
+            while data:
+                written = os.pwrite(self.fd, data, offset)
+                data = data[written:]
+                offset += written
+            return
+        with self._lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            while data:
+                data = data[os.write(self.fd, data):]
+
+    def read(self, length, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(self.fd, length, offset)
+        with self._lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            return os.read(self.fd, length)
+
+    def iter_read(self, start, end, chunk_size):
+        while start < end:
+            chunk = self.read(min(chunk_size, end - start), start)
+            if not chunk:
+                return
+            yield chunk
+            start += len(chunk)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -13,15 +13,59 @@
 
 """Object Store v1 API Library"""
 
+import calendar
+import functools
+import hashlib
 import io
 import logging
 import os
+import time
 
+import simplejson as json
+
+from keystoneauth1 import exceptions as ks_exceptions
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 from six.moves import urllib
 
 from openstackclient.api import api
+from openstackclient.common import parallel
+from openstackclient.common import streaming
+from openstackclient.i18n import _
+
+
+# Pseudo-directory separator used to split a listing into shards
+SHARD_DELIMITER = '/'
+# Entries fetched when splitting one pseudo-directory level; a level with
+# more entries is split into ranges of names instead
+SHARD_PROBE_LIMIT = 1000
+# Objects handed over at a time by a shard listed ahead of the consumer
+SHARD_PAGE_SIZE = 1000
+# Pages a shard listed ahead of the consumer holds at most
+SHARD_QUEUE_PAGES = 2
+# Objects per bulk-delete request when /info does not give the limit
+BULK_DELETE_LIMIT = 10000
+# Attempts to delete an object answered with 409 Conflict or 503
+DELETE_ATTEMPTS = 3
+# Delay before the second attempt, doubled for each further one (seconds)
+DELETE_RETRY_DELAY = 1
+# Bytes read from the network and written to disk at a time when saving
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Bytes read from a file at a time when checksumming segments
+SEGMENT_CHUNK_SIZE = 1024 * 1024
+# Suffix of the file an object is downloaded to before being renamed
+PARTIAL_SUFFIX = '.part'
+# Segment size of files too large for a single object when none is given
+SEGMENT_SIZE = 1024 * 1024 * 1024
+# Largest object when /info does not say, the Swift default
+MAX_FILE_SIZE = 5 * 1024 * 1024 * 1024 + 2
+# Largest Static Large Object manifest when /info does not say
+MAX_MANIFEST_SEGMENTS = 1000
+# Suffix of the container holding the segments of large objects
+SEGMENTS_SUFFIX = '_segments'
+
+LOG = logging.getLogger(__name__)
 
 
 class APIv1(api.BaseAPI):
@@ -29,6 +73,37 @@ class APIv1(api.BaseAPI):
 
     def __init__(self, **kwargs):
         super(APIv1, self).__init__(**kwargs)
+        self._capabilities = None
+        self._account_id = None
+
+    def get_capabilities(self):
+        """Get the capabilities the cluster publishes at /info
+
+        The result is cached for the life of the API object.
+
+        :returns:
+            dict of capabilities, empty if they are not available
+        """
+
+        if self._capabilities is None:
+            try:
+                response = self.session.request(self._info_url(), 'GET')
+                capabilities = response.json()
+            except (ks_exceptions.ClientException, ValueError) as e:
+                LOG.debug("Unable to get the cluster capabilities: %s", e)
+                capabilities = None
+            if not isinstance(capabilities, dict):
+                capabilities = {}
+            self._capabilities = capabilities
+        return self._capabilities
+
+    def _info_url(self):
+        # /info lives at the root of the proxy, above /v1/<account>
+        url = (self.endpoint or '').rstrip('/')
+        index = url.rfind('/v1')
+        if index >= 0:
+            url = url[:index]
+        return url + '/info'
 
     def container_create(
         self,
@@ -92,25 +167,13 @@ class APIv1(api.BaseAPI):
         params['format'] = 'json'
 
         if all_data:
-            data = listing = self.container_list(
+            return list(self.container_iter(
                 limit=limit,
                 marker=marker,
                 end_marker=end_marker,
                 prefix=prefix,
                 **params
-            )
-            while listing:
-                marker = listing[-1]['name']
-                listing = self.container_list(
-                    limit=limit,
-                    marker=marker,
-                    end_marker=end_marker,
-                    prefix=prefix,
-                    **params
-                )
-                if listing:
-                    data.extend(listing)
-            return data
+            ))
 
         if limit:
             params['limit'] = limit
@@ -123,19 +186,97 @@ class APIv1(api.BaseAPI):
 
         return self.list('', **params)
 
+    def container_iter(
+        self,
+        limit=None,
+        marker=None,
+        end_marker=None,
+        prefix=None,
+        **params
+    ):
+        """Iterate over all containers in an account
+
+        Containers are fetched one page at a time as the iteration
+        proceeds, so the full listing is never held in memory.
+
+        :param integer limit:
+            page size
+        :param string marker:
+            query marker
+        :param string end_marker:
+            query end_marker
+        :param string prefix:
+            query prefix
+        :returns:
+            generator of container dicts
+        """
+
+        return streaming.iter_pages(
+            self.container_list,
+            marker=marker,
+            marker_f=_get_name,
+            limit=limit,
+            end_marker=end_marker,
+            prefix=prefix,
+            **params
+        )
+
     def container_save(
         self,
         container=None,
+        workers=1,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
     ):
         """Save all the content from a container
 
+        Objects are listed and downloaded with up to workers concurrent
+        requests.  Local files whose size and MD5 match the listing are
+        skipped and interrupted downloads are resumed, see object_save().
+
         :param string container:
             name of container to save
+        :param integer workers:
+            maximum number of concurrent listing and download requests
+        :param integer chunk_size:
+            bytes read and written at a time
+        :returns:
+            list of (object name, error) tuples for the objects that could
+            not be saved
         """
 
-        objects = self.object_list(container=container)
-        for object in objects:
-            self.object_save(container=container, object=object['name'])
+        objects = self.object_iter_parallel(
+            container=container,
+            workers=workers,
+        )
+        save_f = functools.partial(
+            self._object_sync,
+            container,
+            chunk_size=chunk_size,
+        )
+        failures = []
+        for object, _result, e in parallel.imap(save_f, objects, workers):
+            if e is not None:
+                failures.append((object['name'], e))
+        return failures
+
+    def _object_sync(self, container, object, chunk_size):
+        """Save a listed object unless the local copy is current"""
+
+        name = object['name']
+        if name.endswith('/'):
+            # Pseudo-directory marker
+            _makedirs(name)
+            return
+        if (os.path.isfile(name) and
+                os.path.getsize(name) == object.get('bytes') and
+                _file_md5(name, chunk_size) == object.get('hash')):
+            return
+        self.object_save(
+            container=container,
+            object=name,
+            chunk_size=chunk_size,
+            resume=True,
+        )
 
     def container_set(
         self,
@@ -215,15 +356,25 @@ class APIv1(api.BaseAPI):
         container=None,
         object=None,
         name=None,
+        segment_size=None,
+        workers=1,
     ):
         """Create an object inside a container
 
+        Files larger than segment_size, or than the cluster's largest
+        object when segment_size is not given, are uploaded as a large
+        object, see object_create_segmented().
+
         :param string container:
             name of container to store object
         :param string object:
             local path to object
         :param string name:
             name of object to create
+        :param integer segment_size:
+            upload files larger than this in segments of this size
+        :param integer workers:
+            maximum number of segments uploaded at a time
         :returns:
             dict of returned headers
         """
@@ -236,6 +387,24 @@ class APIv1(api.BaseAPI):
         # object's name in the container.
         object_name_str = name if name else object
 
+        try:
+            size = os.path.getsize(object)
+        except OSError:
+            # Let the upload report the error
+            size = 0
+        if not segment_size and size > SEGMENT_SIZE:
+            swift = self.get_capabilities().get('swift', {})
+            if size > swift.get('max_file_size', MAX_FILE_SIZE):
+                segment_size = SEGMENT_SIZE
+        if segment_size and size > segment_size:
+            return self.object_create_segmented(
+                container=container,
+                object=object,
+                name=object_name_str,
+                segment_size=segment_size,
+                workers=workers,
+            )
+
         full_url = "%s/%s" % (urllib.parse.quote(container),
                               urllib.parse.quote(object_name_str))
         with io.open(object, 'rb') as f:
@@ -254,6 +423,185 @@ class APIv1(api.BaseAPI):
 
         return data
 
+    def object_create_many(
+        self,
+        container=None,
+        objects=None,
+        segment_size=None,
+        workers=1,
+        skip_unchanged=False,
+    ):
+        """Create many objects, up to workers at a time
+
+        Each file is uploaded as an object named after its path.  When a
+        single file is given the workers upload its segments instead.
+
+        :param string container:
+            name of container to store the objects
+        :param objects:
+            list of local paths to upload
+        :param integer segment_size:
+            upload files larger than this in segments of this size
+        :param integer workers:
+            maximum number of concurrent uploads
+        :param boolean skip_unchanged:
+            list the container first and skip the files whose object has
+            the same size and is newer than the file or has the same MD5
+        :returns:
+            list of (path, dict of returned headers, exception) tuples in
+            the order of objects; the dict is None for skipped files and
+            exception is None when the upload succeeded
+        """
+
+        names = dict((path, path.replace(os.sep, '/')) for path in objects)
+        listing = {}
+        if skip_unchanged and objects:
+            prefix = os.path.commonprefix(list(names.values()))
+            for row in self.object_iter_parallel(container=container,
+                                                 prefix=prefix,
+                                                 workers=workers):
+                listing[row.get('name')] = row
+
+        def _upload(path):
+            if _unchanged(path, listing.get(names[path])):
+                return None
+            return self.object_create(
+                container=container,
+                object=path,
+                name=names[path],
+                segment_size=segment_size,
+                workers=workers if len(objects) == 1 else 1,
+            )
+
+        return parallel.execute(_upload, objects, workers)
+
+    def object_create_segmented(
+        self,
+        container=None,
+        object=None,
+        name=None,
+        segment_size=SEGMENT_SIZE,
+        workers=1,
+    ):
+        """Upload a file as a large object
+
+        The file is split into segments uploaded, up to workers at a time,
+        to <container>_segments as <name>/<mtime>/<size>/<segment_size>/
+        <index>.  The MD5 of each segment is computed while it is sent and
+        checked against the returned ETag.  Segments already uploaded with
+        the same size and MD5, e.g. by an interrupted run, are not sent
+        again.  A Static Large Object manifest is then written, or a
+        Dynamic Large Object manifest if the cluster does not support SLO
+        or the file has too many segments for one.
+
+        :param string container:
+            name of container to store object
+        :param string object:
+            local path to object
+        :param string name:
+            name of object to create, defaults to object
+        :param integer segment_size:
+            size of the segments
+        :param integer workers:
+            maximum number of segments uploaded at a time
+        :returns:
+            dict of returned headers
+        """
+
+        name = name or object
+        stat = os.stat(object)
+        segment_container = container + SEGMENTS_SUFFIX
+        prefix = '%s/%f/%d/%d/' % (
+            name, stat.st_mtime, stat.st_size, segment_size)
+        self.container_create(container=segment_container)
+
+        existing = {}
+        for row in self.object_iter(container=segment_container,
+                                    prefix=prefix):
+            existing[row['name']] = row
+
+        segments = []
+        for index, offset in enumerate(
+                six.moves.range(0, stat.st_size, segment_size)):
+            segments.append((
+                '%s%08d' % (prefix, index),
+                offset,
+                min(segment_size, stat.st_size - offset),
+            ))
+
+        def _upload(segment):
+            segment_name, offset, length = segment
+            row = existing.get(segment_name)
+            if (row and row.get('bytes') == length and
+                    row.get('hash') == _file_md5(object, SEGMENT_CHUNK_SIZE,
+                                                 offset, length)):
+                return row['hash']
+            return self._segment_create(
+                segment_container, segment_name, object, offset, length)
+
+        etags = []
+        for segment, etag, e in parallel.execute(_upload, segments, workers):
+            if e is not None:
+                raise e
+            etags.append(etag)
+
+        path = "%s/%s" % (urllib.parse.quote(container),
+                          urllib.parse.quote(name))
+        slo = self.get_capabilities().get('slo')
+        if slo is not None and len(segments) <= slo.get(
+                'max_manifest_segments', MAX_MANIFEST_SEGMENTS):
+            manifest = [{
+                'path': '/%s/%s' % (segment_container, segment_name),
+                'etag': etag,
+                'size_bytes': length,
+            } for (segment_name, _offset, length), etag in zip(segments,
+                                                               etags)]
+            response = self._request(
+                'PUT',
+                path,
+                params={'multipart-manifest': 'put'},
+                data=json.dumps(manifest),
+            )
+        else:
+            response = self._request(
+                'PUT',
+                path,
+                data=b'',
+                headers={
+                    'X-Object-Manifest': '%s/%s' % (
+                        urllib.parse.quote(segment_container),
+                        urllib.parse.quote(prefix)),
+                },
+            )
+
+        return {
+            'account': self._find_account_id(),
+            'container': container,
+            'object': name,
+            'x-trans-id': response.headers.get('X-Trans-Id'),
+            'etag': response.headers.get('Etag'),
+        }
+
+    def _segment_create(self, container, name, file, offset, length):
+        """Upload part of a file, return its MD5"""
+
+        with io.open(file, 'rb') as f:
+            f.seek(offset)
+            reader = _SegmentReader(f, length)
+            response = self._request(
+                'PUT',
+                "%s/%s" % (urllib.parse.quote(container),
+                           urllib.parse.quote(name)),
+                data=reader,
+                headers={'Content-Length': str(length)},
+            )
+        md5 = reader.md5.hexdigest()
+        etag = response.headers.get('Etag', '').strip('"')
+        if etag and etag != md5:
+            msg = _("Checksum mismatch uploading segment %s") % name
+            raise exceptions.CommandError(msg)
+        return md5
+
     def object_delete(
         self,
         container=None,
@@ -273,6 +621,94 @@ class APIv1(api.BaseAPI):
         self.delete("%s/%s" % (urllib.parse.quote(container),
                                urllib.parse.quote(object)))
 
+    def object_delete_many(
+        self,
+        container=None,
+        objects=None,
+        workers=1,
+    ):
+        """Delete many objects from a container
+
+        When the cluster has the bulk-delete middleware the objects are
+        deleted with one POST ?bulk-delete request per batch of up to
+        max_deletes_per_request objects.  Otherwise each object is
+        deleted on its own, retrying on 409 Conflict and 503 Service
+        Unavailable.  Objects already gone are not failures.
+
+        :param string container:
+            name of container that stores the objects
+        :param objects:
+            iterable of object names, consumed as the deletion proceeds
+        :param integer workers:
+            maximum number of concurrent requests
+        :returns:
+            list of (object name, error) tuples for the objects that
+            could not be deleted
+        """
+
+        failures = []
+        bulk_delete = self.get_capabilities().get('bulk_delete')
+        if bulk_delete:
+            batches = streaming.iter_chunks(
+                objects,
+                bulk_delete.get('max_deletes_per_request', BULK_DELETE_LIMIT),
+            )
+            delete_f = functools.partial(self._bulk_delete, container)
+            for batch, failed, e in parallel.imap(delete_f, batches, workers):
+                if e is not None:
+                    failed = [(name, e) for name in batch]
+                failures.extend(failed)
+        else:
+            delete_f = functools.partial(self._delete_with_retry, container)
+            for name, _result, e in parallel.imap(delete_f, objects, workers):
+                if e is not None:
+                    failures.append((name, e))
+        return failures
+
+    def _bulk_delete(self, container, objects):
+        """Delete a batch of objects, return the failed ones"""
+
+        prefix = '/%s/' % container
+        body = '\n'.join(
+            urllib.parse.quote(prefix + name) for name in objects
+        )
+        response = self._request(
+            'POST',
+            '',
+            params={'bulk-delete': 'true'},
+            data=body.encode('utf-8'),
+            headers={
+                'Content-Type': 'text/plain',
+                'Accept': 'application/json',
+            },
+        )
+        result = response.json()
+        failures = []
+        for path, status in result.get('Errors') or []:
+            path = urllib.parse.unquote(path)
+            if path.startswith(prefix):
+                path = path[len(prefix):]
+            failures.append((path, status))
+        status = result.get('Response Status', '200')
+        if not failures and not status.startswith('2'):
+            # The whole request failed, e.g. too many objects
+            failures = [(name, status) for name in objects]
+        return failures
+
+    def _delete_with_retry(self, container, object):
+        """Delete an object, retrying on transient errors"""
+
+        for attempt in range(DELETE_ATTEMPTS):
+            try:
+                return self.object_delete(container=container, object=object)
+            except ks_exceptions.NotFound:
+                return
+            except (ks_exceptions.Conflict,
+                    ks_exceptions.ServiceUnavailable):
+                if attempt + 1 >= DELETE_ATTEMPTS:
+                    raise
+                time.sleep(DELETE_RETRY_DELAY * 2 ** attempt)
+
     def object_list(
         self,
         container=None,
@@ -310,7 +746,7 @@ class APIv1(api.BaseAPI):
 
         params['format'] = 'json'
         if all_data:
-            data = listing = self.object_list(
+            return list(self.object_iter(
                 container=container,
                 limit=limit,
                 marker=marker,
@@ -318,24 +754,7 @@ class APIv1(api.BaseAPI):
                 prefix=prefix,
                 delimiter=delimiter,
                 **params
-            )
-            while listing:
-                if delimiter:
-                    marker = listing[-1].get('name', listing[-1].get('subdir'))
-                else:
-                    marker = listing[-1]['name']
-                listing = self.object_list(
-                    container=container,
-                    limit=limit,
-                    marker=marker,
-                    end_marker=end_marker,
-                    prefix=prefix,
-                    delimiter=delimiter,
-                    **params
-                )
-                if listing:
-                    data.extend(listing)
-            return data
+            ))
 
         if limit:
             params['limit'] = limit
@@ -350,11 +769,248 @@ class APIv1(api.BaseAPI):
 
         return self.list(urllib.parse.quote(container), **params)
 
+    def object_iter(
+        self,
+        container=None,
+        limit=None,
+        marker=None,
+        end_marker=None,
+        delimiter=None,
+        prefix=None,
+        **params
+    ):
+        """Iterate over all objects in a container
+
+        Objects are fetched one page at a time as the iteration proceeds,
+        so the full listing is never held in memory.
+
+        :param string container:
+            container name to get a listing for
+        :param integer limit:
+            page size
+        :param string marker:
+            query marker
+        :param string end_marker:
+            query end_marker
+        :param string prefix:
+            query prefix
+        :param string delimiter:
+            string to delimit the queries on
+        :returns:
+            generator of object dicts
+        """
+
+        return streaming.iter_pages(
+            self.object_list,
+            marker=marker,
+            marker_f=_get_name,
+            container=container,
+            limit=limit,
+            end_marker=end_marker,
+            prefix=prefix,
+            delimiter=delimiter,
+            **params
+        )
+
+    def object_iter_parallel(
+        self,
+        container=None,
+        workers=1,
+        limit=None,
+        marker=None,
+        end_marker=None,
+        delimiter=None,
+        prefix=None,
+        **params
+    ):
+        """Iterate over all objects in a container using concurrent requests
+
+        The namespace is split into shards along the pseudo-directories
+        found by listing with a '/' delimiter, going down the tree until
+        there are at least as many shards as workers.  Levels too wide to
+        list that way are split into ranges of names instead.  Up to
+        workers shards are listed at a time, each page by page as by
+        object_iter(), and the objects are yielded in the same order as
+        a sequential listing as soon as their page arrives.  Listings
+        using a delimiter are listed sequentially.
+
+        :param string container:
+            container name to get a listing for
+        :param integer workers:
+            maximum number of concurrent listing requests
+        :param integer limit:
+            page size
+        :param string marker:
+            query marker
+        :param string end_marker:
+            query end_marker
+        :param string prefix:
+            query prefix
+        :param string delimiter:
+            string to delimit the queries on
+        :returns:
+            generator of object dicts
+        """
+
+        if workers <= 1 or delimiter:
+            return self.object_iter(
+                container=container,
+                limit=limit,
+                marker=marker,
+                end_marker=end_marker,
+                delimiter=delimiter,
+                prefix=prefix,
+                **params
+            )
+
+        if marker:
+            params['marker'] = marker
+        if end_marker:
+            params['end_marker'] = end_marker
+        entries = self._object_shards(
+            container, prefix or '', workers, **params)
+        return self._iter_shards(container, entries, workers, limit, **params)
+
+    def _object_shards(self, container, prefix, workers, **params):
+        """Split a listing into objects and shards
+
+        :returns:
+            list of the listing entries in order, either object dicts or
+            {'subdir': <prefix>} dicts standing for every object under
+            that prefix; range shards also hold the 'marker' and
+            'end_marker' bounding their names
+        """
+
+        def _probe(prefix):
+            return self.object_list(
+                container=container,
+                prefix=prefix,
+                delimiter=SHARD_DELIMITER,
+                limit=SHARD_PROBE_LIMIT,
+                **params
+            )
+
+        entries = [{'subdir': prefix}]
+        while True:
+            shards = [e for e in entries if 'subdir' in e]
+            pending = [e['subdir'] for e in shards if 'marker' not in e]
+            if len(shards) >= workers or not pending:
+                return entries
+
+            levels = {}
+            for shard, rows, e in parallel.execute(_probe, pending, workers):
+                if e is not None:
+                    raise e
+                if len(rows) >= SHARD_PROBE_LIMIT:
+                    # Possibly truncated, split it by name instead
+                    levels[shard] = self._object_ranges(
+                        container, shard, rows, workers, **params)
+                else:
+                    levels[shard] = rows
+
+            expanded = []
+            for entry in entries:
+                if entry.get('subdir') in levels and 'marker' not in entry:
+                    expanded.extend(levels[entry['subdir']])
+                else:
+                    expanded.append(entry)
+            entries = expanded
+
+    def _object_ranges(self, container, prefix, rows, workers, **params):
+        """Split the objects under a prefix into ranges of names
+
+        The first object after each of workers - 1 keys, spread over the
+        characters following the prefix, bounds the ranges.  As the
+        marker and end_marker of a listing both exclude it, each bounding
+        object is an entry of its own between its two ranges.
+
+        :param rows:
+            first entries of the prefix, listed with a delimiter
+        :returns:
+            list of range shards and objects in order
+        """
+
+        marker = params.pop('marker', None)
+        end_marker = params.pop('end_marker', None)
+
+        def _sample(key):
+            page = self.object_list(
+                container=container,
+                prefix=prefix,
+                marker=max(key, marker or ''),
+                end_marker=end_marker,
+                limit=1,
+                **params
+            )
+            return page[0] if page else None
+
+        first = _get_name(rows[0])[len(prefix):]
+        low = ord(first[0]) if first else 0x20
+        high = 0x7f
+        step = max(float(high - low) / workers, 1)
+        keys = sorted(set(
+            prefix + six.unichr(int(low + step * i))
+            for i in range(1, workers)
+            if low + step * i < high
+        ))
+
+        bounds = {}
+        for _key, row, e in parallel.execute(_sample, keys, workers):
+            if e is not None:
+                raise e
+            if row is not None:
+                bounds[row['name']] = row
+
+        entries = []
+        lower = marker
+        for name in sorted(bounds):
+            entries.append(
+                {'subdir': prefix, 'marker': lower, 'end_marker': name})
+            entries.append(bounds[name])
+            lower = name
+        entries.append(
+            {'subdir': prefix, 'marker': lower, 'end_marker': end_marker})
+        return entries
+
+    def _iter_shards(self, container, entries, workers, limit, **params):
+        """Yield the objects of a sharded listing in order
+
+        Each shard listed ahead of the consumer holds at most
+        SHARD_QUEUE_PAGES pages in memory.
+        """
+
+        def _list_shard(entry):
+            if 'subdir' not in entry:
+                return [[entry]]
+            shard_params = dict(params)
+            for key in ('marker', 'end_marker'):
+                if key in entry:
+                    shard_params.pop(key, None)
+                    if entry[key]:
+                        shard_params[key] = entry[key]
+            return streaming.iter_chunks(
+                self.object_iter(
+                    container=container,
+                    prefix=entry['subdir'],
+                    limit=limit,
+                    **shard_params
+                ),
+                limit or SHARD_PAGE_SIZE,
+            )
+
+        pages = parallel.iter_chain(
+            _list_shard, entries, workers, SHARD_QUEUE_PAGES)
+        for page in pages:
+            for row in page:
+                yield row
+
     def object_save(
         self,
         container=None,
         object=None,
         file=None,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        resume=False,
     ):
         """Save an object stored in a container
 
@@ -364,24 +1020,81 @@ class APIv1(api.BaseAPI):
             name of object to save
         :param string file:
             local name of object
+        :param integer chunk_size:
+            bytes read and written at a time
+        :param boolean resume:
+            download to <file>.part first and rename it once its MD5 has
+            been checked against the ETag; an existing <file>.part is
+            resumed with a Range request
         """
 
         if not file:
             file = object
+        _makedirs(os.path.dirname(file))
+        path = "%s/%s" % (urllib.parse.quote(container),
+                          urllib.parse.quote(object))
+
+        if not resume:
+            response = self._request('GET', path, stream=True)
+            if response.status_code == 200:
+                with open(file, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+            return
 
-        response = self._request(
-            'GET',
-            "%s/%s" % (urllib.parse.quote(container),
-                       urllib.parse.quote(object)),
-            stream=True,
-        )
-        if response.status_code == 200:
-            if not os.path.exists(os.path.dirname(file)):
-                if len(os.path.dirname(file)) > 0:
-                    os.makedirs(os.path.dirname(file))
-            with open(file, 'wb') as f:
-                for chunk in response.iter_content():
-                    f.write(chunk)
+        part = file + PARTIAL_SUFFIX
+        offset = os.path.getsize(part) if os.path.isfile(part) else 0
+        valid = self._download(path, part, chunk_size, offset)
+        if not valid and offset:
+            # The partial file was from another version of the object
+            valid = self._download(path, part, chunk_size, 0)
+        if not valid:
+            os.remove(part)
+            msg = _("Checksum mismatch saving object %s") % object
+            raise exceptions.CommandError(msg)
+        getattr(os, 'replace', os.rename)(part, file)
+
+    def _download(self, path, file, chunk_size, offset):
+        """Download an object to file from offset on
+
+        :returns:
+            False if the MD5 of file does not match the object's ETag
+        """
+
+        headers = {}
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        try:
+            response = self._request(
+                'GET',
+                path,
+                stream=True,
+                headers=headers,
+            )
+        except ks_exceptions.RequestedRangeNotSatisfiable:
+            # Nothing left after offset, the file is not a prefix of the
+            # object
+            return False
+
+        md5 = hashlib.md5()
+        if response.status_code == 206:
+            with open(file, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    md5.update(chunk)
+            mode = 'ab'
+        else:
+            mode = 'wb'
+        with open(file, mode) as f:
+            for chunk in response.iter_content(chunk_size):
+                md5.update(chunk)
+                f.write(chunk)
+
+        etag = response.headers.get('etag', '').strip('"')
+        if (not etag or 'x-static-large-object' in response.headers or
+                'x-object-manifest' in response.headers):
+            # The ETag of a large object is not the MD5 of its content
+            return True
+        return md5.hexdigest() == etag
 
     def object_set(
         self,
@@ -527,8 +1240,10 @@ class APIv1(api.BaseAPI):
             self.create("", headers=headers)
 
     def _find_account_id(self):
-        url_parts = urllib.parse.urlparse(self.endpoint)
-        return url_parts.path.split('/')[-1]
+        if self._account_id is None:
+            url_parts = urllib.parse.urlparse(self.endpoint)
+            self._account_id = url_parts.path.split('/')[-1]
+        return self._account_id
 
     def _unset_properties(self, properties, header_tag):
         # NOTE(stevemar): As per the API, the headers have to be in the form
@@ -570,3 +1285,65 @@ class APIv1(api.BaseAPI):
             if k.lower().startswith(header_tag):
                 properties[k[len(header_tag):]] = v
         return properties
+
+
+def _get_name(item):
+    """Return the listing marker of an object or container"""
+
+    # Pseudo-directories rolled up with a delimiter only have 'subdir'
+    return item.get('name', item.get('subdir'))
+
+
+def _file_md5(path, chunk_size, offset=0, length=None):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        reader = f if length is None else _SegmentReader(f, length)
+        for chunk in iter(lambda: reader.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _unchanged(path, row):
+    """Return True if the listed object row is a copy of the file"""
+
+    if not row or os.path.getsize(path) != row.get('bytes'):
+        return False
+    try:
+        modified = calendar.timegm(time.strptime(
+            row['last_modified'][:19], '%Y-%m-%dT%H:%M:%S'))
+    except (KeyError, TypeError, ValueError):
+        modified = None
+    if modified is not None and os.path.getmtime(path) < modified:
+        return True
+    return _file_md5(path, SEGMENT_CHUNK_SIZE) == row.get('hash')
+
+
+class _SegmentReader(object):
+    """Read at most length bytes of a file, computing their MD5"""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+        self.md5 = hashlib.md5()
+
+    def __len__(self):
+        return self.remaining
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.f.read(size)
+        self.remaining -= len(chunk)
+        self.md5.update(chunk)
+        return chunk
+
+
+def _makedirs(path):
+    # Objects may be saved from several threads at once
+    if path and not os.path.isdir(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
@@ -53,10 +53,7 @@ def simple_filter(
     if not data or not attr or value is None:
         return data
 
-    # NOTE:(dtroyer): This filter modifies the provided list in-place using
-    # list.remove() so we need to start at the end so the loop pointer does
-    # not skip any items after a deletion.
-    for d in reversed(data):
+    def _match(d):
         if attr in d:
             # Searching data fields
             search_value = d[attr]
@@ -65,20 +62,13 @@ def simple_filter(
             # Searching a properties field - do this separately because
             # we don't want to fail over to checking the fields if a
             # property name is given.
-            if attr in d[property_field]:
-                search_value = d[property_field][attr]
-            else:
-                search_value = None
+            search_value = d[property_field].get(attr)
         else:
             search_value = None
 
         # could do regex here someday...
-        if not search_value or search_value != value:
-            # remove from list
-            try:
-                data.remove(d)
-            except ValueError:
-                # it's already gone!
-                pass
+        return bool(search_value) and search_value == value
 
+    # Filter in a single pass, still modifying the provided list in-place
+    data[:] = [d for d in data if _match(d)]
     return data
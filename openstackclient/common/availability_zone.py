@@ -14,6 +14,7 @@
 """Availability Zone action implementations"""
 
 import copy
+import functools
 import logging
 
 from novaclient import exceptions as nova_exceptions
@@ -21,6 +22,7 @@ from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -183,13 +185,19 @@ class ListAvailabilityZone(command.Lister):
                     not parsed_args.volume and
                     not parsed_args.network)
 
-        result = []
+        getters = []
         if parsed_args.compute or show_all:
-            result += self._get_compute_availability_zones(parsed_args)
+            getters.append(self._get_compute_availability_zones)
         if parsed_args.volume or show_all:
-            result += self._get_volume_availability_zones(parsed_args)
+            getters.append(self._get_volume_availability_zones)
         if parsed_args.network or show_all:
-            result += self._get_network_availability_zones(parsed_args)
+            getters.append(self._get_network_availability_zones)
+
+        # The services are queried at the same time
+        result = []
+        for zones in parallel.call_all(
+                [functools.partial(g, parsed_args) for g in getters]):
+            result += zones
 
         return (columns,
                 (utils.get_dict_properties(
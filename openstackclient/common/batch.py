@@ -0,0 +1,138 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Batch action implementations"""
+
+import io
+import logging
+import shlex
+import sys
+import time
+
+from osc_lib.command import command
+from osc_lib import exceptions
+
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _read_commands(stream):
+    """Yield (line number, line, argv) for each command in stream
+
+    Blank lines and lines starting with '#' are skipped, and a leading
+    'openstack' is dropped so existing scripts can be replayed as-is.
+    """
+
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            yield line_no, line, e
+            continue
+        if argv and argv[0] == 'openstack':
+            argv = argv[1:]
+        yield line_no, line, argv
+
+
+class RunBatch(command.Lister):
+    _description = _("Run commands from a file in a single session")
+
+    def get_parser(self, prog_name):
+        parser = super(RunBatch, self).get_parser(prog_name)
+        parser.add_argument(
+            'file',
+            metavar='<file>',
+            nargs='?',
+            default='-',
+            help=_("File with one command per line, '-' reads "
+                   "standard input (default)"),
+        )
+        parser.add_argument(
+            '--stop-on-error',
+            action='store_true',
+            default=False,
+            help=_("Stop at the first command that fails "
+                   "(default: run all commands)"),
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        # All commands run through the same shell, so the authentication,
+        # the keystoneauth session and its connection pool and the service
+        # clients are only set up once for the whole batch.
+        if parsed_args.file == '-':
+            stream = sys.stdin
+        else:
+            try:
+                stream = io.open(parsed_args.file, 'r')
+            except IOError as e:
+                msg = _("Unable to read batch file %(file)s: %(error)s")
+                raise exceptions.CommandError(
+                    msg % {'file': parsed_args.file, 'error': e},
+                )
+
+        results = []
+        self.failed = 0
+        try:
+            for line_no, line, argv in _read_commands(stream):
+                start = time.time()
+                if isinstance(argv, ValueError):
+                    LOG.error(_("Line %(line)s: %(error)s"),
+                              {'line': line_no, 'error': argv})
+                    ret = 2
+                elif argv and argv[0] == 'batch':
+                    LOG.error(_("Line %s: batch cannot be nested"), line_no)
+                    ret = 2
+                else:
+                    ret = self._run_one(argv)
+                elapsed = time.time() - start
+
+                results.append((line_no, line, ret, '%.3f' % elapsed))
+                if ret:
+                    self.failed += 1
+                    if parsed_args.stop_on_error:
+                        break
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if self.failed:
+            LOG.error(_("%(failed)s of %(total)s commands failed"),
+                      {'failed': self.failed, 'total': len(results)})
+        columns = ('Line', 'Command', 'Exit Code', 'Time')
+        return (columns, results)
+
+    def _run_one(self, argv):
+        try:
+            ret = self.app.run_subcommand(argv)
+        except SystemExit as e:
+            # argparse exits on bad arguments and --help
+            ret = e.code
+        except Exception as e:
+            # cliff re-raises command errors in --debug mode
+            LOG.error(e)
+            ret = 1
+        # SystemExit may carry None or a message rather than a number
+        if not isinstance(ret, int):
+            ret = 1 if ret else 0
+        return ret
+
+    def run(self, parsed_args):
+        super(RunBatch, self).run(parsed_args)
+        # Report the batch as failed without hiding the results
+        return 1 if self.failed else 0
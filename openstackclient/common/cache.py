@@ -0,0 +1,304 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Private on-disk cache files and in-process caches"""
+
+import contextlib
+import errno
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from oslo_utils import importutils
+
+fcntl = importutils.try_import('fcntl')
+
+
+LOG = logging.getLogger(__name__)
+
+# Seconds that cached resource names stay valid
+NAME_CACHE_TTL = 300
+
+
+def get_cache_dir(*subdirs):
+    """Return the OpenStackClient cache directory
+
+    Follows the XDG base directory spec, so $XDG_CACHE_HOME is honoured
+    and ~/.cache is the fallback.
+
+    :param subdirs:
+        path components to append below the base cache directory
+    :returns: the directory path, which may not exist yet
+    """
+
+    base = os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'openstack', *subdirs)
+
+
+def safe_name(name):
+    """Make a string usable as a single file name component"""
+
+    return re.sub(r'[^\w.-]', '_', name or '')
+
+
+class FileCache(object):
+    """A single private cache file
+
+    Reads and writes are serialized between processes with an advisory
+    lock on a ``.lock`` file next to the cache file.  The file is created
+    with 0600 permissions and replaced atomically, so readers never see
+    partial content.  All I/O errors are logged and otherwise ignored;
+    a cache that cannot be used must never fail a command.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @contextlib.contextmanager
+    def lock(self, exclusive=False):
+        """Hold the advisory lock for this cache file
+
+        :param bool exclusive:
+            take an exclusive (writer) lock rather than a shared one
+        """
+
+        lock_file = None
+        try:
+            self._ensure_dir()
+            lock_file = os.open(
+                self.path + '.lock',
+                os.O_RDWR | os.O_CREAT,
+                0o600,
+            )
+            if fcntl:
+                fcntl.flock(
+                    lock_file,
+                    fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH,
+                )
+        except (IOError, OSError) as e:
+            LOG.debug("Unable to lock cache %s: %s", self.path, e)
+        try:
+            yield
+        finally:
+            if lock_file is not None:
+                # Closing the descriptor also releases the lock
+                os.close(lock_file)
+
+    def read(self):
+        """Return the cache file contents, or None if there are none"""
+
+        try:
+            with open(self.path, 'r') as f:
+                return f.read()
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                LOG.debug("Unable to read cache %s: %s", self.path, e)
+        return None
+
+    def write(self, data):
+        """Atomically replace the cache file contents
+
+        :param string data:
+            the new contents
+        """
+
+        try:
+            self._ensure_dir()
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path),
+                prefix='.tmp-',
+            )
+            try:
+                # mkstemp() already creates the file 0600
+                with os.fdopen(fd, 'w') as f:
+                    f.write(data)
+                os.rename(tmp_path, self.path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except (IOError, OSError) as e:
+            LOG.debug("Unable to write cache %s: %s", self.path, e)
+
+    def delete(self):
+        """Remove the cache file if it exists"""
+
+        try:
+            os.unlink(self.path)
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                LOG.debug("Unable to remove cache %s: %s", self.path, e)
+
+    def _ensure_dir(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+
+class ExpiringCache(FileCache):
+    """A JSON mapping cache file whose entries expire
+
+    :param string path:
+        the cache file path
+    :param int ttl:
+        seconds an entry stays valid after it was stored
+    """
+
+    def __init__(self, path, ttl):
+        super(ExpiringCache, self).__init__(path)
+        self.ttl = ttl
+
+    def get_many(self, keys):
+        """Return a dict of the valid entries for keys"""
+
+        with self.lock():
+            entries = self._load()
+        now = time.time()
+        return dict(
+            (k, entries[k][0]) for k in keys
+            if k in entries and now - entries[k][1] < self.ttl
+        )
+
+    def set_many(self, values):
+        """Store the items of the values dict, dropping expired entries"""
+
+        with self.lock(exclusive=True):
+            entries = self._load()
+            now = time.time()
+            entries = dict(
+                (k, v) for k, v in entries.items() if now - v[1] < self.ttl
+            )
+            entries.update((k, [v, now]) for k, v in values.items())
+            self.write(json.dumps(entries))
+
+    def delete_many(self, keys):
+        """Drop the entries for keys"""
+
+        with self.lock(exclusive=True):
+            entries = self._load()
+            if any(k in entries for k in keys):
+                for k in keys:
+                    entries.pop(k, None)
+                self.write(json.dumps(entries))
+
+    def _load(self):
+        data = self.read()
+        if not data:
+            return {}
+        try:
+            entries = json.loads(data)
+        except ValueError as e:
+            LOG.debug("Ignoring invalid cache %s: %s", self.path, e)
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return dict(
+            (k, v) for k, v in entries.items()
+            if isinstance(v, list) and len(v) == 2
+        )
+
+
+class MemoryCache(object):
+    """A mapping kept in memory whose entries expire
+
+    Entries only live as long as the process, so nothing is shared
+    between commands unless they run in the same process, such as in
+    interactive mode.  Access is serialized so worker threads may share
+    an instance.
+
+    :param int ttl:
+        seconds an entry stays valid after it was stored
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the valid entry for key, or default"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.time() - entry[1] >= self.ttl:
+                del self._entries[key]
+                return default
+            return entry[0]
+
+    def set(self, key, value):
+        """Store value for key"""
+
+        with self._lock:
+            self._entries[key] = (value, time.time())
+
+    def clear(self):
+        """Drop every entry"""
+
+        with self._lock:
+            self._entries.clear()
+
+
+def get_project_cache(client_manager, subdir, name, ttl):
+    """Return an ExpiringCache private to the current project
+
+    The resources visible to each project differ, so they are cached
+    per project.
+
+    :param client_manager:
+        the ClientManager of the current command
+    :param string subdir:
+        the cache directory below the base one, e.g. 'names'
+    :param string name:
+        the name of the cache file, e.g. 'image'
+    :param int ttl:
+        seconds an entry stays valid
+    :returns:
+        an ExpiringCache, or None if the project is not known
+    """
+
+    try:
+        project_id = client_manager.auth_ref.project_id
+    except AttributeError:
+        project_id = None
+    if not project_id:
+        return None
+    path = os.path.join(
+        get_cache_dir(subdir),
+        safe_name('%s-%s.json' % (name, project_id)),
+    )
+    return ExpiringCache(path, ttl)
+
+
+def get_name_cache(client_manager, resource, ttl=NAME_CACHE_TTL):
+    """Return the cache of resource names for the current project
+
+    :param client_manager:
+        the ClientManager of the current command
+    :param string resource:
+        the kind of resource, e.g. 'image'
+    :param int ttl:
+        seconds a name stays valid
+    :returns:
+        an ExpiringCache, or None if the project is not known
+    """
+
+    return get_project_cache(client_manager, 'names', resource, ttl)
@@ -15,12 +15,18 @@
 
 """Manage access to the clients, including authenticating when needed."""
 
+import importlib
 import logging
-import pkg_resources
-import sys
+import os
 
 from osc_lib import clientmanager
 from osc_lib import shell
+from oslo_utils import strutils
+
+from openstackclient.common import cache
+from openstackclient.common import commandmanager
+from openstackclient.common import session
+from openstackclient.common import transport
 
 
 LOG = logging.getLogger(__name__)
@@ -29,6 +35,14 @@ PLUGIN_MODULES = []
 
 USER_AGENT = 'python-openstackclient'
 
+# keystoneauth Session attributes that make up the User-Agent header
+_USER_AGENT_ATTRS = (
+    'user_agent',
+    'app_name',
+    'app_version',
+    'additional_user_agent',
+)
+
 
 class ClientManager(clientmanager.ClientManager):
     """Manages access to API clients, including authentication
@@ -60,6 +74,10 @@ class ClientManager(clientmanager.ClientManager):
         self._cacert = self.cacert
         self._insecure = not self.verify
 
+        # The on-disk token cache, set up in setup_auth() when enabled
+        self._auth_cache = None
+        self._auth_cache_state = None
+
     def setup_auth(self):
         """Set up authentication"""
 
@@ -78,7 +96,103 @@ class ClientManager(clientmanager.ClientManager):
                     self._cli_options.config,
                 )
 
-        return super(ClientManager, self).setup_auth()
+        super(ClientManager, self).setup_auth()
+        # Replace osc-lib's session with ours, which also records the
+        # detailed request timings of common.profiling, keeping the
+        # User-Agent osc-lib set up
+        osc_session = self.session
+        self.session = session.TimingSession(
+            auth=self.auth,
+            verify=self.verify,
+            cert=self.cert,
+        )
+        for attr in _USER_AGENT_ATTRS:
+            if hasattr(osc_session, attr):
+                setattr(self.session, attr, getattr(osc_session, attr))
+        # Every client uses this session, and so its connection pools
+        transport.configure_from_config(
+            self.session.session,
+            self._cli_options.config,
+        )
+        self._load_auth_cache()
+
+    @property
+    def auth_ref(self):
+        """Dereference will trigger an auth if it hasn't already"""
+        if not self._auth_required:
+            # Forcibly skip auth if we know we do not need it
+            return None
+        if not self._auth_ref:
+            self.setup_auth()
+            if self._auth_cache is None:
+                return super(ClientManager, self).auth_ref
+            LOG.debug("Get auth_ref")
+            # get_access() only authenticates when the cached token is
+            # missing or about to expire, unlike get_auth_ref()
+            self._auth_ref = self.auth.get_access(self.session)
+            self.save_auth_cache()
+        return self._auth_ref
+
+    def _load_auth_cache(self):
+        """Install a cached token and service catalog into the auth plugin
+
+        Caching is opt-in with --os-auth-cache, OS_AUTH_CACHE or
+        ``auth_cache: true`` in clouds.yaml.  The cache file is keyed
+        on the cloud name and the auth plugin's cache ID, which changes
+        whenever any auth parameter changes.
+        """
+
+        if not strutils.bool_from_string(
+            self._cli_options.config.get('auth_cache'),
+        ):
+            return
+
+        try:
+            cache_id = self.auth.get_cache_id()
+        except (AttributeError, NotImplementedError):
+            cache_id = None
+        if not cache_id:
+            LOG.debug("Auth plugin %s does not support token caching",
+                      self.auth_plugin_name)
+            return
+
+        name = '%s-%s' % (
+            cache.safe_name(self._cli_options.name),
+            cache_id,
+        )
+        self._auth_cache = cache.FileCache(
+            os.path.join(cache.get_cache_dir('auth'), name),
+        )
+        with self._auth_cache.lock():
+            state = self._auth_cache.read()
+        if state:
+            try:
+                self.auth.set_auth_state(state)
+            except Exception as e:
+                # A corrupt or incompatible cache just means a new token
+                LOG.debug("Ignoring unusable auth cache: %s", e)
+                state = None
+            else:
+                LOG.debug("Using cached token from %s",
+                          self._auth_cache.path)
+        self._auth_cache_state = state
+
+    def save_auth_cache(self):
+        """Write the current token to the cache if it has changed
+
+        keystoneauth re-authenticates on its own when a cached token has
+        expired or is rejected with a 401, so this is called both after
+        the initial auth and when a command is finished.
+        """
+
+        if self._auth_cache is None:
+            return
+        state = self.auth.get_auth_state()
+        if not state or state == self._auth_cache_state:
+            return
+        with self._auth_cache.lock(exclusive=True):
+            self._auth_cache.write(state)
+        self._auth_cache_state = state
 
     def is_network_endpoint_enabled(self):
         """Check if the network endpoint is enabled"""
@@ -95,11 +209,10 @@ class ClientManager(clientmanager.ClientManager):
 def get_plugin_modules(group):
     """Find plugin entry points"""
     mod_list = []
-    for ep in pkg_resources.iter_entry_points(group):
+    for ep in commandmanager.get_entry_points(group):
         LOG.debug('Found plugin %r', ep.name)
 
-        __import__(ep.module_name)
-        module = sys.modules[ep.module_name]
+        module = importlib.import_module(ep.module_name)
         mod_list.append(module)
         init_func = getattr(module, 'Initialize', None)
         if init_func:
@@ -110,7 +223,7 @@ def get_plugin_modules(group):
             clientmanager.ClientManager,
             module.API_NAME,
             clientmanager.ClientCache(
-                getattr(sys.modules[ep.module_name], 'make_client', None)
+                getattr(module, 'make_client', None)
             ),
         )
     return mod_list
@@ -15,10 +15,158 @@
 
 """Modify cliff.CommandManager"""
 
-import pkg_resources
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
 
 import cliff.commandmanager
 
+from openstackclient.common import cache
+
+
+LOG = logging.getLogger(__name__)
+
+# File name of the entry point index in the cache directory
+INDEX_FILE = 'entry-points.json'
+INDEX_VERSION = 1
+
+_INDEX = None
+
+
+def _distributions_fingerprint():
+    """Return a hash that changes when installed distributions change
+
+    Installing, upgrading or removing a distribution changes the mtime of
+    its sys.path directory, and regenerating the metadata of a develop
+    install rewrites its entry_points.txt.
+    """
+
+    fingerprint = hashlib.sha1()
+    for path in sys.path:
+        path = path or os.curdir
+        try:
+            names = sorted(os.listdir(path))
+            mtime = os.stat(path).st_mtime
+        except (IOError, OSError):
+            continue
+        fingerprint.update(('%s:%r\n' % (path, mtime)).encode('utf-8'))
+        for name in names:
+            if not name.endswith(('.egg-info', '.dist-info', '.egg')):
+                continue
+            try:
+                mtime = os.stat(
+                    os.path.join(path, name, 'entry_points.txt'),
+                ).st_mtime
+            except (IOError, OSError):
+                mtime = None
+            fingerprint.update(('%s:%r\n' % (name, mtime)).encode('utf-8'))
+    return fingerprint.hexdigest()
+
+
+class LazyEntryPoint(object):
+    """An entry point from the index that is imported on first use
+
+    Provides the subset of the pkg_resources.EntryPoint interface that
+    cliff and the plugin loader use.
+    """
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+        self.module_name, _, attrs = value.partition(':')
+        self.attrs = tuple(attrs.split('.')) if attrs else ()
+
+    def __repr__(self):
+        return 'LazyEntryPoint(%r, %r)' % (self.name, self.value)
+
+    def resolve(self):
+        obj = importlib.import_module(self.module_name)
+        for attr in self.attrs:
+            obj = getattr(obj, attr)
+        return obj
+
+    def load(self, *args, **kwargs):
+        return self.resolve()
+
+
+class EntryPointIndex(object):
+    """A persistent index of entry point groups
+
+    Scanning entry points means walking the metadata of every installed
+    distribution.  The index keeps the names and targets of the groups
+    that have been asked for in the cache directory and is thrown away
+    as a whole when the installed distributions change.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(cache.get_cache_dir(), INDEX_FILE)
+        self._cache = cache.FileCache(path)
+        self._fingerprint = None
+        self._groups = None
+
+    def _load(self):
+        self._fingerprint = _distributions_fingerprint()
+        self._groups = {}
+        with self._cache.lock():
+            data = self._cache.read()
+        if not data:
+            return
+        try:
+            index = json.loads(data)
+        except ValueError:
+            LOG.debug("Ignoring corrupt entry point index")
+            return
+        if (index.get('version') == INDEX_VERSION and
+                index.get('fingerprint') == self._fingerprint):
+            self._groups = index.get('groups', {})
+        else:
+            LOG.debug("Installed distributions changed, rebuilding "
+                      "entry point index")
+
+    def _save(self):
+        data = json.dumps({
+            'version': INDEX_VERSION,
+            'fingerprint': self._fingerprint,
+            'groups': self._groups,
+        })
+        with self._cache.lock(exclusive=True):
+            self._cache.write(data)
+
+    def get(self, group):
+        """Return the entry points in a group
+
+        :param string group:
+            entry point group name
+        :returns: list of LazyEntryPoint
+        """
+
+        if self._groups is None:
+            self._load()
+        if group not in self._groups:
+            # Only pay for pkg_resources when the index has to be rebuilt
+            import pkg_resources
+
+            LOG.debug("Indexing entry point group %s", group)
+            self._groups[group] = [
+                (ep.name, '%s:%s' % (ep.module_name, '.'.join(ep.attrs)))
+                for ep in pkg_resources.iter_entry_points(group)
+            ]
+            self._save()
+        return [LazyEntryPoint(n, v) for n, v in self._groups[group]]
+
+
+def get_entry_points(group):
+    """Return the entry points in a group from the shared index"""
+
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = EntryPointIndex()
+    return _INDEX.get(group)
+
 
 class CommandManager(cliff.commandmanager.CommandManager):
     """Add additional functionality to cliff.CommandManager
@@ -32,8 +180,18 @@ class CommandManager(cliff.commandmanager.CommandManager):
         super(CommandManager, self).__init__(namespace, convert_underscores)
 
     def load_commands(self, namespace):
+        """Load commands from the entry point index
+
+        Command modules are not imported until a command is looked up.
+        """
         self.group_list.append(namespace)
-        return super(CommandManager, self).load_commands(namespace)
+        for ep in get_entry_points(namespace):
+            cmd_name = (
+                ep.name.replace('_', ' ')
+                if self.convert_underscores
+                else ep.name
+            )
+            self.commands[cmd_name] = ep
 
     def add_command_group(self, group=None):
         """Adds another group of command entrypoints"""
@@ -48,7 +206,7 @@ class CommandManager(cliff.commandmanager.CommandManager):
         """Returns a list of commands loaded for the specified group"""
         group_list = []
         if group is not None:
-            for ep in pkg_resources.iter_entry_points(group):
+            for ep in get_entry_points(group):
                 cmd_name = (
                     ep.name.replace('_', ' ')
                     if self.convert_underscores
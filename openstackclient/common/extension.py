@@ -21,6 +21,7 @@ import logging
 from osc_lib.command import command
 from osc_lib import utils
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -64,6 +65,44 @@ class ListExtension(command.Lister):
         )
         return parser
 
+    def _get_identity_extensions(self):
+        identity_client = self.app.client_manager.identity
+        try:
+            return identity_client.extensions.list()
+        except Exception:
+            message = _("Extensions list not supported by Identity API")
+            LOG.warning(message)
+            return []
+
+    def _get_compute_extensions(self):
+        compute_client = self.app.client_manager.compute
+        try:
+            return compute_client.list_extensions.show_all()
+        except Exception:
+            message = _("Extensions list not supported by Compute API")
+            LOG.warning(message)
+            return []
+
+    def _get_volume_extensions(self):
+        volume_client = self.app.client_manager.volume
+        try:
+            return volume_client.list_extensions.show_all()
+        except Exception:
+            message = _("Extensions list not supported by "
+                        "Block Storage API")
+            LOG.warning(message)
+            return []
+
+    def _get_network_extensions(self):
+        network_client = self.app.client_manager.network
+        try:
+            # The SDK pages lazily, read the extensions here
+            return list(network_client.extensions())
+        except Exception:
+            message = _("Extensions list not supported by Network API")
+            LOG.warning(message)
+            return []
+
     def take_action(self, parsed_args):
         if parsed_args.long:
             columns = ('Name', 'Namespace', 'Description',
@@ -71,40 +110,25 @@ class ListExtension(command.Lister):
         else:
             columns = ('Name', 'Alias', 'Description')
 
-        data = []
-
         # by default we want to show everything, unless the
         # user specifies one or more of the APIs to show
         # for now, only identity and compute are supported.
         show_all = (not parsed_args.identity and not parsed_args.compute
                     and not parsed_args.volume and not parsed_args.network)
 
+        getters = []
         if parsed_args.identity or show_all:
-            identity_client = self.app.client_manager.identity
-            try:
-                data += identity_client.extensions.list()
-            except Exception:
-                message = _("Extensions list not supported by Identity API")
-                LOG.warning(message)
-
+            getters.append(self._get_identity_extensions)
         if parsed_args.compute or show_all:
-            compute_client = self.app.client_manager.compute
-            try:
-                data += compute_client.list_extensions.show_all()
-            except Exception:
-                message = _("Extensions list not supported by Compute API")
-                LOG.warning(message)
-
+            getters.append(self._get_compute_extensions)
         if parsed_args.volume or show_all:
-            volume_client = self.app.client_manager.volume
-            try:
-                data += volume_client.list_extensions.show_all()
-            except Exception:
-                message = _("Extensions list not supported by "
-                            "Block Storage API")
-                LOG.warning(message)
-
-        # Resource classes for the above
+            getters.append(self._get_volume_extensions)
+        if parsed_args.network or show_all:
+            getters.append(self._get_network_extensions)
+
+        # The services are queried at the same time
+        data = itertools.chain.from_iterable(parallel.call_all(getters))
+
         extension_tuples = (
             utils.get_item_properties(
                 s,
@@ -113,24 +137,4 @@ class ListExtension(command.Lister):
             ) for s in data
         )
 
-        # Dictionaries for the below
-        if parsed_args.network or show_all:
-            network_client = self.app.client_manager.network
-            try:
-                data = network_client.extensions()
-                dict_tuples = (
-                    utils.get_item_properties(
-                        s,
-                        columns,
-                        formatters={},
-                    ) for s in data
-                )
-                extension_tuples = itertools.chain(
-                    extension_tuples,
-                    dict_tuples
-                )
-            except Exception:
-                message = _("Extensions list not supported by Network API")
-                LOG.warning(message)
-
         return (columns, extension_tuples)
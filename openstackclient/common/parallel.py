@@ -0,0 +1,240 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Run API calls for multiple resources concurrently"""
+
+import argparse
+import collections
+from concurrent import futures
+import threading
+
+from six.moves import queue
+
+from openstackclient.i18n import _
+
+
+# Seconds a producer of iter_chain() waits on a full queue before checking
+# whether the consumer has stopped
+_PUT_TIMEOUT = 0.1
+_DONE = object()
+
+
+def positive_int(value):
+    """argparse type for a count that must be at least 1"""
+
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        msg = _("%s is not a positive integer") % value
+        raise argparse.ArgumentTypeError(msg)
+    return count
+
+
+def add_parallel_option(parser, help=None, default=1):
+    """Add the --parallel option to a command parser
+
+    :param parser: an argparse parser
+    :param string help: help text replacing the generic one
+    :param int default: the count used when the option is not given
+    """
+
+    parser.add_argument(
+        '--parallel',
+        metavar='<count>',
+        type=positive_int,
+        default=default,
+        help=help or _("Number of resources to process at the same time "
+                       "(default: %s)") % default,
+    )
+    return parser
+
+
+def execute(func, items, workers=1):
+    """Call func once per item, running up to workers calls at once
+
+    Exceptions raised by func are captured and returned rather than
+    raised, so callers can log every failure and aggregate them into a
+    single error as described in doc/source/command-errors.rst.
+
+    :param func:
+        callable taking a single item
+    :param items:
+        iterable of items to pass to func
+    :param int workers:
+        maximum number of concurrent calls; 1 runs serially in the
+        calling thread
+    :returns:
+        list of (item, result, exception) tuples in the order of items;
+        exception is None when the call succeeded
+    """
+
+    items = list(items)
+    return list(imap(func, items, min(workers or 1, len(items))))
+
+
+def call_all(funcs):
+    """Call independent functions at the same time, return their results
+
+    Meant for commands spanning several services, whose per-service
+    requests then take as long as the slowest service rather than the
+    sum of them.  Each function handles the errors it tolerates itself;
+    any other exception is raised once every call has ended.
+
+    :param funcs: list of callables taking no argument
+    :returns: list of the results in the order of funcs
+    """
+
+    results = execute(_call, funcs, len(funcs))
+    for _func, _result, e in results:
+        if e is not None:
+            raise e
+    return [result for _func, result, _e in results]
+
+
+def _call(func):
+    return func()
+
+
+def imap(func, items, workers=1):
+    """Call func once per item, yielding the results in order
+
+    Like execute(), but results are yielded as soon as they are
+    available in the order of items, and at most workers calls are
+    started ahead of the consumer, so items may be a long generator.
+
+    :param func:
+        callable taking a single item
+    :param items:
+        iterable of items to pass to func
+    :param int workers:
+        maximum number of concurrent calls; 1 runs serially in the
+        calling thread
+    :returns:
+        generator of (item, result, exception) tuples
+    """
+
+    if (workers or 1) <= 1:
+        for item in items:
+            try:
+                yield item, func(item), None
+            except Exception as e:
+                yield item, None, e
+        return
+
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append((item, executor.submit(func, item)))
+                if len(pending) > workers:
+                    yield _outcome(*pending.popleft())
+            while pending:
+                yield _outcome(*pending.popleft())
+        finally:
+            # The consumer may stop early, do not start the queued calls
+            for _item, future in pending:
+                future.cancel()
+
+
+def iter_chain(func, items, workers=1, buffer=1):
+    """Chain the iterables returned by func for each item
+
+    Like itertools.chain(), but up to workers iterables are consumed at
+    once by background threads, each handing its values over through a
+    queue of at most buffer values, so the values are yielded in order
+    as soon as they are available while the memory held stays bounded.
+    An exception raised by func or by an iterable is raised to the
+    consumer when its values are reached.
+
+    :param func:
+        callable taking a single item and returning an iterable
+    :param items:
+        iterable of items to pass to func
+    :param int workers:
+        maximum number of iterables consumed at once; 1 consumes them
+        one after the other in the calling thread
+    :param int buffer:
+        maximum number of values read ahead from each iterable
+    :returns:
+        generator of the values of the iterables
+    """
+
+    if (workers or 1) <= 1:
+        for item in items:
+            for value in func(item):
+                yield value
+        return
+
+    stop = threading.Event()
+
+    def _produce(item, values):
+        try:
+            for value in func(item):
+                if not _put(values, (value, None), stop):
+                    return
+        except Exception as e:
+            _put(values, (_DONE, e), stop)
+        else:
+            _put(values, (_DONE, None), stop)
+
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        try:
+            for item in items:
+                values = queue.Queue(maxsize=buffer)
+                pending.append(
+                    (values, executor.submit(_produce, item, values)))
+                if len(pending) >= workers:
+                    for value in _drain(pending.popleft()[0]):
+                        yield value
+            while pending:
+                for value in _drain(pending.popleft()[0]):
+                    yield value
+        finally:
+            # The consumer may stop early, end the running producers
+            stop.set()
+            for _values, future in pending:
+                future.cancel()
+
+
+def _put(values, value, stop):
+    while not stop.is_set():
+        try:
+            values.put(value, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _drain(values):
+    while True:
+        value, e = values.get()
+        if value is _DONE:
+            if e is not None:
+                raise e
+            return
+        yield value
+
+
+def _outcome(item, future):
+    e = future.exception()
+    return item, None if e else future.result(), e
+
+
+def failures(results):
+    """Return the (item, exception) pairs of the failed calls"""
+
+    return [(item, e) for item, _result, e in results if e is not None]
@@ -0,0 +1,291 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Per-request timing records
+
+common.session.TimingSession records every API request as a dict:
+
+``start``
+    time the request was sent (seconds since the epoch)
+``method``, ``url``, ``status``
+    the request and the final response status
+``service``, ``endpoint``
+    the service type when the client named it, and the scheme, host and
+    port the request was sent to
+``phase``
+    the command phase that made the request: ``auth``, ``resolve`` (name
+    and ID lookups, see record_lookups()), ``action`` or ``format``
+    (output, including the later pages of streamed listings)
+``elapsed``
+    seconds until the response was read, or its headers for streamed
+    responses
+``connect``, ``tls``
+    seconds spent opening new connections (name lookup and TCP connect)
+    and negotiating TLS on them, 0 when pooled connections were reused
+``ttfb``
+    seconds from sending the request to receiving the response headers,
+    including the connection time
+``transfer``
+    seconds spent reading the response body, None for streamed responses
+``bytes_out``, ``bytes_in``
+    request and response body sizes, None when not known up front
+``retries``
+    number of times the request was sent again after a failure
+
+The records can be written as JSON lines or as Chrome trace events, and
+summarized per service and endpoint.
+"""
+
+import contextlib
+import json
+import os
+import threading
+
+from osc_lib.command import command
+from osc_lib import utils
+import six
+from six.moves.urllib import parse as urlparse
+
+from openstackclient.i18n import _
+
+
+PHASES = ('auth', 'resolve', 'action', 'format')
+
+_state = {'phase': 'action'}
+_local = threading.local()
+
+
+def set_phase(name):
+    """Set the phase of the running command, for every thread"""
+
+    _state['phase'] = name
+
+
+def current_phase():
+    """Return the phase requests made now are recorded with"""
+
+    phases = getattr(_local, 'phases', None)
+    return phases[-1] if phases else _state['phase']
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Record the requests made by the current thread under phase name"""
+
+    phases = getattr(_local, 'phases', None)
+    if phases is None:
+        phases = _local.phases = []
+    phases.append(name)
+    try:
+        yield
+    finally:
+        phases.pop()
+
+
+def in_phase(name):
+    """Decorate a function to record its requests under phase name"""
+
+    def decorator(func):
+        @six.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_lookups():
+    """Record the requests of osc-lib's find_resource() under 'resolve'
+
+    Most commands look names and IDs up with osc_lib.utils.find_resource(),
+    called through the module, so wrapping it once per process covers
+    them and the plugins.  The lookup helpers of openstackclient itself
+    are decorated with in_phase('resolve').
+    """
+
+    if not getattr(utils.find_resource, '_resolve_phase', False):
+        find_resource = in_phase('resolve')(utils.find_resource)
+        find_resource._resolve_phase = True
+        utils.find_resource = find_resource
+
+
+class RequestStats(object):
+    """Counters the transport adapters update while a request runs"""
+
+    def __init__(self, nested=False):
+        self.nested = nested
+        self.sends = 0
+        self.connect = 0.0
+        self.tls = 0.0
+
+
+@contextlib.contextmanager
+def collect():
+    """Collect the transport events of the requests made in the block
+
+    Blocks may nest, e.g. when a request first fetches a token; events
+    are counted for the innermost one.
+
+    :returns: a RequestStats
+    """
+
+    stack = getattr(_local, 'stats', None)
+    if stack is None:
+        stack = _local.stats = []
+    stats = RequestStats(nested=bool(stack))
+    stack.append(stats)
+    try:
+        yield stats
+    finally:
+        stack.pop()
+
+
+def _current_stats():
+    stack = getattr(_local, 'stats', None)
+    return stack[-1] if stack else None
+
+
+def record_send():
+    """Count a request sent by a transport adapter"""
+
+    stats = _current_stats()
+    if stats is not None:
+        stats.sends += 1
+
+
+def record_connect(seconds, tls=0.0):
+    """Add the time taken to open a connection"""
+
+    stats = _current_stats()
+    if stats is not None:
+        stats.connect += seconds
+        stats.tls += tls
+
+
+def endpoint_of(url):
+    """Return the scheme, host and port part of url"""
+
+    parts = urlparse.urlparse(url)
+    return '%s://%s' % (parts.scheme, parts.netloc)
+
+
+def get_service_map(auth_ref):
+    """Map the endpoints of the service catalog to their service types
+
+    :param auth_ref: a keystoneauth AccessInfo, may be None
+    :returns: dict of endpoint (scheme://host:port) to service type
+    """
+
+    services = {}
+    catalog = getattr(auth_ref, 'service_catalog', None)
+    if catalog is None:
+        return services
+    for service in catalog.catalog or []:
+        for endpoint in service.get('endpoints', []):
+            for key in ('url', 'publicURL', 'internalURL', 'adminURL'):
+                if endpoint.get(key):
+                    services.setdefault(
+                        endpoint_of(endpoint[key]),
+                        service.get('type'),
+                    )
+    return services
+
+
+def fill_services(records, services):
+    """Set the service of the records the client did not name it for"""
+
+    for record in records:
+        if not record.get('service'):
+            record['service'] = services.get(record['endpoint'])
+    return records
+
+
+def write_json_lines(records, f):
+    """Write one JSON object per record"""
+
+    for record in records:
+        f.write(json.dumps(record, sort_keys=True, default=six.text_type))
+        f.write('\n')
+
+
+def write_trace_events(records, f):
+    """Write the records in the Chrome trace event format
+
+    The file can be loaded in chrome://tracing or Perfetto; each thread
+    that made requests gets its own track.
+    """
+
+    pid = os.getpid()
+    events = []
+    for record in records:
+        args = dict(
+            (k, v) for k, v in record.items()
+            if k not in ('start', 'method', 'url', 'thread')
+        )
+        events.append({
+            'name': '%s %s' % (record['method'], record['url']),
+            'cat': record.get('service') or record['phase'],
+            'ph': 'X',
+            'ts': int(record['start'] * 1e6),
+            'dur': int(record['elapsed'] * 1e6),
+            'pid': pid,
+            'tid': record.get('thread', 0),
+            'args': args,
+        })
+    json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+FORMATS = {
+    'json': write_json_lines,
+    'trace': write_trace_events,
+}
+
+
+def summarize(records):
+    """Total the records per service and endpoint
+
+    :returns:
+        list of (service, endpoint, requests, seconds, bytes in,
+        bytes out, retries) tuples, slowest first
+    """
+
+    totals = {}
+    for record in records:
+        key = (record.get('service') or '', record['endpoint'])
+        total = totals.setdefault(key, [0, 0.0, 0, 0, 0])
+        total[0] += 1
+        total[1] += record['elapsed']
+        total[2] += record.get('bytes_in') or 0
+        total[3] += record.get('bytes_out') or 0
+        total[4] += record.get('retries') or 0
+    rows = [k + tuple(t) for k, t in totals.items()]
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return [
+        row[:3] + (round(row[3], 3),) + row[4:] for row in rows
+    ]
+
+
+class TimingSummary(command.Lister):
+    """Show the API call timing data per service and endpoint"""
+
+    def take_action(self, parsed_args):
+        column_headers = (
+            _('Service'),
+            _('Endpoint'),
+            _('Requests'),
+            _('Seconds'),
+            _('Bytes In'),
+            _('Bytes Out'),
+            _('Retries'),
+        )
+        return column_headers, summarize(self.app.timing_records)
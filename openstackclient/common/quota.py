@@ -16,15 +16,20 @@
 """Quota action implementations"""
 
 import itertools
+import logging
 import sys
 
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
+LOG = logging.getLogger(__name__)
+
 # List the quota items, map the internal argument name to the option
 # name that the user sees.
 
@@ -78,6 +83,246 @@ NETWORK_QUOTAS = {
     'l7policy': 'l7policies',
 }
 
+# Map the NETWORK_QUOTAS names to the attributes of the network quotas
+# of the SDK
+NETWORK_QUOTA_ATTRIBUTES = {
+    'floatingip': 'floating_ips',
+    'security_group_rule': 'security_group_rules',
+    'security_group': 'security_groups',
+    'network': 'networks',
+    'subnet': 'subnets',
+    'port': 'ports',
+    'router': 'routers',
+    'rbac_policy': 'rbac_policies',
+    'vip': 'vips',
+    'subnetpool': 'subnet_pools',
+    'healthmonitor': 'health_monitors',
+    'l7policy': 'l7_policies',
+}
+
+# Projects whose quotas are fetched at the same time by quota list
+QUOTA_LIST_WORKERS = 10
+
+
+def _split_quota(info, detail=False):
+    """Split a quota set into limits and usage
+
+    Quota sets with usage map each resource to a dict holding its
+    'limit' and its 'in_use' (Compute, Block Storage) or 'used' (Network)
+    count.
+
+    :returns: a (limits, usage) tuple of dicts
+    """
+
+    limits = {}
+    usage = {}
+    for k, v in six.iteritems(info):
+        if isinstance(v, dict):
+            limits[k] = v.get('limit')
+            usage[k] = v.get('in_use', v.get('used'))
+        else:
+            limits[k] = v
+    return limits, usage if detail else {}
+
+
+def _network_quota_info(quota):
+    """Return a network quota of the SDK as a dict of NETWORK_QUOTAS keys"""
+
+    info = {}
+    for k, attr in six.iteritems(NETWORK_QUOTA_ATTRIBUTES):
+        value = getattr(quota, attr, None)
+        if value is not None:
+            info[k] = value
+    return info
+
+
+def _is_endpoint_not_found(e):
+    return type(e).__name__ == 'EndpointNotFound'
+
+
+class ListQuota(command.Lister):
+    _description = _("List quotas of multiple projects")
+
+    def get_parser(self, prog_name):
+        parser = super(ListQuota, self).get_parser(prog_name)
+        parser.add_argument(
+            '--project',
+            metavar='<project>',
+            action='append',
+            help=_('List quotas of this project (name or ID) '
+                   '(repeat option to list multiple projects, '
+                   'default: all projects)'),
+        )
+        parser.add_argument(
+            '--compute',
+            action='store_true',
+            default=False,
+            help=_('List compute quotas'),
+        )
+        parser.add_argument(
+            '--volume',
+            action='store_true',
+            default=False,
+            help=_('List volume quotas'),
+        )
+        parser.add_argument(
+            '--network',
+            action='store_true',
+            default=False,
+            help=_('List network quotas'),
+        )
+        parser.add_argument(
+            '--detail',
+            action='store_true',
+            default=False,
+            help=_('Also list the resources in use'),
+        )
+        parallel.add_parallel_option(
+            parser,
+            help=_('Number of projects whose quotas are fetched at the '
+                   'same time (default: %s)') % QUOTA_LIST_WORKERS,
+            default=QUOTA_LIST_WORKERS,
+        )
+        return parser
+
+    def _get_projects(self, parsed_args):
+        identity_client = self.app.client_manager.identity
+        if not parsed_args.project:
+            return list(identity_client.projects.list())
+        return [
+            utils.find_resource(identity_client.projects, project)
+            for project in parsed_args.project
+        ]
+
+    def _get_network_quotas(self, parsed_args, projects):
+        """Return the network quotas of the projects, or None
+
+        Without usage they come from a single listing of the quotas that
+        differ from the defaults, the other projects getting the defaults.
+        """
+
+        if parsed_args.detail or not projects:
+            return None
+        client = self.app.client_manager.network
+        quotas = {}
+        for quota in client.quotas():
+            project_id = getattr(quota, 'project_id', None) or \
+                getattr(quota, 'tenant_id', None)
+            quotas[project_id] = _network_quota_info(quota)
+        defaults = _network_quota_info(
+            client.get_quota_default(projects[0].id))
+        return dict(
+            (p.id, quotas.get(p.id, defaults)) for p in projects
+        )
+
+    def _get_network_quota(self, project_id, detail):
+        client = self.app.client_manager.network
+        if detail:
+            try:
+                quota = client.get_quota(project_id, details=True)
+            except TypeError:
+                # openstacksdk older than 0.9.14 cannot get the usage
+                LOG.debug("Network quota usage is not supported by "
+                          "this openstacksdk")
+                quota = client.get_quota(project_id)
+        else:
+            quota = client.get_quota(project_id)
+        return _network_quota_info(quota)
+
+    def _get_quotas(self, project_id, services, network_quotas, detail):
+        """Return the limits and usage of one project, as dicts"""
+
+        limits = {}
+        usage = {}
+        for service in services:
+            if service == 'network':
+                if network_quotas is not None:
+                    info = network_quotas[project_id]
+                else:
+                    info = self._get_network_quota(project_id, detail)
+            else:
+                if service == 'compute':
+                    client = self.app.client_manager.compute
+                    kwargs = {'detail': True} if detail else {}
+                else:
+                    client = self.app.client_manager.volume
+                    kwargs = {'usage': True} if detail else {}
+                try:
+                    info = client.quotas.get(project_id, **kwargs)._info
+                except Exception as e:
+                    if _is_endpoint_not_found(e):
+                        continue
+                    raise
+            service_limits, service_usage = _split_quota(info, detail)
+            limits.update(service_limits)
+            usage.update(service_usage)
+        return limits, usage
+
+    def take_action(self, parsed_args):
+        network_enabled = self.app.client_manager.is_network_endpoint_enabled()
+
+        # Show every service by default
+        show_all = (not parsed_args.compute and
+                    not parsed_args.volume and
+                    not parsed_args.network)
+        services = []
+        quota_names = []
+        if parsed_args.compute or show_all:
+            services.append('compute')
+            quota_names.append(COMPUTE_QUOTAS)
+            if not network_enabled:
+                quota_names.append(NOVA_NETWORK_QUOTAS)
+        if parsed_args.volume or show_all:
+            services.append('volume')
+            quota_names.append(VOLUME_QUOTAS)
+        if (parsed_args.network or show_all) and network_enabled:
+            services.append('network')
+            quota_names.append(NETWORK_QUOTAS)
+
+        # Map the internal quota names to the external ones
+        names = []
+        for quotas in quota_names:
+            names += sorted(six.iteritems(quotas), key=lambda kv: kv[1])
+        columns = ['ID', 'Name'] + [v for k, v in names]
+        if parsed_args.detail:
+            columns += ['%s in use' % v for k, v in names]
+
+        projects = self._get_projects(parsed_args)
+        network_quotas = None
+        if 'network' in services:
+            network_quotas = self._get_network_quotas(parsed_args, projects)
+
+        def _get(project):
+            return self._get_quotas(
+                project.id, services, network_quotas, parsed_args.detail)
+
+        data = []
+        failed = 0
+        for project, quotas, e in parallel.execute(
+                _get, projects, parsed_args.parallel):
+            if e is not None:
+                failed += 1
+                LOG.error(_("Failed to get quotas of project "
+                            "'%(project)s': %(e)s"),
+                          {'project': project.id, 'e': e})
+                continue
+            limits, usage = quotas
+            row = [project.id, getattr(project, 'name', '')]
+            row += [limits.get(k) for k, v in names]
+            if parsed_args.detail:
+                row += [usage.get(k) for k, v in names]
+            data.append(tuple(row))
+
+        if failed:
+            msg = _("%(failed)s of %(total)s projects failed "
+                    "to list quotas.") % {'failed': failed,
+                                          'total': len(projects)}
+            # Still list the quotas of the other projects
+            if failed == len(projects):
+                raise exceptions.CommandError(msg)
+            LOG.error(msg)
+        return (columns, data)
+
 
 class SetQuota(command.Command):
     _description = _("Set quotas for project or class")
@@ -214,6 +459,14 @@ class ShowQuota(command.ShowOne):
         return parser
 
     def _get_project(self, parsed_args):
+        # Resolved once, the quotas of each service need it
+        found = getattr(self, '_found_project', None)
+        if found is None or found[0] != parsed_args.project:
+            found = (parsed_args.project, self._find_project(parsed_args))
+            self._found_project = found
+        return found[1]
+
+    def _find_project(self, parsed_args):
         if parsed_args.project is not None:
             identity_client = self.app.client_manager.identity
             project = utils.find_resource(
@@ -262,17 +515,23 @@ class ShowQuota(command.ShowOne):
 
         compute_client = self.app.client_manager.compute
         volume_client = self.app.client_manager.volume
+        if not parsed_args.quota_class:
+            self._get_project(parsed_args)
         # NOTE(dtroyer): These quota API calls do not validate the project
         #                or class arguments and return what appears to be
         #                the default quota values if the project or class
         #                does not exist. If this is determined to be the
         #                intended behaviour of the API we will validate
         #                the argument with Identity ourselves later.
-        compute_quota_info = self.get_compute_volume_quota(compute_client,
-                                                           parsed_args)
-        volume_quota_info = self.get_compute_volume_quota(volume_client,
-                                                          parsed_args)
-        network_quota_info = self.get_network_quota(parsed_args)
+        # The services are queried at the same time
+        compute_quota_info, volume_quota_info, network_quota_info = \
+            parallel.call_all([
+                lambda: self.get_compute_volume_quota(compute_client,
+                                                      parsed_args),
+                lambda: self.get_compute_volume_quota(volume_client,
+                                                      parsed_args),
+                lambda: self.get_network_quota(parsed_args),
+            ])
 
         info = {}
         info.update(compute_quota_info)
@@ -13,11 +13,22 @@
 
 """Subclass of keystoneauth1.session"""
 
+import threading
+import time
+
 from keystoneauth1 import session
+import six
+
+from openstackclient.common import profiling
 
 
 class TimingSession(session.Session):
-    """A Session that supports collection of timing data per Method URL"""
+    """A Session that supports collection of timing data per Method URL
+
+    Besides the (method url, elapsed) tuples of get_timings(), every
+    request is recorded in detail as described in common.profiling, see
+    get_records().
+    """
 
     def __init__(
             self,
@@ -28,23 +39,82 @@ class TimingSession(session.Session):
 
         # times is a list of tuples: ("method url", elapsed_time)
         self.times = []
+        # records is a list of dicts, see common.profiling
+        self.records = []
+        self._lock = threading.Lock()
 
     def get_timings(self):
         return self.times
 
+    def get_records(self):
+        return self.records
+
     def reset_timings(self):
         self.times = []
+        self.records = []
 
     def request(self, url, method, **kwargs):
         """Wrap the usual request() method with the timers"""
-        resp = super(TimingSession, self).request(url, method, **kwargs)
+        endpoint_filter = kwargs.get('endpoint_filter') or {}
+        start = time.time()
+        with profiling.collect() as stats:
+            resp = super(TimingSession, self).request(url, method, **kwargs)
+        elapsed = time.time() - start
+
+        times = []
         for h in resp.history:
-            self.times.append((
+            times.append((
                 "%s %s" % (h.request.method, h.request.url),
                 h.elapsed,
             ))
-        self.times.append((
+        times.append((
             "%s %s" % (resp.request.method, resp.request.url),
             resp.elapsed,
         ))
+
+        ttfb = sum(
+            r.elapsed.total_seconds() for r in resp.history + [resp])
+        stream = kwargs.get('stream', False)
+        retries = max(stats.sends - 1 - len(resp.history), 0)
+        raw_retries = getattr(getattr(resp, 'raw', None), 'retries', None)
+        retries += len(getattr(raw_retries, 'history', None) or ())
+        record = {
+            'start': start,
+            'method': resp.request.method,
+            'url': resp.request.url,
+            'service': endpoint_filter.get('service_type'),
+            'endpoint': profiling.endpoint_of(resp.request.url),
+            # A token fetched while sending another request is auth
+            'phase': 'auth' if stats.nested else profiling.current_phase(),
+            'status': resp.status_code,
+            'elapsed': elapsed,
+            'connect': stats.connect - stats.tls,
+            'tls': stats.tls,
+            'ttfb': ttfb,
+            'transfer': None if stream else max(elapsed - ttfb, 0.0),
+            'bytes_out': _body_size(resp.request),
+            'bytes_in': _response_size(resp, stream),
+            'retries': retries,
+            'thread': threading.current_thread().ident,
+        }
+        with self._lock:
+            self.times.extend(times)
+            self.records.append(record)
         return resp
+
+
+def _body_size(request):
+    body = request.body
+    if body is None:
+        return 0
+    if isinstance(body, (six.binary_type, six.text_type)):
+        return len(body)
+    length = request.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def _response_size(resp, stream):
+    if not stream:
+        return len(resp.content or b'')
+    length = resp.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
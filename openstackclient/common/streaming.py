@@ -0,0 +1,224 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Streaming helpers for long listings
+
+Paginated listings are walked as generators so a Lister command can emit
+its first row as soon as the first page arrives, and sorting, which has
+to see every row, spills sorted runs to temporary files instead of
+holding the whole listing in memory.
+"""
+
+import functools
+import heapq
+import itertools
+import json
+import tempfile
+
+from cliff.formatters import base
+from osc_lib import utils
+import six
+from six.moves import cPickle as pickle
+
+
+# Rows sorted in memory before a sorted run is written to a temporary file
+SORT_CHUNK_SIZE = 100000
+
+
+def iter_pages(list_f, marker=None, marker_f=None, **kwargs):
+    """Yield the rows of a marker-paginated listing, page by page
+
+    :param list_f:
+        function returning one page as a list; called with marker= and
+        the given keyword arguments
+    :param marker:
+        marker of the first page, None starts at the beginning
+    :param marker_f:
+        function returning the marker of the page following a row,
+        defaults to the row's 'id'
+    """
+
+    if marker_f is None:
+        marker_f = _get_id
+    first = None
+    while True:
+        page = list_f(marker=marker, **kwargs)
+        if not page:
+            return
+        page_first = marker_f(page[0])
+        if marker is not None and page_first in (marker, first):
+            # The service ignored the marker, do not list it again
+            return
+        for row in page:
+            yield row
+        first = page_first
+        marker = marker_f(page[-1])
+
+
+def _get_id(row):
+    return row['id']
+
+
+def iter_chunks(items, size):
+    """Yield lists of up to size consecutive items
+
+    :param items: an iterable, consumed one chunk at a time
+    :param int size: maximum number of items in a chunk
+    """
+
+    items = iter(items)
+    chunk = _take(items, size)
+    while chunk:
+        yield chunk
+        chunk = _take(items, size)
+
+
+def sort_items(items, sort_str, chunk_size=SORT_CHUNK_SIZE):
+    """Sort items like osc_lib.utils.sort_items, using bounded memory
+
+    Up to chunk_size items are sorted in memory at a time.  When there
+    are more, each sorted chunk is written to a temporary file and the
+    chunks are merged as the result is read.
+
+    :param items: an iterable of dicts or objects
+    :param sort_str: '<key1>:[direction1],<key2>:[direction2]...'
+    :param int chunk_size: maximum number of items sorted in memory
+    :returns: an iterable of the sorted items
+    """
+
+    if not sort_str:
+        return items
+
+    items = iter(items)
+    chunk = _take(items, chunk_size)
+    if len(chunk) < chunk_size:
+        return utils.sort_items(chunk, sort_str)
+
+    runs = []
+    while chunk:
+        run = tempfile.TemporaryFile()
+        for item in utils.sort_items(chunk, sort_str):
+            pickle.dump(item, run, pickle.HIGHEST_PROTOCOL)
+        run.seek(0)
+        runs.append(run)
+        chunk = _take(items, chunk_size)
+    return _merge(runs, _parse_sort(sort_str))
+
+
+def sort_presorted_items(items, sort_str, presorted):
+    """Sort items already sorted by their leading sort keys
+
+    When a service sorts by the first presorted keys of sort_str, items
+    with equal leading keys arrive together.  Each such run is sorted by
+    the remaining keys as soon as it ends, in a single pass that holds one
+    run in memory at a time.
+
+    :param items: an iterable of dicts or objects
+    :param sort_str: '<key1>:[direction1],<key2>:[direction2]...'
+    :param int presorted: number of leading keys items are sorted by
+    :returns: an iterable of the sorted items
+    """
+
+    if not sort_str:
+        return items
+    keys = _parse_sort(sort_str)
+    if presorted <= 0:
+        return sort_items(items, sort_str)
+    if presorted >= len(keys):
+        return items
+
+    lead = [key for key, _reverse in keys[:presorted]]
+    rest = ','.join('%s:%s' % (key, 'desc' if reverse else 'asc')
+                    for key, reverse in keys[presorted:])
+
+    def _lead(item):
+        return [utils.get_field(item, key) for key in lead]
+
+    return itertools.chain.from_iterable(
+        utils.sort_items(list(run), rest)
+        for _key, run in itertools.groupby(items, _lead)
+    )
+
+
+def _take(items, count):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= count:
+            break
+    return chunk
+
+
+def _parse_sort(sort_str):
+    keys = []
+    for sort_key in sort_str.strip().split(','):
+        key, _sep, direction = sort_key.partition(':')
+        keys.append((key, direction == 'desc'))
+    return keys
+
+
+def _read_run(run):
+    try:
+        while True:
+            yield pickle.load(run)
+    except EOFError:
+        pass
+    finally:
+        run.close()
+
+
+def _merge(runs, keys):
+    """Merge sorted runs, keeping equal items in run order"""
+
+    def _compare(a, b):
+        for key, reverse in keys:
+            x = utils.get_field(a, key)
+            y = utils.get_field(b, key)
+            if x != y:
+                result = -1 if x < y else 1
+                return -result if reverse else result
+        return 0
+
+    sort_key = functools.cmp_to_key(_compare)
+    readers = [_read_run(run) for run in runs]
+    heap = []
+    for index, reader in enumerate(readers):
+        for item in reader:
+            heap.append((sort_key(item), index, item))
+            break
+    heapq.heapify(heap)
+    while heap:
+        _key, index, item = heap[0]
+        yield item
+        for item in readers[index]:
+            heapq.heapreplace(heap, (sort_key(item), index, item))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+class JSONLinesFormatter(base.ListFormatter):
+    """Write one JSON object per row as soon as the row is available"""
+
+    def add_argument_group(self, parser):
+        pass
+
+    def emit_list(self, column_names, data, stdout, parsed_args):
+        for row in data:
+            item = {}
+            for name, value in zip(column_names, row):
+                if hasattr(value, 'machine_readable'):
+                    value = value.machine_readable()
+                item[name] = value
+            stdout.write(json.dumps(item, default=six.text_type))
+            stdout.write('\n')
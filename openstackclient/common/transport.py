@@ -0,0 +1,212 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""A pooled HTTP transport shared by the service clients
+
+Every client built by the ClientManager sends its requests through the
+requests.Session of the one keystoneauth session, so connections, and
+their TLS sessions, opened for one service are reused by the others.
+This module sizes the connection pools of that requests.Session and sets
+how failed connections are retried.  Its adapters also report the sends
+and the connection and TLS setup times to common.profiling.
+"""
+
+import threading
+import time
+
+from keystoneauth1 import session as ks_session
+from oslo_utils import strutils
+import requests
+from requests.packages.urllib3 import connection
+from requests.packages.urllib3 import connectionpool
+from requests.packages.urllib3.util import retry
+
+from openstackclient.common import profiling
+
+
+# Connections kept open to each host, at least the --parallel count used
+DEFAULT_POOL_SIZE = 10
+# Hosts whose connection pools are kept
+POOL_HOSTS = 10
+# Retries of a request whose connection failed or was dropped
+DEFAULT_MAX_RETRIES = 1
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+class _TimedHTTPConnection(connection.HTTPConnection):
+
+    def _new_conn(self):
+        start = time.time()
+        try:
+            return super(_TimedHTTPConnection, self)._new_conn()
+        finally:
+            profiling.record_connect(time.time() - start)
+
+
+class _TimedHTTPSConnection(connection.HTTPSConnection):
+
+    def _new_conn(self):
+        start = time.time()
+        try:
+            return super(_TimedHTTPSConnection, self)._new_conn()
+        finally:
+            self._tcp_time = time.time() - start
+
+    def connect(self):
+        self._tcp_time = 0.0
+        start = time.time()
+        try:
+            return super(_TimedHTTPSConnection, self).connect()
+        finally:
+            elapsed = time.time() - start
+            profiling.record_connect(
+                elapsed, tls=max(elapsed - self._tcp_time, 0.0))
+
+
+class _TimedHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimingMixin(object):
+    """Report sends and new connections to common.profiling"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_TimingMixin, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        profiling.record_send()
+        return super(_TimingMixin, self).send(request, **kwargs)
+
+
+class _KeepAliveAdapter(_TimingMixin, ks_session.TCPKeepAliveAdapter):
+    pass
+
+
+class _Adapter(_TimingMixin, requests.adapters.HTTPAdapter):
+    pass
+
+
+def make_adapter(
+    pool_size=DEFAULT_POOL_SIZE,
+    max_retries=DEFAULT_MAX_RETRIES,
+    keepalive=True,
+):
+    """Return a transport adapter with the given pooling and retries
+
+    Only connection errors are retried, and a request whose response was
+    lost is only sent again if its method is idempotent, so a connection
+    closed by the server between two requests is safe to reuse.  HTTP
+    error statuses are left to keystoneauth.
+
+    :param int pool_size: connections kept open to each host
+    :param int max_retries: retries of a failed connection
+    :param bool keepalive: enable TCP keep-alive on the connections
+    """
+
+    adapter_class = _KeepAliveAdapter if keepalive else _Adapter
+    return adapter_class(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=pool_size,
+        max_retries=_make_retry(max_retries),
+    )
+
+
+def _make_retry(max_retries):
+    kwargs = {
+        'total': max_retries,
+        'connect': max_retries,
+        'read': max_retries,
+    }
+    try:
+        return retry.Retry(status=0, raise_on_status=False, **kwargs)
+    except TypeError:
+        # urllib3 older than 1.21, bundled with requests older than 2.14,
+        # has no status retries to turn off
+        return retry.Retry(**kwargs)
+
+
+def configure(
+    session,
+    pool_size=DEFAULT_POOL_SIZE,
+    max_retries=DEFAULT_MAX_RETRIES,
+    keepalive=True,
+):
+    """Mount a pooled adapter on a requests.Session for HTTP and HTTPS
+
+    :param session: a requests.Session
+    :param int pool_size: connections kept open to each host
+    :param int max_retries: retries of a failed connection
+    :param bool keepalive: enable TCP keep-alive on the connections
+    """
+
+    adapter = make_adapter(pool_size, max_retries, keepalive)
+    for scheme in ('https://', 'http://'):
+        session.mount(scheme, adapter)
+    return session
+
+
+def configure_from_config(session, config):
+    """Configure a requests.Session from the cloud configuration
+
+    Reads ``http_pool_size``, ``http_max_retries`` and
+    ``http_no_keepalive``, set with the matching --os-http-* options,
+    environment variables or in clouds.yaml.
+
+    :param session: a requests.Session
+    :param dict config: the cloud configuration
+    """
+
+    return configure(
+        session,
+        pool_size=_int(config.get('http_pool_size'), DEFAULT_POOL_SIZE),
+        max_retries=_int(
+            config.get('http_max_retries'),
+            DEFAULT_MAX_RETRIES,
+        ),
+        keepalive=not strutils.bool_from_string(
+            config.get('http_no_keepalive'),
+        ),
+    )
+
+
+def get_default_session():
+    """Return the keystoneauth session used when none was given
+
+    It is created once per process, so API objects built without a
+    session still share their connections.
+    """
+
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            session = ks_session.Session()
+            configure(session.session)
+            _default_session = session
+    return _default_session
+
+
+def _int(value, default):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return default
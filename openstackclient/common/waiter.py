@@ -0,0 +1,216 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Wait for many resources to reach a final status"""
+
+import logging
+import time
+
+import six
+
+
+LOG = logging.getLogger(__name__)
+
+
+class Waiter(object):
+    """Poll a set of resources until each one succeeds or fails
+
+    When a list function is given, every poll cycle makes a single list
+    call asking only for the resources changed since the previous cycle
+    (e.g. Nova's ``changes-since``) instead of one GET per resource.  The
+    first list starts from the oldest ``updated`` value of the resources;
+    when some have none, the first cycle fetches them one by one and
+    takes it from there, and changes are listed from the second cycle.
+    Each resource the list covers is returned by the first list, so after
+    that a resource missing from a list has not changed.  The newest
+    ``updated`` value seen is used as the next marker, so the service's
+    clock is used rather than the local one.  Resources that the first
+    list did not return are still fetched one by one, which keeps the
+    result correct when the list does not cover them (for example an
+    admin waiting on a server in another project).
+
+    The delay between cycles starts at sleep_time and doubles, up to
+    max_sleep_time, while nothing changes; any change resets it.
+
+    :param get_f:
+        function taking a resource ID and returning the resource
+    :param list_f:
+        function taking a marker (an ``updated`` timestamp) and returning
+        the resources changed at or after it; None polls with get_f only
+    :param status_field: the status attribute of the resources
+    :param success_status: a list of status strings for success
+    :param error_status: a list of status strings for error
+    :param bool deleted:
+        wait for the resources to be deleted; a resource succeeds when
+        get_f raises one of exception_name or its status is one of
+        deleted_status
+    :param deleted_status: a list of status strings for deleted resources
+    :param exception_name: a list of exception names for deleted resources
+    :param sleep_time: initial delay between poll cycles (seconds)
+    :param max_sleep_time: maximum delay between poll cycles (seconds)
+    :param timeout:
+        give up after this long (seconds), None waits forever; resources
+        still pending then are reported as failed
+    :param callback:
+        called after every poll cycle with the number of finished
+        resources, the total number of resources and the average progress
+        percentage, useful to display a single progress line
+    """
+
+    def __init__(self, get_f, list_f=None, status_field='status',
+                 success_status=['active'], error_status=['error'],
+                 deleted=False, deleted_status=['deleted'],
+                 exception_name=['NotFound'], sleep_time=2,
+                 max_sleep_time=30, timeout=None, callback=None):
+        self.get_f = get_f
+        self.list_f = list_f
+        self.status_field = status_field
+        self.success_status = success_status
+        self.error_status = error_status
+        self.deleted = deleted
+        self.deleted_status = deleted_status
+        self.exception_name = exception_name
+        self.sleep_time = sleep_time
+        self.max_sleep_time = max(sleep_time, max_sleep_time)
+        self.timeout = timeout
+        self.callback = callback
+
+    def wait(self, resources):
+        """Wait for resources to finish
+
+        :param resources:
+            resources or resource IDs to wait for; the oldest ``updated``
+            value of the resource objects, when they all have one, is used
+            as the first list marker
+        :returns:
+            dict mapping each resource ID to True on success or False if
+            it went to an error status or the timeout was reached
+        """
+
+        results = {}
+        states = {}
+        resources = list(resources)
+        for res in resources:
+            states[getattr(res, 'id', res)] = (None, 0)
+        unlisted = set(states)
+        marker = _oldest(resources)
+        first = True
+        total = len(states)
+
+        sleep_time = self.sleep_time
+        elapsed = 0
+        while True:
+            changed = False
+            pending = [i for i in states if i not in results]
+
+            if self.list_f and marker is not None:
+                listed = set()
+                for res in self.list_f(marker):
+                    res_id = getattr(res, 'id', None)
+                    marker = _newer(marker, res)
+                    listed.add(res_id)
+                    if res_id in states and res_id not in results:
+                        changed |= self._update(res_id, res, results, states)
+                if first:
+                    # Only the resources the list covers are left to it
+                    unlisted -= listed
+                    first = False
+
+            fetched = []
+            for res_id in pending:
+                if res_id in results or res_id not in unlisted:
+                    continue
+                try:
+                    res = self.get_f(res_id)
+                except Exception as e:
+                    if (self.deleted and
+                            type(e).__name__ in self.exception_name):
+                        results[res_id] = True
+                        changed = True
+                        continue
+                    raise
+                fetched.append(res)
+                changed |= self._update(res_id, res, results, states)
+            if self.list_f and marker is None:
+                # Changes are listed from the next cycle on
+                marker = _oldest(fetched)
+
+            if self.callback:
+                average = sum(
+                    100 if i in results else states[i][1] for i in states
+                ) // (total or 1)
+                self.callback(len(results), total, average)
+
+            if len(results) == total:
+                break
+            if self.timeout is not None and elapsed >= self.timeout:
+                LOG.debug("Timed out waiting for %s",
+                          ', '.join(i for i in states if i not in results))
+                for res_id in states:
+                    results.setdefault(res_id, False)
+                break
+
+            if changed:
+                sleep_time = self.sleep_time
+            time.sleep(sleep_time)
+            elapsed += sleep_time
+            if not changed:
+                sleep_time = min(sleep_time * 2, self.max_sleep_time)
+
+        return results
+
+    def _update(self, res_id, res, results, states):
+        """Record the state of one resource, return True if it changed"""
+
+        status = (getattr(res, self.status_field, None) or '').lower()
+        if self.deleted and status in self.deleted_status:
+            results[res_id] = True
+            return True
+        if not self.deleted and status in self.success_status:
+            results[res_id] = True
+            return True
+        if status in self.error_status:
+            results[res_id] = False
+            return True
+
+        progress = getattr(res, 'progress', None)
+        if not isinstance(progress, six.integer_types):
+            progress = 0
+        state = (status, progress)
+        changed = state != states[res_id]
+        states[res_id] = state
+        return changed
+
+
+def _oldest(resources):
+    """Return the earliest updated time of resources, None if any has none"""
+
+    oldest = None
+    for res in resources:
+        updated = getattr(res, 'updated', None)
+        if not isinstance(updated, six.string_types):
+            return None
+        if oldest is None or updated < oldest:
+            oldest = updated
+    return oldest
+
+
+def _newer(marker, res):
+    """Return the later of marker and the updated time of res"""
+
+    updated = getattr(res, 'updated', None)
+    if not isinstance(updated, six.string_types):
+        return marker
+    if marker is None or updated > marker:
+        return updated
+    return marker
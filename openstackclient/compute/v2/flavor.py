@@ -23,13 +23,22 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import cache
+from openstackclient.common import parallel
+from openstackclient.common import profiling
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
 
 LOG = logging.getLogger(__name__)
 
+# Seconds fetched flavor extra specs are cached on disk
+EXTRA_SPECS_CACHE_TTL = 600
+# Concurrent requests when fetching flavor extra specs
+EXTRA_SPECS_WORKERS = 8
 
+
+@profiling.in_phase('resolve')
 def _find_flavor(compute_client, flavor):
     try:
         return compute_client.flavors.get(flavor)
@@ -48,6 +57,63 @@ def _find_flavor(compute_client, flavor):
             raise
 
 
+def _get_extra_specs_cache(client_manager):
+    return cache.get_project_cache(
+        client_manager, 'flavors', 'extra-specs', EXTRA_SPECS_CACHE_TTL)
+
+
+def _get_extra_specs(client_manager, flavors):
+    """Return a dict mapping flavor IDs to their extra specs
+
+    Since compute API microversion 2.61 the extra specs come with the
+    flavor list.  Otherwise they are taken from a short-lived on-disk
+    cache, and the missing ones fetched several flavors at a time.
+    Flavors whose extra specs cannot be fetched are left out.
+
+    :param client_manager: the ClientManager of the current command
+    :param flavors: a list of flavors
+    """
+
+    specs = {}
+    missing = []
+    for flavor in flavors:
+        extra_specs = getattr(flavor, 'extra_specs', None)
+        if isinstance(extra_specs, dict):
+            specs[flavor.id] = extra_specs
+        else:
+            missing.append(flavor)
+    if not missing:
+        return specs
+
+    specs_cache = _get_extra_specs_cache(client_manager)
+    if specs_cache:
+        specs.update(specs_cache.get_many([f.id for f in missing]))
+        missing = [f for f in missing if f.id not in specs]
+
+    def _get_keys(flavor):
+        return flavor.get_keys()
+
+    found = {}
+    for flavor, keys, e in parallel.execute(
+            _get_keys, missing, EXTRA_SPECS_WORKERS):
+        if e is not None:
+            LOG.warning(_("Unable to get properties of flavor %(flavor)s: "
+                          "%(e)s"), {'flavor': flavor.id, 'e': e})
+            continue
+        found[flavor.id] = dict(keys)
+
+    if specs_cache and found:
+        specs_cache.set_many(found)
+    specs.update(found)
+    return specs
+
+
+def _forget_extra_specs(client_manager, flavor):
+    specs_cache = _get_extra_specs_cache(client_manager)
+    if specs_cache:
+        specs_cache.delete_many([flavor.id])
+
+
 class CreateFlavor(command.ShowOne):
     _description = _("Create new flavor")
 
@@ -291,8 +357,9 @@ class ListFlavor(command.Lister):
                 "RXTX Factor",
                 "Properties",
             )
+            specs = _get_extra_specs(self.app.client_manager, data)
             for f in data:
-                f.properties = f.get_keys()
+                f.properties = specs.get(f.id, {})
 
         column_headers = columns
 
@@ -342,6 +409,7 @@ class SetFlavor(command.Command):
             except Exception as e:
                 LOG.error(_("Failed to set flavor property: %s"), e)
                 result += 1
+            _forget_extra_specs(self.app.client_manager, flavor)
 
         if parsed_args.project:
             try:
@@ -448,6 +516,7 @@ class UnsetFlavor(command.Command):
             except Exception as e:
                 LOG.error(_("Failed to unset flavor property: %s"), e)
                 result += 1
+            _forget_extra_specs(self.app.client_manager, flavor)
 
         if parsed_args.project:
             try:
@@ -33,12 +33,20 @@ try:
 except ImportError:
     from novaclient.v1_1 import servers
 
+from openstackclient.common import cache
+from openstackclient.common import parallel
+from openstackclient.common import waiter
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
 
 LOG = logging.getLogger(__name__)
 
+# Image IDs per image list request and concurrent requests when looking
+# up the names of the images used by servers
+IMAGE_LOOKUP_BATCH = 50
+IMAGE_LOOKUP_WORKERS = 4
+
 
 def _format_servers_list_networks(networks):
     """Return a formatted string of a server's networks
@@ -79,6 +87,62 @@ def _format_servers_list_power_state(state):
         return 'N/A'
 
 
+def _get_image_names(client_manager, image_ids):
+    """Return a dict mapping the given image IDs to image names
+
+    Only the given images are fetched, in concurrent batches filtered with
+    ``id=in:...`` on Image v2, and names are cached briefly on disk.
+    Images that cannot be found are left out.
+
+    :param client_manager: the ClientManager of the current command
+    :param image_ids: a list of image IDs
+    """
+
+    names = {}
+    name_cache = cache.get_name_cache(client_manager, 'image')
+    if name_cache:
+        names.update(name_cache.get_many(image_ids))
+
+    missing = [i for i in image_ids if i not in names]
+    if not missing:
+        return names
+
+    image_client = client_manager.image
+    filtered = client_manager._api_version['image'] == '2'
+
+    def _get_batch(batch):
+        images = []
+        if filtered:
+            images = list(image_client.images.list(
+                filters={'id': 'in:' + ','.join(batch)},
+            ))
+        if not images:
+            # Image v1 has no ID filter, and Image v2 before the "in"
+            # operator compares the whole value, so look up one by one
+            for image_id in batch:
+                try:
+                    images.append(image_client.images.get(image_id))
+                except Exception as e:
+                    LOG.debug("Image %s not found: %s", image_id, e)
+        return images
+
+    batches = [missing[i:i + IMAGE_LOOKUP_BATCH]
+               for i in range(0, len(missing), IMAGE_LOOKUP_BATCH)]
+    found = {}
+    for batch, images, e in parallel.execute(
+            _get_batch, batches, IMAGE_LOOKUP_WORKERS):
+        if e is not None:
+            LOG.debug("Unable to look up images %s: %s", batch, e)
+            continue
+        for image in images:
+            found[image.id] = image.name
+
+    if name_cache and found:
+        name_cache.set_many(found)
+    names.update(found)
+    return names
+
+
 def _get_ip_address(addresses, address_type, ip_address_family):
         # Old style addresses
         if address_type in addresses:
@@ -174,6 +238,38 @@ def _show_progress(progress):
         sys.stdout.flush()
 
 
+def _show_wait_progress(done, total, progress):
+    if total > 1:
+        sys.stdout.write(_('\rProgress: %(done)s of %(total)s servers done')
+                         % {'done': done, 'total': total})
+        sys.stdout.flush()
+    else:
+        _show_progress(progress)
+
+
+def _wait_for_servers(compute_client, servers, **kwargs):
+    """Wait for servers, listing the changed ones once per poll cycle
+
+    :param compute_client: a compute client
+    :param servers: a list of servers or server IDs
+    :param kwargs: passed to waiter.Waiter
+    :returns: dict mapping server IDs to True on success
+    """
+
+    def _list_changed(since):
+        # Also returns servers deleted since the marker, as DELETED
+        return compute_client.servers.list(
+            search_opts={'changes-since': since},
+        )
+
+    return waiter.Waiter(
+        compute_client.servers.get,
+        list_f=_list_changed,
+        callback=_show_wait_progress,
+        **kwargs
+    ).wait(servers)
+
+
 class AddFixedIP(command.Command):
     _description = _("Add fixed IP address to server")
 
@@ -597,11 +693,7 @@ class CreateServer(command.ShowOne):
                 userdata.close()
 
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
-                server.id,
-                callback=_show_progress,
-            ):
+            if all(_wait_for_servers(compute_client, [server]).values()):
                 sys.stdout.write('\n')
             else:
                 LOG.error(_('Error creating server: %s'),
@@ -657,26 +749,50 @@ class DeleteServer(command.Command):
             action='store_true',
             help=_('Wait for delete to complete'),
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
+
+        def _delete(server):
             server_obj = utils.find_resource(
                 compute_client.servers, server)
             compute_client.servers.delete(server_obj.id)
-            if parsed_args.wait:
-                if utils.wait_for_delete(
-                    compute_client.servers,
-                    server_obj.id,
-                    callback=_show_progress,
-                ):
-                    sys.stdout.write('\n')
-                else:
-                    LOG.error(_('Error deleting server: %s'),
-                              server_obj.id)
-                    sys.stdout.write(_('Error deleting server\n'))
-                    raise SystemExit
+            return server_obj
+
+        results = parallel.execute(
+            _delete, parsed_args.server, parsed_args.parallel)
+        result = 0
+        for server, e in parallel.failures(results):
+            result += 1
+            LOG.error(_("Failed to delete server with name or "
+                        "ID '%(server)s': %(e)s"),
+                      {'server': server, 'e': e})
+
+        if parsed_args.wait:
+            deleted = [server_obj for _server, server_obj, e in results
+                       if e is None]
+            done = _wait_for_servers(
+                compute_client,
+                deleted,
+                deleted=True,
+                timeout=300,
+            )
+            sys.stdout.write('\n')
+            failed = [server_obj.id for server_obj in deleted
+                      if not done[server_obj.id]]
+            for server_id in failed:
+                LOG.error(_('Error deleting server: %s'), server_id)
+            if failed:
+                sys.stdout.write(_('Error deleting server\n'))
+                raise SystemExit
+
+        if result > 0:
+            total = len(parsed_args.server)
+            msg = (_("%(result)s of %(total)s servers failed "
+                   "to delete.") % {'result': result, 'total': total})
+            raise exceptions.CommandError(msg)
 
 
 class ListServer(command.Lister):
@@ -754,6 +870,12 @@ class ListServer(command.Lister):
             default=False,
             help=_('List additional fields in output'),
         )
+        parser.add_argument(
+            '--no-name-lookup',
+            action='store_true',
+            default=False,
+            help=_('Skip image name lookup, show image IDs instead'),
+        )
         parser.add_argument(
             '--marker',
             metavar='<marker>',
@@ -875,6 +997,20 @@ class ListServer(command.Lister):
             )
             mixed_case_fields = []
 
+        if parsed_args.no_name_lookup:
+            if parsed_args.long:
+                # The image ID is already shown next to the name
+                columns = tuple(
+                    c for c in columns if c != 'Image Name')
+                column_headers = tuple(
+                    c for c in column_headers if c != 'Image Name')
+            else:
+                columns = tuple(
+                    'Image ID' if c == 'Image Name' else c for c in columns)
+                column_headers = tuple(
+                    'Image ID' if c == 'Image Name' else c
+                    for c in column_headers)
+
         marker_id = None
         if parsed_args.marker:
             marker_id = utils.find_resource(compute_client.servers,
@@ -884,24 +1020,26 @@ class ListServer(command.Lister):
                                            marker=marker_id,
                                            limit=parsed_args.limit)
 
-        images = {}
-        # Create a dict that maps image_id to image object.
-        # Needed so that we can display the "Image Name" column.
-        # "Image Name" is not crucial, so we swallow any exceptions.
-        try:
-            images_list = self.app.client_manager.image.images.list()
-            for i in images_list:
-                images[i.id] = i
-        except Exception:
-            pass
+        # Only look up the names of the images the servers use, and only
+        # if the "Image Name" column is going to be shown.
+        image_names = {}
+        selected = getattr(parsed_args, 'columns', None)
+        if 'Image Name' in column_headers and (
+                not selected or 'Image Name' in selected):
+            image_ids = set(s.image['id'] for s in data if 'id' in s.image)
+            # "Image Name" is not crucial, so we swallow any exceptions.
+            try:
+                image_names = _get_image_names(
+                    self.app.client_manager, sorted(image_ids))
+            except Exception as e:
+                LOG.debug("Unable to look up image names: %s", e)
 
         # Populate image_name and image_id attributes of server objects
         # so that we can display "Image Name" and "Image ID" columns.
         for s in data:
             if 'id' in s.image:
-                image = images.get(s.image['id'])
-                if image:
-                    s.image_name = image.name
+                if s.image['id'] in image_names:
+                    s.image_name = image_names[s.image['id']]
                 s.image_id = s.image['id']
             else:
                 s.image_name = ''
@@ -1025,11 +1163,7 @@ class MigrateServer(command.Command):
             server.migrate()
 
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
-                server.id,
-                callback=_show_progress,
-            ):
+            if all(_wait_for_servers(compute_client, [server]).values()):
                 sys.stdout.write(_('Complete\n'))
             else:
                 LOG.error(_('Error migrating server: %s'),
@@ -1101,11 +1235,7 @@ class RebootServer(command.Command):
         server.reboot(parsed_args.reboot_type)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
-                server.id,
-                callback=_show_progress,
-            ):
+            if all(_wait_for_servers(compute_client, [server]).values()):
                 sys.stdout.write(_('Complete\n'))
             else:
                 LOG.error(_('Error rebooting server: %s'),
@@ -1154,11 +1284,7 @@ class RebuildServer(command.ShowOne):
 
         server = server.rebuild(image, parsed_args.password)
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
-                server.id,
-                callback=_show_progress,
-            ):
+            if all(_wait_for_servers(compute_client, [server]).values()):
                 sys.stdout.write(_('Complete\n'))
             else:
                 LOG.error(_('Error rebuilding server: %s'),
@@ -1362,12 +1488,11 @@ class ResizeServer(command.Command):
             )
             compute_client.servers.resize(server, flavor)
             if parsed_args.wait:
-                if utils.wait_for_status(
-                    compute_client.servers.get,
-                    server.id,
+                if all(_wait_for_servers(
+                    compute_client,
+                    [server],
                     success_status=['active', 'verify_resize'],
-                    callback=_show_progress,
-                ):
+                ).values()):
                     sys.stdout.write(_('Complete\n'))
                 else:
                     LOG.error(_('Error resizing server: %s'),
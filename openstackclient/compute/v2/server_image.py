@@ -24,13 +24,14 @@ from osc_lib import utils
 from oslo_utils import importutils
 import six
 
+from openstackclient.common import waiter
 from openstackclient.i18n import _
 
 
 LOG = logging.getLogger(__name__)
 
 
-def _show_progress(progress):
+def _show_progress(done, total, progress):
     if progress:
         sys.stdout.write('\rProgress: %s' % progress)
         sys.stdout.flush()
@@ -87,11 +88,10 @@ class CreateServerImage(command.ShowOne):
         )
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if waiter.Waiter(
                 image_client.images.get,
-                image_id,
                 callback=_show_progress,
-            ):
+            ).wait([image_id])[image_id]:
                 sys.stdout.write('\n')
             else:
                 LOG.error(_('Error creating server image: %s'),
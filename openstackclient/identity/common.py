@@ -23,9 +23,11 @@ from keystoneclient.v3 import users
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import profiling
 from openstackclient.i18n import _
 
 
+@profiling.in_phase('resolve')
 def find_service(identity_client, name_type_or_id):
     """Find a service by id, name or type."""
 
@@ -133,6 +135,7 @@ def find_user(identity_client, name_or_id, domain_name_or_id=None):
                                        users.User, domain_id=domain_id)
 
 
+@profiling.in_phase('resolve')
 def _find_identity_resource(identity_client_manager, name_or_id,
                             resource_type, **kwargs):
     """Find a specific identity resource.
@@ -19,16 +19,93 @@ import copy
 import logging
 
 from keystoneauth1 import exceptions as ks_exc
+from keystoneclient.v3 import users
 from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 from openstackclient.identity import common
 
 
 LOG = logging.getLogger(__name__)
 
+# Project members of one domain above which the users of the domain are
+# listed at once rather than fetched one by one
+USER_LIST_THRESHOLD = 20
+# Concurrent requests when fetching users one by one
+USER_LOOKUP_WORKERS = 8
+
+
+def _get_project_users(identity_client, project_id, long=False):
+    """Return the users with a role assignment on a project
+
+    The role assignments are listed with the names of their users, which
+    is all a short listing shows.  For a long listing the users of a
+    domain holding many of the project members are listed at once and
+    joined in memory, and the remaining users are fetched several at a
+    time.  Users that cannot be fetched keep what the role assignments
+    tell about them.
+
+    :param identity_client: an Identity v3 client
+    :param string project_id: the project ID
+    :param bool long: fetch all the fields of the users
+    :returns: a list of users
+    """
+
+    assignments = identity_client.role_assignments.list(
+        project=project_id,
+        include_names=True,
+    )
+
+    # NOTE(stevemar): If a user has more than one role on a project
+    # then they will have two entries in the returned data. Since we
+    # are looking for any role, let's just track unique user IDs.
+    members = {}
+    for assignment in assignments:
+        if hasattr(assignment, 'user'):
+            members.setdefault(assignment.user['id'], assignment.user)
+
+    found = {}
+    missing = []
+    for user_id, info in members.items():
+        if not long and 'name' in info:
+            found[user_id] = users.User(
+                None, {'id': user_id, 'name': info['name']})
+        else:
+            missing.append(user_id)
+
+    by_domain = {}
+    for user_id in missing:
+        domain_id = (members[user_id].get('domain') or {}).get('id')
+        if domain_id:
+            by_domain.setdefault(domain_id, []).append(user_id)
+    for domain_id, user_ids in by_domain.items():
+        if len(user_ids) <= USER_LIST_THRESHOLD:
+            continue
+        wanted = set(user_ids)
+        for user in identity_client.users.list(domain=domain_id):
+            if user.id in wanted:
+                found[user.id] = user
+
+    def _get_user(user_id):
+        return identity_client.users.get(user_id)
+
+    for user_id, user, e in parallel.execute(
+            _get_user,
+            [i for i in missing if i not in found],
+            USER_LOOKUP_WORKERS):
+        if e is not None:
+            LOG.warning(_("Unable to get user %(user)s: %(e)s"),
+                        {'user': user_id, 'e': e})
+            info = members[user_id]
+            user = users.User(
+                None, {'id': user_id, 'name': info.get('name', '')})
+        found[user_id] = user
+
+    return [found[user_id] for user_id in members]
+
 
 class CreateUser(command.ShowOne):
     _description = _("Create new user")
@@ -228,23 +305,11 @@ class ListUser(command.Lister):
                     parsed_args.project,
                 ).id
 
-            assignments = identity_client.role_assignments.list(
-                project=project)
-
-            # NOTE(stevemar): If a user has more than one role on a project
-            # then they will have two entries in the returned data. Since we
-            # are looking for any role, let's just track unique user IDs.
-            user_ids = set()
-            for assignment in assignments:
-                if hasattr(assignment, 'user'):
-                    user_ids.add(assignment.user['id'])
-
-            # NOTE(stevemar): Call find_resource once we have unique IDs, so
-            # it's fewer trips to the Identity API, then collect the data.
-            data = []
-            for user_id in user_ids:
-                user = utils.find_resource(identity_client.users, user_id)
-                data.append(user)
+            data = _get_project_users(
+                identity_client,
+                project,
+                long=parsed_args.long,
+            )
 
         else:
             data = identity_client.users.list(
@@ -15,6 +15,7 @@
 
 import logging
 
+from glanceclient.common import utils as gc_utils
 from osc_lib import utils
 
 from openstackclient.i18n import _
@@ -51,11 +52,12 @@ def make_client(instance):
         interface=instance.interface,
     )
 
+    # Share the session, and so its connections, with the other clients
     client = image_client(
-        endpoint,
-        token=instance.auth.get_token(instance.session),
-        cacert=instance.cacert,
-        insecure=not instance.verify,
+        session=instance.session,
+        endpoint_override=gc_utils.strip_version(endpoint)[0],
+        region_name=instance.region_name,
+        interface=instance.interface,
     )
 
     # Create the low-level API
@@ -29,10 +29,13 @@ else:
 from glanceclient.common import utils as gc_utils
 from osc_lib.cli import parseractions
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 
 from openstackclient.api import utils as api_utils
+from openstackclient.common import parallel
+from openstackclient.common import streaming
 from openstackclient.i18n import _
 
 
@@ -290,17 +293,33 @@ class DeleteImage(command.Command):
             nargs="+",
             help=_("Image(s) to delete (name or ID)"),
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         image_client = self.app.client_manager.image
-        for image in parsed_args.images:
+
+        def _delete(image):
             image_obj = utils.find_resource(
                 image_client.images,
                 image,
             )
             image_client.images.delete(image_obj.id)
 
+        del_result = 0
+        for image, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.images, parsed_args.parallel)):
+            del_result += 1
+            LOG.error(_("Failed to delete image with name or "
+                        "ID '%(image)s': %(e)s"),
+                      {'image': image, 'e': e})
+
+        total = len(parsed_args.images)
+        if (del_result > 0):
+            msg = (_("Failed to delete %(dresult)s of %(total)s images.")
+                   % {'dresult': del_result, 'total': total})
+            raise exceptions.CommandError(msg)
+
 
 class ListImage(command.Lister):
     _description = _("List available images")
@@ -353,9 +372,9 @@ class ListImage(command.Lister):
         parser.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
-            default='name:asc',
             help=_("Sort output by selected keys and directions(asc or desc) "
-                   "(default: name:asc), multiple keys and directions can be "
+                   "(default: unsorted, in the order returned by the "
+                   "server), multiple keys and directions can be "
                    "specified separated by comma"),
         )
         return parser
@@ -406,21 +425,13 @@ class ListImage(command.Lister):
             columns = ("ID", "Name", "Status")
             column_headers = columns
 
-        # List of image data received
-        data = []
-        # No pages received yet, so start the page marker at None.
-        marker = None
-        while True:
-            page = image_client.api.image_list(marker=marker, **kwargs)
-            if not page:
-                break
-            data.extend(page)
-            # Set the marker to the id of the last item we received
-            marker = page[-1]['id']
+        # Fetch the pages as the rows are read
+        data = streaming.iter_pages(image_client.api.image_list, **kwargs)
 
         if parsed_args.property:
             # NOTE(dtroyer): coerce to a list to subscript it in py3
             attr, value = list(parsed_args.property.items())[0]
+            data = list(data)
             api_utils.simple_filter(
                 data,
                 attr=attr,
@@ -428,7 +439,7 @@ class ListImage(command.Lister):
                 property_field='properties',
             )
 
-        data = utils.sort_items(data, parsed_args.sort)
+        data = streaming.sort_items(data, parsed_args.sort)
 
         return (
             column_headers,
@@ -16,7 +16,12 @@
 """Image V2 Action Implementations"""
 
 import argparse
+import hashlib
+import itertools
 import logging
+import os
+import sys
+import time
 
 from glanceclient.common import utils as gc_utils
 from osc_lib.cli import parseractions
@@ -25,7 +30,9 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
-from openstackclient.api import utils as api_utils
+from openstackclient.api import image_v2
+from openstackclient.common import parallel
+from openstackclient.common import streaming
 from openstackclient.i18n import _
 from openstackclient.identity import common
 
@@ -34,10 +41,16 @@ DEFAULT_CONTAINER_FORMAT = 'bare'
 DEFAULT_DISK_FORMAT = 'raw'
 DISK_CHOICES = ["ami", "ari", "aki", "vhd", "vmdk", "raw", "qcow2", "vhdx",
                 "vdi", "iso"]
+# Image fields the Image service can sort a listing by
+SORT_KEYS = ('name', 'status', 'container_format', 'disk_format', 'size',
+             'id', 'created_at', 'updated_at')
 
 
 LOG = logging.getLogger(__name__)
 
+# Bytes read from the image data at a time while uploading
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
 
 def _format_image(image):
     """Format an image to make it more consistent with OSC operations."""
@@ -108,6 +121,88 @@ class AddProjectToImage(command.ShowOne):
         return zip(*sorted(six.iteritems(image_member)))
 
 
+class _UploadReader(object):
+    """Read image data while computing its checksums
+
+    The source is read UPLOAD_BUFFER_SIZE bytes at a time and every block
+    goes through MD5 and SHA-512 once, as it is handed to the HTTP client
+    in whatever sizes it reads, so the data is only read once.
+
+    :param fp: file-like object with the image data
+    :param size: size of the data if known, for progress reporting
+    :param callback:
+        called after every block with the number of bytes read, the size
+        and the elapsed time in seconds
+    """
+
+    def __init__(self, fp, size=None, callback=None):
+        self.fp = fp
+        self.size = size
+        self.callback = callback
+        self.md5 = hashlib.md5()
+        self.sha512 = hashlib.sha512()
+        self.bytes_read = 0
+        self.eof = False
+        self._block = b''
+        self._offset = 0
+        self._start = time.time()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b''.join(iter(lambda: self.read(UPLOAD_BUFFER_SIZE), b''))
+        if self._offset >= len(self._block) and not self.eof:
+            self._fill()
+        chunk = self._block[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+    def __iter__(self):
+        return iter(lambda: self.read(UPLOAD_BUFFER_SIZE), b'')
+
+    def _fill(self):
+        self._block = self.fp.read(UPLOAD_BUFFER_SIZE)
+        self._offset = 0
+        if not self._block:
+            self.eof = True
+            return
+        self.md5.update(self._block)
+        self.sha512.update(self._block)
+        self.bytes_read += len(self._block)
+        if self.callback:
+            self.callback(self.bytes_read, self.size,
+                          time.time() - self._start)
+
+
+def _show_upload_progress(done, total, elapsed):
+    rate = done / (elapsed or 1) / (1024 * 1024)
+    if total:
+        sys.stderr.write(
+            _('\rUploaded %(done)d%% of %(total).1f MB, %(rate).1f MB/s') %
+            {'done': done * 100 // total, 'total': total / (1024.0 * 1024),
+             'rate': rate})
+    else:
+        sys.stderr.write(
+            _('\rUploaded %(done).1f MB, %(rate).1f MB/s') %
+            {'done': done / (1024.0 * 1024), 'rate': rate})
+    sys.stderr.flush()
+
+
+def _verify_checksums(image, reader):
+    """Check the checksums Glance computed against the uploaded data"""
+
+    expected = [('checksum', reader.md5.hexdigest())]
+    if getattr(image, 'os_hash_algo', None) == 'sha512':
+        expected.append(('os_hash_value', reader.sha512.hexdigest()))
+    for attr, value in expected:
+        checksum = getattr(image, attr, None)
+        if checksum and checksum != value:
+            msg = (_("Image %(id)s has %(attr)s %(checksum)s but the "
+                     "uploaded data has %(value)s") %
+                   {'id': image.id, 'attr': attr, 'checksum': checksum,
+                    'value': value})
+            raise exceptions.CommandError(msg)
+
+
 class CreateImage(command.ShowOne):
     _description = _("Create/upload an image")
 
@@ -164,6 +259,27 @@ class CreateImage(command.ShowOne):
             metavar="<file>",
             help=_("Upload image from local file"),
         )
+        parser.add_argument(
+            "--import",
+            dest="use_import",
+            action="store_true",
+            default=False,
+            help=_("Use the image import API: stage the data of --file or "
+                   "standard input, or have the Image service fetch --uri, "
+                   "then import it"),
+        )
+        parser.add_argument(
+            "--uri",
+            metavar="<uri>",
+            help=_("URL of the image data for the Image service to "
+                   "download (implies --import)"),
+        )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            default=False,
+            help=_("Show upload progress"),
+        )
         parser.add_argument(
             "--volume",
             metavar="<volume>",
@@ -298,7 +414,9 @@ class CreateImage(command.ShowOne):
 
         # open the file first to ensure any failures are handled before the
         # image is created
-        fp = gc_utils.get_data_file(parsed_args)
+        fp = None
+        if not parsed_args.uri:
+            fp = gc_utils.get_data_file(parsed_args)
         info = {}
         if fp is not None and parsed_args.volume:
             raise exceptions.CommandError(_("Uploading data and using "
@@ -309,6 +427,21 @@ class CreateImage(command.ShowOne):
             LOG.warning(_("Failed to get an image file."))
             return {}, {}
 
+        use_import = parsed_args.use_import or bool(parsed_args.uri)
+        if use_import:
+            if parsed_args.volume:
+                raise exceptions.CommandError(_("--import cannot be used "
+                                                "with --volume"))
+            method = 'web-download' if parsed_args.uri else 'glance-direct'
+            if fp is None and not parsed_args.uri:
+                raise exceptions.CommandError(_("--import requires --uri, "
+                                                "--file or data on standard "
+                                                "input"))
+            if method not in image_client.api.image_import_methods():
+                msg = (_("The Image service does not support the "
+                         "%s import method") % method)
+                raise exceptions.CommandError(msg)
+
         if parsed_args.owner:
             kwargs['owner'] = common.find_project(
                 identity_client,
@@ -338,24 +471,52 @@ class CreateImage(command.ShowOne):
         else:
             image = image_client.images.create(**kwargs)
 
-        if fp is not None:
-            with fp:
+        if fp is not None or parsed_args.uri:
+            reader = None
+            if fp is not None:
                 try:
-                    image_client.images.upload(image.id, fp)
+                    size = os.path.getsize(parsed_args.file)
+                except (OSError, TypeError):
+                    # Standard input
+                    size = None
+                reader = _UploadReader(
+                    fp,
+                    size=size,
+                    callback=(_show_upload_progress
+                              if parsed_args.progress else None),
+                )
+            try:
+                if parsed_args.uri:
+                    image_client.api.image_import(
+                        image.id, method, uri=parsed_args.uri)
+                elif use_import:
+                    with fp:
+                        image_client.api.image_stage(image.id, iter(reader))
+                    image_client.api.image_import(image.id, method)
+                else:
+                    with fp:
+                        image_client.images.upload(image.id, reader)
+            except Exception:
+                # If the upload fails for some reason attempt to remove the
+                # dangling queued image made by the create() call above but
+                # only if the user did not specify an id which indicates
+                # the Image already exists and should be left alone.
+                try:
+                    if 'id' not in kwargs:
+                        image_client.images.delete(image.id)
                 except Exception:
-                    # If the upload fails for some reason attempt to remove the
-                    # dangling queued image made by the create() call above but
-                    # only if the user did not specify an id which indicates
-                    # the Image already exists and should be left alone.
-                    try:
-                        if 'id' not in kwargs:
-                            image_client.images.delete(image.id)
-                    except Exception:
-                        pass  # we don't care about this one
-                    raise  # now, throw the upload exception again
-
-                # update the image after the data has been uploaded
-                image = image_client.images.get(image.id)
+                    pass  # we don't care about this one
+                raise  # now, throw the upload exception again
+            finally:
+                if parsed_args.progress and reader is not None:
+                    sys.stderr.write('\n')
+
+            # update the image after the data has been uploaded
+            image = image_client.images.get(image.id)
+            # An import is processed asynchronously, the checksums are not
+            # known yet
+            if reader is not None and reader.eof and not use_import:
+                _verify_checksums(image, reader)
 
         if not info:
             info = _format_image(image)
@@ -374,24 +535,27 @@ class DeleteImage(command.Command):
             nargs="+",
             help=_("Image(s) to delete (name or ID)"),
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
 
-        del_result = 0
         image_client = self.app.client_manager.image
-        for image in parsed_args.images:
-            try:
-                image_obj = utils.find_resource(
-                    image_client.images,
-                    image,
-                )
-                image_client.images.delete(image_obj.id)
-            except Exception as e:
-                del_result += 1
-                LOG.error(_("Failed to delete image with name or "
-                            "ID '%(image)s': %(e)s"),
-                          {'image': image, 'e': e})
+
+        def _delete(image):
+            image_obj = utils.find_resource(
+                image_client.images,
+                image,
+            )
+            image_client.images.delete(image_obj.id)
+
+        del_result = 0
+        for image, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.images, parsed_args.parallel)):
+            del_result += 1
+            LOG.error(_("Failed to delete image with name or "
+                        "ID '%(image)s': %(e)s"),
+                      {'image': image, 'e': e})
 
         total = len(parsed_args.images)
         if (del_result > 0):
@@ -450,9 +614,9 @@ class ListImage(command.Lister):
         parser.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
-            default='name:asc',
             help=_("Sort output by selected keys and directions(asc or desc) "
-                   "(default: name:asc), multiple keys and directions can be "
+                   "(default: unsorted, in the order returned by the "
+                   "server), multiple keys and directions can be "
                    "specified separated by comma"),
         )
         parser.add_argument(
@@ -481,8 +645,6 @@ class ListImage(command.Lister):
             kwargs['private'] = True
         if parsed_args.shared:
             kwargs['shared'] = True
-        if parsed_args.limit:
-            kwargs['limit'] = parsed_args.limit
         if parsed_args.marker:
             kwargs['marker'] = utils.find_resource(image_client.images,
                                                    parsed_args.marker).id
@@ -517,32 +679,38 @@ class ListImage(command.Lister):
             columns = ("ID", "Name", "Status")
             column_headers = columns
 
-        # List of image data received
-        data = []
+        if parsed_args.property:
+            # The Image service filters on any image property
+            kwargs.update(parsed_args.property)
+
+        presorted = 0
+        if parsed_args.sort:
+            # Check the keys and directions before sending them
+            utils.sort_items([], parsed_args.sort)
+            sort_keys = []
+            for sort_key in parsed_args.sort.strip().split(','):
+                key, _sep, direction = sort_key.partition(':')
+                if key not in SORT_KEYS:
+                    break
+                sort_keys.append('%s:%s' % (key, direction or 'asc'))
+            presorted = len(sort_keys)
+            if sort_keys:
+                kwargs['sort'] = ','.join(sort_keys)
+        if parsed_args.limit and (presorted or not parsed_args.sort):
+            # Otherwise every image is needed to sort them, in full pages
+            kwargs['limit'] = parsed_args.limit
+
         if 'marker' in kwargs:
             data = image_client.api.image_list(**kwargs)
         else:
-            # No pages received yet, so start the page marker at None.
-            marker = None
-            while True:
-                page = image_client.api.image_list(marker=marker, **kwargs)
-                if not page:
-                    break
-                data.extend(page)
-                # Set the marker to the id of the last item we received
-                marker = page[-1]['id']
+            # Fetch the pages as the rows are read
+            data = streaming.iter_pages(image_client.api.image_list, **kwargs)
 
-        if parsed_args.property:
-            # NOTE(dtroyer): coerce to a list to subscript it in py3
-            attr, value = list(parsed_args.property.items())[0]
-            api_utils.simple_filter(
-                data,
-                attr=attr,
-                value=value,
-                property_field='properties',
-            )
-
-        data = utils.sort_items(data, parsed_args.sort)
+        # Only the keys the service cannot sort by are sorted here
+        data = streaming.sort_presorted_items(
+            data, parsed_args.sort, presorted)
+        if parsed_args.limit:
+            data = itertools.islice(data, parsed_args.limit)
 
         return (
             column_headers,
@@ -599,6 +767,11 @@ class SaveImage(command.Command):
             metavar="<filename>",
             help=_("Downloaded image save filename (default: stdout)"),
         )
+        parallel.add_parallel_option(
+            parser,
+            help=_("Number of byte ranges of the image to download at the "
+                   "same time, requires --file (default: 1)"),
+        )
         parser.add_argument(
             "image",
             metavar="<image>",
@@ -607,11 +780,43 @@ class SaveImage(command.Command):
         return parser
 
     def take_action(self, parsed_args):
+        if parsed_args.parallel > 1 and not parsed_args.file:
+            msg = _("--parallel requires --file")
+            raise exceptions.CommandError(msg)
+
         image_client = self.app.client_manager.image
         image = utils.find_resource(
             image_client.images,
             parsed_args.image,
         )
+
+        # A progress file left by an interrupted concurrent download is
+        # resumed even without --parallel
+        size = getattr(image, 'size', None)
+        if size and parsed_args.file and (
+                parsed_args.parallel > 1 or os.path.isfile(
+                    parsed_args.file + image_v2.PROGRESS_SUFFIX)):
+            checksum = getattr(image, 'checksum', None)
+            md5 = image_client.api.image_download(
+                image.id,
+                parsed_args.file,
+                size,
+                checksum=checksum,
+                workers=parsed_args.parallel,
+            )
+            if md5 is not None:
+                if checksum and md5.hexdigest() != checksum:
+                    msg = _("Checksum mismatch saving image %(image)s: "
+                            "expected %(expected)s, got %(actual)s") % {
+                        'image': image.id,
+                        'expected': checksum,
+                        'actual': md5.hexdigest(),
+                    }
+                    raise exceptions.CommandError(msg)
+                return
+            LOG.debug("Range requests not supported, downloading image %s "
+                      "sequentially", image.id)
+
         data = image_client.images.data(image.id)
 
         gc_utils.save_image(data, parsed_args.file)
@@ -13,8 +13,6 @@
 
 import logging
 
-from openstack import connection
-from openstack import profile
 from osc_lib import utils
 
 from openstackclient.i18n import _
@@ -33,14 +31,23 @@ API_VERSIONS = {
 
 def make_client(instance):
     """Returns a network proxy"""
+    # Defer the SDK import until a network command actually needs it
+    from openstack import connection
+    from openstack import profile
+    from openstack import session
+
     prof = profile.Profile()
     prof.set_region(API_NAME, instance.region_name)
     prof.set_version(API_NAME, instance._api_version[API_NAME])
     prof.set_interface(API_NAME, instance.interface)
-    conn = connection.Connection(authenticator=instance.session.auth,
-                                 verify=instance.session.verify,
-                                 cert=instance.session.cert,
-                                 profile=prof)
+    # The SDK needs its own Session class, have it send the requests
+    # through the connection pools of the other clients
+    sdk_session = session.Session(prof,
+                                  auth=instance.session.auth,
+                                  verify=instance.session.verify,
+                                  cert=instance.session.cert,
+                                  session=instance.session.session)
+    conn = connection.Connection(session=sdk_session, profile=prof)
     LOG.debug('Connection: %s', conn)
     LOG.debug('Network client initialized using OpenStack SDK: %s',
               conn.network)
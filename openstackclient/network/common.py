@@ -13,12 +13,14 @@
 
 import abc
 import logging
+import threading
 
 import openstack.exceptions
 from osc_lib.command import command
 from osc_lib import exceptions
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -85,35 +87,61 @@ class NetworkAndComputeDelete(NetworkAndComputeCommand):
     implementations for take_action() and may even have different
     arguments. This class supports bulk deletion, and error handling
     following the rules in doc/source/command-errors.rst.
+
+    The resource being deleted is available to take_action_network() and
+    take_action_compute() as self.r.  With --parallel several resources
+    are deleted at once, so self.r is kept per thread.
     """
 
+    def __init__(self, *args, **kwargs):
+        super(NetworkAndComputeDelete, self).__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    @property
+    def r(self):
+        return self._local.r
+
+    @r.setter
+    def r(self, value):
+        self._local.r = value
+
+    def get_parser(self, prog_name):
+        parser = super(NetworkAndComputeDelete, self).get_parser(prog_name)
+        return parallel.add_parallel_option(parser)
+
     def take_action(self, parsed_args):
-        ret = 0
         resources = getattr(parsed_args, self.resource, [])
 
-        for r in resources:
+        if self.app.client_manager.is_network_endpoint_enabled():
+            client = self.app.client_manager.network
+            action = self.take_action_network
+        else:
+            client = self.app.client_manager.compute
+            action = self.take_action_compute
+
+        def _delete(r):
             self.r = r
-            try:
-                if self.app.client_manager.is_network_endpoint_enabled():
-                    self.take_action_network(self.app.client_manager.network,
-                                             parsed_args)
-                else:
-                    self.take_action_compute(self.app.client_manager.compute,
-                                             parsed_args)
-            except Exception as e:
-                msg = _("Failed to delete %(resource)s with name or ID "
-                        "'%(name_or_id)s': %(e)s") % {
-                            "resource": self.resource,
-                            "name_or_id": r,
-                            "e": e,
-                }
-                LOG.error(msg)
-                ret += 1
-
-        if ret:
+            action(client, parsed_args)
+
+        results = parallel.execute(
+            _delete,
+            resources,
+            getattr(parsed_args, 'parallel', 1),
+        )
+        failed = parallel.failures(results)
+        for r, e in failed:
+            msg = _("Failed to delete %(resource)s with name or ID "
+                    "'%(name_or_id)s': %(e)s") % {
+                        "resource": self.resource,
+                        "name_or_id": r,
+                        "e": e,
+            }
+            LOG.error(msg)
+
+        if failed:
             total = len(resources)
             msg = _("%(num)s of %(total)s %(resource)ss failed to delete.") % {
-                "num": ret,
+                "num": len(failed),
                 "total": total,
                 "resource": self.resource,
             }
@@ -12,30 +12,60 @@
 #
 
 
+def _format_compute_port_range(sg_rule):
+    from_port = sg_rule['from_port']
+    to_port = sg_rule['to_port']
+    ip_protocol = sg_rule['ip_protocol']
+    if ip_protocol is not None and ip_protocol.lower() == 'icmp':
+        return ''
+    if isinstance(from_port, int) and isinstance(to_port, int):
+        return "%u:%u" % (from_port, to_port)
+    elif from_port is None and to_port is None:
+        return ""
+    return "%s:%s" % (from_port, to_port)
+
+
 # Transform compute security group rule for display.
 def transform_compute_security_group_rule(sg_rule):
     info = {}
     info.update(sg_rule)
-    from_port = info.pop('from_port')
-    to_port = info.pop('to_port')
-    if isinstance(from_port, int) and isinstance(to_port, int):
-        port_range = {'port_range': "%u:%u" % (from_port, to_port)}
-    elif from_port is None and to_port is None:
-        port_range = {'port_range': ""}
-    else:
-        port_range = {'port_range': "%s:%s" % (from_port, to_port)}
-    info.update(port_range)
+    info['port_range'] = _format_compute_port_range(info)
+    info.pop('from_port')
+    info.pop('to_port')
     if 'cidr' in info['ip_range']:
         info['ip_range'] = info['ip_range']['cidr']
     else:
         info['ip_range'] = ''
     if info['ip_protocol'] is None:
         info['ip_protocol'] = ''
-    elif info['ip_protocol'].lower() == 'icmp':
-        info['port_range'] = ''
     group = info.pop('group')
     if 'name' in group:
         info['remote_security_group'] = group['name']
     else:
         info['remote_security_group'] = ''
     return info
+
+
+def compute_security_group_rule_row(sg_rule, parent_group=False):
+    """Return the list row of a compute security group rule
+
+    The row holds the fields of transform_compute_security_group_rule()
+    listed by ``security group rule list``, read straight from the rule
+    dict without copying it.
+
+    :param dict sg_rule: a rule as embedded in a compute security group
+    :param bool parent_group: add the ID of the rule's security group
+    :returns: a tuple of the ID, IP protocol, IP range, port range and
+        remote security group, and the parent group ID if requested
+    """
+
+    row = (
+        sg_rule['id'],
+        sg_rule['ip_protocol'] or '',
+        sg_rule['ip_range'].get('cidr', ''),
+        _format_compute_port_range(sg_rule),
+        sg_rule['group'].get('name', ''),
+    )
+    if parent_group:
+        row += (sg_rule.get('parent_group_id', ''),)
+    return row
@@ -23,6 +23,7 @@ from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -358,21 +359,23 @@ class DeletePort(command.Command):
             nargs="+",
             help=_("Port(s) to delete (name or ID)")
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.network
-        result = 0
 
-        for port in parsed_args.port:
-            try:
-                obj = client.find_port(port, ignore_missing=False)
-                client.delete_port(obj)
-            except Exception as e:
-                result += 1
-                LOG.error(_("Failed to delete port with "
-                            "name or ID '%(port)s': %(e)s"),
-                          {'port': port, 'e': e})
+        def _delete(port):
+            obj = client.find_port(port, ignore_missing=False)
+            client.delete_port(obj)
+
+        result = 0
+        for port, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.port, parsed_args.parallel)):
+            result += 1
+            LOG.error(_("Failed to delete port with "
+                        "name or ID '%(port)s': %(e)s"),
+                      {'port': port, 'e': e})
 
         if result > 0:
             total = len(parsed_args.port)
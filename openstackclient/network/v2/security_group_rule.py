@@ -14,13 +14,9 @@
 """Security Group Rule action implementations"""
 
 import argparse
+import itertools
 import logging
 
-try:
-    from novaclient.v2 import security_group_rules as compute_secgroup_rules
-except ImportError:
-    from novaclient.v1_1 import security_group_rules as compute_secgroup_rules
-
 from osc_lib.cli import parseractions
 from osc_lib import exceptions
 from osc_lib import utils
@@ -41,6 +37,16 @@ def _format_security_group_rule_show(obj):
     return zip(*sorted(six.iteritems(data)))
 
 
+def _network_rule_row(rule, columns):
+    # Display a port range instead of just the port range minimum,
+    # keeping the output compatible with compute
+    return tuple(
+        _format_network_port_range(rule) if column == 'port_range_min'
+        else getattr(rule, column, '')
+        for column in columns
+    )
+
+
 def _format_network_port_range(rule):
     # Display port range or ICMP type and code. For example:
     # - ICMP type: 'type=3'
@@ -535,54 +541,33 @@ class ListSecurityGroupRule(common.NetworkAndComputeLister):
         if parsed_args.protocol is not None:
             query['protocol'] = parsed_args.protocol
 
-        rules = list(client.security_group_rules(**query))
-
-        # Reformat the rules to display a port range instead
-        # of just the port range minimum. This maintains
-        # output compatibility with compute.
-        for rule in rules:
-            rule.port_range_min = _format_network_port_range(rule)
-
+        # The rules are formatted as they are read, none is kept
+        rules = client.security_group_rules(**query)
         return (column_headers,
-                (utils.get_item_properties(
-                    s, columns,
-                ) for s in rules))
+                (_network_rule_row(rule, columns) for rule in rules))
 
     def take_action_compute(self, client, parsed_args):
         column_headers = self._get_column_headers(parsed_args)
-        columns = (
-            "ID",
-            "IP Protocol",
-            "IP Range",
-            "Port Range",
-            "Remote Security Group",
-        )
 
-        rules_to_list = []
         if parsed_args.group is not None:
             group = utils.find_resource(
                 client.security_groups,
                 parsed_args.group,
             )
-            rules_to_list = group.rules
+            rules = group.rules
         else:
-            columns = columns + ('parent_group_id',)
             search = {'all_tenants': parsed_args.all_projects}
-            for group in client.security_groups.list(search_opts=search):
-                rules_to_list.extend(group.rules)
-
-        # NOTE(rtheis): Turn the raw rules into resources.
-        rules = []
-        for rule in rules_to_list:
-            rules.append(compute_secgroup_rules.SecurityGroupRule(
-                client.security_group_rules,
-                network_utils.transform_compute_security_group_rule(rule),
-            ))
+            rules = itertools.chain.from_iterable(
+                group.rules
+                for group in client.security_groups.list(search_opts=search)
+            )
 
+        # The raw rules are formatted as they are read
+        parent_group = parsed_args.group is None
         return (column_headers,
-                (utils.get_item_properties(
-                    s, columns,
-                ) for s in rules))
+                (network_utils.compute_security_group_rule_row(
+                    rule, parent_group,
+                ) for rule in rules))
 
 
 class ShowSecurityGroupRule(common.NetworkAndComputeShowOne):
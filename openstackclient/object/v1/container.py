@@ -19,9 +19,12 @@ import logging
 
 from osc_lib.cli import parseractions
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.api import object_store_v1
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -73,6 +76,11 @@ class DeleteContainer(command.Command):
             default=False,
             help=_('Recursively delete objects and container'),
         )
+        parallel.add_parallel_option(
+            parser,
+            help=_('Number of concurrent listing and delete requests with '
+                   '--recursive (default: 1)'),
+        )
         parser.add_argument(
             'containers',
             metavar='<container>',
@@ -83,18 +91,43 @@ class DeleteContainer(command.Command):
 
     def take_action(self, parsed_args):
 
+        object_store = self.app.client_manager.object_store
+        result = 0
         for container in parsed_args.containers:
-            if parsed_args.recursive:
-                objs = self.app.client_manager.object_store.object_list(
-                    container=container)
-                for obj in objs:
-                    self.app.client_manager.object_store.object_delete(
+            try:
+                if parsed_args.recursive:
+                    objs = object_store.object_iter_parallel(
                         container=container,
-                        object=obj['name'],
+                        workers=parsed_args.parallel,
                     )
-            self.app.client_manager.object_store.container_delete(
-                container=container,
-            )
+                    failed = object_store.object_delete_many(
+                        container=container,
+                        objects=(obj['name'] for obj in objs),
+                        workers=parsed_args.parallel,
+                    )
+                    if failed:
+                        result += 1
+                        for name, e in failed:
+                            LOG.error(_("Failed to delete object "
+                                        "'%(object)s' in container "
+                                        "'%(container)s': %(e)s"),
+                                      {'object': name,
+                                       'container': container, 'e': e})
+                        continue
+                object_store.container_delete(
+                    container=container,
+                )
+            except Exception as e:
+                result += 1
+                LOG.error(_("Failed to delete container with name "
+                            "'%(container)s': %(e)s"),
+                          {'container': container, 'e': e})
+
+        if result > 0:
+            total = len(parsed_args.containers)
+            msg = (_("%(result)s of %(total)s containers failed "
+                     "to delete.") % {'result': result, 'total': total})
+            raise exceptions.CommandError(msg)
 
 
 class ListContainer(command.Lister):
@@ -153,12 +186,17 @@ class ListContainer(command.Lister):
             kwargs['end_marker'] = parsed_args.end_marker
         if parsed_args.limit:
             kwargs['limit'] = parsed_args.limit
-        if parsed_args.all:
-            kwargs['full_listing'] = True
 
-        data = self.app.client_manager.object_store.container_list(
-            **kwargs
-        )
+        object_store = self.app.client_manager.object_store
+        if parsed_args.all:
+            # Stream the listing one page at a time
+            data = object_store.container_iter(
+                **kwargs
+            )
+        else:
+            data = object_store.container_list(
+                **kwargs
+            )
 
         return (columns,
                 (utils.get_dict_properties(
@@ -177,12 +215,32 @@ class SaveContainer(command.Command):
             metavar='<container>',
             help=_('Container to save'),
         )
+        parallel.add_parallel_option(
+            parser,
+            help=_('Number of concurrent listing and download requests '
+                   '(default: 1)'),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            metavar='<bytes>',
+            type=parallel.positive_int,
+            default=object_store_v1.DOWNLOAD_CHUNK_SIZE,
+            help=_('Bytes read and written at a time (default: 1048576)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
-        self.app.client_manager.object_store.container_save(
+        failed = self.app.client_manager.object_store.container_save(
             container=parsed_args.container,
+            workers=parsed_args.parallel,
+            chunk_size=parsed_args.chunk_size,
         )
+        for name, e in failed:
+            LOG.error(_("Failed to save object '%(object)s': %(e)s"),
+                      {'object': name, 'e': e})
+        if failed:
+            msg = _("%s objects failed to save.") % len(failed)
+            raise exceptions.CommandError(msg)
 
 
 class SetContainer(command.Command):
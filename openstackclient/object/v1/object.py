@@ -16,6 +16,9 @@
 """Object v1 action implementations"""
 
 import logging
+import os
+import sys
+import time
 
 from osc_lib.cli import parseractions
 from osc_lib.command import command
@@ -23,6 +26,8 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.api import object_store_v1
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -51,33 +56,111 @@ class CreateObject(command.Lister):
             help=_('Upload a file and rename it. '
                    'Can only be used when uploading a single object')
         )
+        parser.add_argument(
+            '--segment-size',
+            metavar='<bytes>',
+            type=parallel.positive_int,
+            help=_('Upload files larger than <bytes> as large objects made '
+                   'of segments of <bytes> (default: only files too large '
+                   'for a single object, in 1 GiB segments)'),
+        )
+        parser.add_argument(
+            '--recursive', '-r',
+            action='store_true',
+            default=False,
+            help=_('Upload the files in directories and their '
+                   'subdirectories, skipping files that have not changed '
+                   'since their object was uploaded'),
+        )
+        parallel.add_parallel_option(
+            parser,
+            help=_('Number of files, or segments of a single file, uploaded '
+                   'at the same time (default: 1)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
+        files = parsed_args.objects
+        if parsed_args.recursive:
+            files = list(_walk(files))
         if parsed_args.name:
-            if len(parsed_args.objects) > 1:
+            if len(files) > 1:
                 msg = _('Attempting to upload multiple objects and '
                         'using --name is not permitted')
                 raise exceptions.CommandError(msg)
-        results = []
-        for obj in parsed_args.objects:
+        for obj in files:
             if len(obj) > 1024:
                 LOG.warning(
                     _('Object name is %s characters long, default limit'
                       ' is 1024'), len(obj))
-            data = self.app.client_manager.object_store.object_create(
+
+        object_store = self.app.client_manager.object_store
+        start = time.time()
+        if parsed_args.name:
+            data = object_store.object_create(
                 container=parsed_args.container,
-                object=obj,
+                object=files[0],
                 name=parsed_args.name,
+                segment_size=parsed_args.segment_size,
+                workers=parsed_args.parallel,
             )
-            results.append(data)
+            results = [(files[0], data, None)]
+        else:
+            results = object_store.object_create_many(
+                container=parsed_args.container,
+                objects=files,
+                segment_size=parsed_args.segment_size,
+                workers=parsed_args.parallel,
+                skip_unchanged=parsed_args.recursive,
+            )
+        elapsed = time.time() - start
+
+        failed = parallel.failures(results)
+        for obj, e in failed:
+            LOG.error(_("Failed to upload file '%(file)s': %(e)s"),
+                      {'file': obj, 'e': e})
+        uploaded = [(item, result) for item, result, _e in results if result]
+        if parsed_args.recursive:
+            size = sum(os.path.getsize(item) for item, _result in uploaded)
+            sys.stderr.write(
+                _("Uploaded %(count)s files (%(size)s bytes) in %(time).1f "
+                  "seconds, %(rate).2f MB/s, %(skipped)s unchanged files "
+                  "skipped\n") % {
+                    'count': len(uploaded),
+                    'size': size,
+                    'time': elapsed,
+                    'rate': size / (elapsed or 1) / (1024 * 1024),
+                    'skipped': len(results) - len(uploaded) - len(failed),
+                })
+        if failed:
+            msg = (_("%(result)s of %(total)s files failed to upload.") %
+                   {'result': len(failed), 'total': len(results)})
+            raise exceptions.CommandError(msg)
 
         columns = ("object", "container", "etag")
         return (columns,
                 (utils.get_dict_properties(
                     s, columns,
                     formatters={},
-                ) for s in results))
+                ) for _item, s in uploaded))
+
+
+def _walk(paths):
+    """Yield the files in paths, going down into directories
+
+    The files of each directory are yielded in the order of their object
+    names, the order of a container listing.
+    """
+
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        files = []
+        for root, _dirs, names in os.walk(path):
+            files.extend(os.path.join(root, name) for name in names)
+        for name in sorted(files):
+            yield name
 
 
 class DeleteObject(command.Command):
@@ -155,6 +238,12 @@ class ListObject(command.Lister):
             default=False,
             help=_('List all objects in container (default is 10000)'),
         )
+        parallel.add_parallel_option(
+            parser,
+            help=_('Number of concurrent listing requests with --all, the '
+                   'container is split along its pseudo-directories '
+                   '(default: 1)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -181,13 +270,20 @@ class ListObject(command.Lister):
             kwargs['end_marker'] = parsed_args.end_marker
         if parsed_args.limit:
             kwargs['limit'] = parsed_args.limit
-        if parsed_args.all:
-            kwargs['full_listing'] = True
 
-        data = self.app.client_manager.object_store.object_list(
-            container=parsed_args.container,
-            **kwargs
-        )
+        object_store = self.app.client_manager.object_store
+        if parsed_args.all:
+            # Stream the listing one page at a time
+            data = object_store.object_iter_parallel(
+                container=parsed_args.container,
+                workers=parsed_args.parallel,
+                **kwargs
+            )
+        else:
+            data = object_store.object_list(
+                container=parsed_args.container,
+                **kwargs
+            )
 
         return (columns,
                 (utils.get_dict_properties(
@@ -216,6 +312,13 @@ class SaveObject(command.Command):
             metavar="<object>",
             help=_("Object to save"),
         )
+        parser.add_argument(
+            '--chunk-size',
+            metavar='<bytes>',
+            type=parallel.positive_int,
+            default=object_store_v1.DOWNLOAD_CHUNK_SIZE,
+            help=_('Bytes read and written at a time (default: 1048576)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -223,6 +326,7 @@ class SaveObject(command.Command):
             container=parsed_args.container,
             object=parsed_args.object,
             file=parsed_args.file,
+            chunk_size=parsed_args.chunk_size,
         )
 
 
@@ -21,6 +21,7 @@ import sys
 
 from osc_lib.api import auth
 from osc_lib import shell
+from osc_lib import utils
 from oslo_utils import importutils
 import six
 
@@ -28,6 +29,9 @@ import openstackclient
 from openstackclient.common import client_config as cloud_config
 from openstackclient.common import clientmanager
 from openstackclient.common import commandmanager
+from openstackclient.common import profiling
+from openstackclient.common import transport
+from openstackclient.i18n import _
 
 osprofiler_profiler = importutils.try_import("osprofiler.profiler")
 
@@ -54,6 +58,54 @@ class OpenStackShell(shell.OpenStackShell):
         parser = super(OpenStackShell, self).build_option_parser(
             description,
             version)
+        parser.add_argument(
+            '--os-auth-cache',
+            dest='auth_cache',
+            action='store_true',
+            default=utils.env('OS_AUTH_CACHE', default=None),
+            help=_('Cache the authentication token and service catalog '
+                   'between commands (Env: OS_AUTH_CACHE)'),
+        )
+        parser.add_argument(
+            '--os-http-pool-size',
+            metavar='<count>',
+            dest='http_pool_size',
+            default=utils.env('OS_HTTP_POOL_SIZE', default=None),
+            help=_('Connections kept open to each API endpoint, shared by '
+                   'all the services (default: %s) (Env: OS_HTTP_POOL_SIZE)')
+            % transport.DEFAULT_POOL_SIZE,
+        )
+        parser.add_argument(
+            '--os-http-max-retries',
+            metavar='<count>',
+            dest='http_max_retries',
+            default=utils.env('OS_HTTP_MAX_RETRIES', default=None),
+            help=_('Retries of requests whose connection failed '
+                   '(default: %s) (Env: OS_HTTP_MAX_RETRIES)')
+            % transport.DEFAULT_MAX_RETRIES,
+        )
+        parser.add_argument(
+            '--os-http-no-keepalive',
+            dest='http_no_keepalive',
+            action='store_true',
+            default=utils.env('OS_HTTP_NO_KEEPALIVE', default=None),
+            help=_('Disable TCP keep-alive on API connections '
+                   '(Env: OS_HTTP_NO_KEEPALIVE)'),
+        )
+        parser.add_argument(
+            '--timing-file',
+            metavar='<file>',
+            help=_('Write the timing of every API call to <file>'),
+        )
+        parser.add_argument(
+            '--timing-format',
+            metavar='<format>',
+            choices=sorted(profiling.FORMATS),
+            default='json',
+            help=_('Format of --timing-file: "json" writes one JSON object '
+                   'per API call, "trace" writes Chrome trace events '
+                   '(default: json)'),
+        )
         parser = clientmanager.build_plugin_option_parser(parser)
         parser = auth.build_auth_plugins_option_parser(parser)
         return parser
@@ -156,6 +208,9 @@ class OpenStackShell(shell.OpenStackShell):
         if not self.options.debug:
             self.options.debug = None
 
+        # Validated cloud configs keyed by cmd.auth_required
+        self._validated_clouds = {}
+
         # NOTE(dtroyer): Need to do this with validate=False to defer the
         #                auth plugin handling to ClientManager.setup_auth()
         self.cloud = self.cloud_config.get_one_cloud(
@@ -185,17 +240,73 @@ class OpenStackShell(shell.OpenStackShell):
             kwargs['auth']['token'] = 'x'
             kwargs['auth']['url'] = 'x'
 
-        # Validate auth options
-        self.cloud = self.cloud_config.get_one_cloud(
-            cloud=self.options.cloud,
-            argparse=self.options,
-            validate=True,
-            **kwargs
-        )
+        # Validate auth options.  The result only depends on whether the
+        # command requires auth, so it is re-used when several commands
+        # run in one process with batch or interactive mode.
+        cloud = self._validated_clouds.get(cmd.auth_required)
+        if cloud is None:
+            cloud = self.cloud_config.get_one_cloud(
+                cloud=self.options.cloud,
+                argparse=self.options,
+                validate=True,
+                **kwargs
+            )
+            self._validated_clouds[cmd.auth_required] = cloud
+        self.cloud = cloud
         # Push the updated args into ClientManager
         self.client_manager._cli_options = self.cloud
 
-        return super(OpenStackShell, self).prepare_to_run_command(cmd)
+        # Requests made from here on are recorded under their phase
+        profiling.record_lookups()
+        profiling.set_phase('auth')
+        ret = super(OpenStackShell, self).prepare_to_run_command(cmd)
+        profiling.set_phase('action')
+        if hasattr(cmd, 'produce_output'):
+            cmd.produce_output = profiling.in_phase('format')(
+                cmd.produce_output)
+        return ret
+
+    def clean_up(self, cmd, result, err):
+        # Pick up a token that was renewed while the command was running
+        if self.client_manager._auth_setup_completed:
+            self.client_manager.save_auth_cache()
+
+        self.timing_records = self._get_timing_records()
+        ret = super(OpenStackShell, self).clean_up(cmd, result, err)
+
+        if self.options.timing:
+            tcmd = profiling.TimingSummary(self, self.options)
+            tparser = tcmd.get_parser('TimingSummary')
+            sys.stdout.write('\n')
+            tcmd.run(tparser.parse_args(['-f', self._timing_format(cmd)]))
+        if self.options.timing_file:
+            write = profiling.FORMATS[self.options.timing_format]
+            with open(self.options.timing_file, 'w') as f:
+                write(self.timing_records, f)
+        return ret
+
+    def _get_timing_records(self):
+        """Return the request records of the command, with their service"""
+
+        if not self.client_manager._auth_setup_completed:
+            return []
+        session = self.client_manager.session
+        records = getattr(session, 'get_records', list)()
+        if records and self.client_manager._auth_ref is not None:
+            profiling.fill_services(
+                records,
+                profiling.get_service_map(self.client_manager._auth_ref),
+            )
+        return records
+
+    @staticmethod
+    def _timing_format(cmd):
+        # Match the per-call table osc-lib prints: csv unless the command
+        # used the table formatter
+        if hasattr(cmd, 'formatter') \
+                and cmd.formatter != cmd._formatter_plugins['table'].obj:
+            return 'csv'
+        return 'table'
 
 
 def main(argv=None):
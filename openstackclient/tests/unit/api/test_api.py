@@ -13,12 +13,18 @@
 
 """Base API Library Tests"""
 
+import time
+
+import mock
 from osc_lib import exceptions
 
 from openstackclient.api import api
 from openstackclient.tests.unit.api import fakes as api_fakes
 
 
+FAKE_UUID = '5e1b5ba2-3ee5-4c2e-a3a6-7e2f4e3c8d51'
+
+
 class TestKeystoneSession(api_fakes.TestSession):
 
     def setUp(self):
@@ -189,6 +195,133 @@ class TestBaseAPI(api_fakes.TestSession):
         ret = self.api.find_attr('wsx', '1', resource='qaz')
         self.assertEqual(api_fakes.RESP_ITEM_1, ret)
 
+    def test_find_attr_uuid(self):
+        item = dict(api_fakes.RESP_ITEM_1, id=FAKE_UUID)
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/' + FAKE_UUID,
+            json={'qaz': item},
+            status_code=200,
+        )
+        ret = self.api.find_attr('qaz', FAKE_UUID)
+        self.assertEqual(item, ret)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+        # A UUID name is still found by name, no ID search follows
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/wsx/' + FAKE_UUID,
+            status_code=404,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/wsx?name=' + FAKE_UUID,
+            json={'wsx': []},
+            status_code=200,
+        )
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.find_attr,
+            'wsx',
+            FAKE_UUID,
+        )
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    def test_find_attr_cached(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz?name=alpha',
+            json={'qaz': [api_fakes.RESP_ITEM_1]},
+            status_code=200,
+        )
+        ret = self.api.find_attr('qaz', 'alpha')
+        ret['name'] = 'changed'
+        ret = self.api.find_attr('qaz', 'alpha')
+        self.assertEqual(api_fakes.RESP_ITEM_1, ret)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+        with mock.patch('time.time', return_value=time.time() + 3600):
+            self.api.find_attr('qaz', 'alpha')
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_find_attr_cache_cleared_on_change(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz?name=alpha',
+            json={'qaz': [api_fakes.RESP_ITEM_1]},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            self.BASE_URL + '/qaz/1',
+            status_code=204,
+        )
+        self.api.find_attr('qaz', 'alpha')
+        self.api.delete('qaz/1')
+        self.api.find_attr('qaz', 'alpha')
+        self.assertEqual(3, self.requests_mock.call_count)
+        self.assertEqual('GET', self.requests_mock.last_request.method)
+
+    def test_find_uuid(self):
+        item = dict(api_fakes.RESP_ITEM_1, id=FAKE_UUID)
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/' + FAKE_UUID,
+            json=item,
+            status_code=200,
+        )
+        ret = self.api.find('qaz', FAKE_UUID, attr='name')
+        self.assertEqual(item, ret)
+        ret = self.api.find('qaz', FAKE_UUID, attr='name')
+        self.assertEqual(item, ret)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_find_by_attr(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/detail?name=alpha',
+            json={'qaz': [api_fakes.RESP_ITEM_1]},
+            status_code=200,
+        )
+        ret = self.api.find('qaz', 'alpha', attr='name')
+        self.assertEqual(api_fakes.RESP_ITEM_1, ret)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_find_by_id(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/detail?name=1',
+            json={'qaz': []},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/1',
+            json=api_fakes.RESP_ITEM_1,
+            status_code=200,
+        )
+        ret = self.api.find('qaz', '1', attr='name')
+        self.assertEqual(api_fakes.RESP_ITEM_1, ret)
+
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/detail?name=0',
+            json={'qaz': []},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz/0',
+            status_code=404,
+        )
+        self.assertRaises(
+            exceptions.NotFound,
+            self.api.find,
+            'qaz',
+            '0',
+            attr='name',
+        )
+
     def test_find_bulk_none(self):
         self.requests_mock.register_uri(
             'GET',
@@ -244,6 +377,46 @@ class TestBaseAPI(api_fakes.TestSession):
         ret = self.api.find_bulk('qaz', id='1')
         self.assertEqual([api_fakes.LIST_RESP[0]], ret)
 
+    def test_find_bulk_server_filters(self):
+        self.api._server_filters = {'qaz': ('status',)}
+        self.api._bulk_page_size = 2
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz?status=UP&limit=2',
+            json={'qaz': [api_fakes.RESP_ITEM_1, api_fakes.RESP_ITEM_3],
+                  'next': '/qaz?marker=3'},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz?status=UP&limit=2&marker=3',
+            json={'qaz': []},
+            status_code=200,
+        )
+        ret = self.api.find_bulk('qaz', status='UP', name='delta')
+        self.assertEqual([api_fakes.RESP_ITEM_3], ret)
+        self.assertEqual(2, self.requests_mock.call_count)
+        self.assertEqual(
+            {'status': ['up'], 'limit': ['2'], 'marker': ['3']},
+            self.requests_mock.last_request.qs,
+        )
+
+    def test_find_one_stops_early(self):
+        self.api._bulk_page_size = 2
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz?limit=2',
+            json={'qaz': [api_fakes.RESP_ITEM_1, api_fakes.RESP_ITEM_3]},
+            status_code=200,
+        )
+        self.assertRaises(
+            RuntimeError,
+            self.api.find_one,
+            'qaz',
+            status='UP',
+        )
+        self.assertEqual(1, self.requests_mock.call_count)
+
     # list tests
 
     def test_list_no_body(self):
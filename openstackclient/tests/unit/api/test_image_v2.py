@@ -13,6 +13,11 @@
 
 """Image v2 API Library Tests"""
 
+import hashlib
+import json
+import os
+
+import fixtures
 from keystoneauth1 import session
 from requests_mock.contrib import fixture
 
@@ -96,3 +101,188 @@ class TestImage(TestImageAPIv2):
         )
         ret = self.api.image_list(public=True)
         self.assertEqual([self.NOPUB_PROT, self.NOPUB_NOPROT], ret)
+
+
+class TestImageFind(TestImageAPIv2):
+
+    def test_find_bulk_name(self):
+        image = {'id': '1', 'name': 'pub1', 'visibility': 'public'}
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/images?name=pub1&limit=1000',
+            json={
+                'first': '/v2/images',
+                'images': [image],
+                'schema': '/v2/schemas/images',
+            },
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/images?name=pub1&limit=1000&marker=1',
+            json={'images': []},
+            status_code=200,
+        )
+        self.assertEqual([image], self.api.find_bulk('/images', name='pub1'))
+        self.assertEqual(
+            {'name': ['pub1'], 'limit': ['1000'], 'marker': ['1']},
+            self.requests_mock.last_request.qs,
+        )
+
+    def test_find_bulk_server_filter_not_returned(self):
+        # Images do not carry the member_status they are filtered on
+        image = {'id': '1', 'name': 'shared1', 'visibility': 'shared'}
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/images?member_status=accepted&limit=1000',
+            json={'images': [image]},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/images?member_status=accepted&limit=1000'
+            '&marker=1',
+            json={'images': []},
+            status_code=200,
+        )
+        self.assertEqual(
+            [image],
+            self.api.find_bulk('images', member_status='accepted'),
+        )
+        self.assertEqual(
+            image,
+            self.api.find_one('images', member_status='accepted'),
+        )
+
+
+class TestImageImport(TestImageAPIv2):
+
+    def test_image_import_methods(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/info/import',
+            json={'import-methods': {'value': ['glance-direct']}},
+            status_code=200,
+        )
+        self.assertEqual(['glance-direct'], self.api.image_import_methods())
+
+    def test_image_import_methods_unavailable(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/info/import',
+            status_code=404,
+        )
+        self.assertEqual([], self.api.image_import_methods())
+
+    def test_image_stage_and_import(self):
+        self.requests_mock.register_uri(
+            'PUT',
+            FAKE_URL + '/v2/images/1/stage',
+            status_code=204,
+        )
+        self.requests_mock.register_uri(
+            'POST',
+            FAKE_URL + '/v2/images/1/import',
+            status_code=202,
+        )
+        self.api.image_stage('1', iter([b'image ', b'data']))
+        self.api.image_import('1', 'web-download', uri='http://a/b.img')
+
+        stage, import_ = self.requests_mock.request_history
+        self.assertEqual('application/octet-stream',
+                         stage.headers['Content-Type'])
+        self.assertEqual(
+            {'method': {'name': 'web-download', 'uri': 'http://a/b.img'}},
+            import_.json(),
+        )
+
+
+class TestImageDownload(TestImageAPIv2):
+
+    data = b''.join(b'%03d' % i for i in range(100))
+
+    def setUp(self):
+        super(TestImageDownload, self).setUp()
+        self.file = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'image')
+
+    def _ranges(self, request, context):
+        start, end = request.headers['Range'][len('bytes='):].split('-')
+        context.status_code = 206
+        return self.data[int(start):int(end) + 1]
+
+    def _register(self, **kwargs):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/v2/images/1/file',
+            **kwargs
+        )
+
+    def test_image_download(self):
+        self._register(content=self._ranges)
+
+        md5 = self.api.image_download(
+            '1', self.file, len(self.data), workers=4, range_size=64)
+
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), md5.hexdigest())
+        with open(self.file, 'rb') as f:
+            self.assertEqual(self.data, f.read())
+        self.assertFalse(os.path.exists(self.file + '.progress'))
+        self.assertEqual(
+            sorted(['bytes=0-63', 'bytes=64-127', 'bytes=128-191',
+                    'bytes=192-255', 'bytes=256-299']),
+            sorted(r.headers['Range']
+                   for r in self.requests_mock.request_history),
+        )
+
+    def test_image_download_resume(self):
+        with open(self.file, 'wb') as f:
+            f.write(self.data[:128])
+        with open(self.file + '.progress', 'w') as f:
+            json.dump({
+                'image': '1',
+                'checksum': 'abc',
+                'size': len(self.data),
+                'range_size': 64,
+                'done': 128,
+            }, f)
+        self._register(content=self._ranges)
+
+        md5 = self.api.image_download(
+            '1', self.file, len(self.data), checksum='abc', range_size=64)
+
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), md5.hexdigest())
+        with open(self.file, 'rb') as f:
+            self.assertEqual(self.data, f.read())
+        self.assertEqual(
+            ['bytes=128-191', 'bytes=192-255', 'bytes=256-299'],
+            [r.headers['Range'] for r in self.requests_mock.request_history],
+        )
+
+    def test_image_download_other_image_restarts(self):
+        with open(self.file, 'wb') as f:
+            f.write(b'x' * 128)
+        with open(self.file + '.progress', 'w') as f:
+            json.dump({
+                'image': '1',
+                'checksum': 'old',
+                'size': len(self.data),
+                'range_size': 64,
+                'done': 128,
+            }, f)
+        self._register(content=self._ranges)
+
+        md5 = self.api.image_download(
+            '1', self.file, len(self.data), checksum='new', range_size=64)
+
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), md5.hexdigest())
+        self.assertEqual('bytes=0-63', self.requests_mock.request_history[0]
+                         .headers['Range'])
+
+    def test_image_download_ranges_not_supported(self):
+        self._register(content=self.data, status_code=200)
+
+        self.assertIsNone(self.api.image_download(
+            '1', self.file, len(self.data), workers=2, range_size=64))
+        self.assertFalse(os.path.exists(self.file))
+        self.assertFalse(os.path.exists(self.file + '.progress'))
@@ -13,6 +13,12 @@
 
 """Object Store v1 API Library Tests"""
 
+import hashlib
+import os
+import re
+import string
+
+import fixtures
 import mock
 
 from keystoneauth1 import session
@@ -25,6 +31,7 @@ from openstackclient.tests.unit import utils
 FAKE_ACCOUNT = 'q12we34r'
 FAKE_AUTH = '11223344556677889900'
 FAKE_URL = 'http://gopher.com/v1/' + FAKE_ACCOUNT
+FAKE_INFO_URL = 'http://gopher.com/info'
 
 FAKE_CONTAINER = 'rainbarrel'
 FAKE_OBJECT = 'spigot'
@@ -146,6 +153,50 @@ class TestContainer(TestObjectAPIv1):
 #         )
 #         self.assertEqual(resp, data)
 
+    def test_container_save(self):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp)
+        with open('current', 'wb') as f:
+            f.write(b'same')
+        objects = [
+            {'name': 'current', 'bytes': 4,
+             'hash': hashlib.md5(b'same').hexdigest()},
+            {'name': 'dir/'},
+            {'name': 'dir/new', 'bytes': 3,
+             'hash': hashlib.md5(b'new').hexdigest()},
+        ]
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/dir/new',
+            content=b'new',
+            headers={'etag': objects[2]['hash']},
+            status_code=200,
+        )
+        with mock.patch.object(self.api, 'object_iter_parallel',
+                               return_value=iter(objects)) as iter_mock:
+            ret = self.api.container_save(container='qaz', workers=2)
+        self.assertEqual([], ret)
+        iter_mock.assert_called_once_with(container='qaz', workers=2)
+        # Only the object missing locally is downloaded
+        self.assertEqual(1, self.requests_mock.call_count)
+        with open(os.path.join('dir', 'new'), 'rb') as f:
+            self.assertEqual(b'new', f.read())
+
+    def test_container_save_failed(self):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp)
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/gone',
+            status_code=404,
+        )
+        with mock.patch.object(self.api, 'object_iter_parallel',
+                               return_value=iter([{'name': 'gone'}])):
+            ret = self.api.container_save(container='qaz')
+        self.assertEqual(['gone'], [name for name, e in ret])
+
     def test_container_show(self):
         headers = {
             'X-Container-Meta-Owner': FAKE_ACCOUNT,
@@ -169,6 +220,31 @@ class TestContainer(TestObjectAPIv1):
         self.assertEqual(resp, ret)
 
 
+class TestCapabilities(TestObjectAPIv1):
+
+    def test_get_capabilities(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            json={'swift': {'version': '2.15.1'}},
+            status_code=200,
+        )
+        self.assertEqual(
+            {'swift': {'version': '2.15.1'}},
+            self.api.get_capabilities(),
+        )
+        self.api.get_capabilities()
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_get_capabilities_unavailable(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            status_code=404,
+        )
+        self.assertEqual({}, self.api.get_capabilities())
+
+
 class TestObject(TestObjectAPIv1):
 
     def setUp(self):
@@ -209,6 +285,147 @@ class TestObject(TestObjectAPIv1):
         self.base_object_create('111\n222\n333\n')
         self.base_object_create(bytes([0x31, 0x00, 0x0d, 0x0a, 0x7f, 0xff]))
 
+    def _segment_upload(self, data):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'big')
+        with open(path, 'wb') as f:
+            f.write(data)
+        prefix = 'big/%f/%d/4/' % (os.stat(path).st_mtime, len(data))
+        self.requests_mock.register_uri(
+            'PUT',
+            FAKE_URL + '/qaz_segments',
+            status_code=201,
+        )
+        # The first segment is left over from an interrupted upload
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz_segments',
+            [
+                {'json': [{'name': prefix + '00000000', 'bytes': 4,
+                           'hash': hashlib.md5(data[:4]).hexdigest()}]},
+                {'json': []},
+            ],
+        )
+        segments = {}
+
+        def _put_segment(request, context):
+            body = request.body.read()
+            segments[request.path_url.split('/', 4)[-1]] = body
+            context.headers['Etag'] = hashlib.md5(body).hexdigest()
+            context.status_code = 201
+            return ''
+
+        self.requests_mock.register_uri(
+            'PUT',
+            re.compile(re.escape(FAKE_URL + '/qaz_segments/')),
+            text=_put_segment,
+        )
+        self.requests_mock.register_uri(
+            'PUT',
+            FAKE_URL + '/qaz/big',
+            headers={'Etag': 'manifest'},
+            status_code=201,
+        )
+        return path, prefix, segments
+
+    @mock.patch.object(object_store, 'SEGMENT_SIZE', 4)
+    def test_object_create_slo(self):
+        data = b'0123456789'
+        path, prefix, segments = self._segment_upload(data)
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            json={'swift': {'max_file_size': 8}, 'slo': {}},
+            status_code=200,
+        )
+
+        ret = self.api.object_create(
+            container='qaz',
+            object=path,
+            name='big',
+            workers=2,
+        )
+
+        self.assertEqual('manifest', ret['etag'])
+        self.assertEqual(
+            [prefix + '00000001', prefix + '00000002'],
+            sorted(segments),
+        )
+        manifest = self.requests_mock.last_request
+        self.assertEqual({'multipart-manifest': ['put']}, manifest.qs)
+        self.assertEqual(
+            [{'path': '/qaz_segments/' + prefix + '%08d' % i,
+              'etag': hashlib.md5(data[i * 4:i * 4 + 4]).hexdigest(),
+              'size_bytes': len(data[i * 4:i * 4 + 4])}
+             for i in range(3)],
+            manifest.json(),
+        )
+
+    def test_object_create_dlo(self):
+        path, prefix, segments = self._segment_upload(b'0123456789')
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            status_code=404,
+        )
+
+        self.api.object_create(
+            container='qaz',
+            object=path,
+            name='big',
+            segment_size=4,
+        )
+
+        self.assertEqual(2, len(segments))
+        manifest = self.requests_mock.last_request
+        self.assertEqual(
+            'qaz_segments/' + prefix,
+            manifest.headers['X-Object-Manifest'],
+        )
+
+    def test_object_create_many_skip_unchanged(self):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        paths = [os.path.join(tmp, name) for name in ('new', 'old', 'same')]
+        for path in paths:
+            with open(path, 'wb') as f:
+                f.write(b'data')
+        listing = [
+            # Newer than the file
+            {'name': paths[1], 'bytes': 4, 'hash': 'x',
+             'last_modified': '2999-01-01T00:00:00.000000'},
+            # Older than the file but with the same content
+            {'name': paths[2], 'bytes': 4,
+             'hash': hashlib.md5(b'data').hexdigest(),
+             'last_modified': '2000-01-01T00:00:00.000000'},
+        ]
+        with mock.patch.object(self.api, 'object_iter_parallel',
+                               return_value=iter(listing)) as iter_mock, \
+                mock.patch.object(self.api, 'object_create',
+                                  return_value={'etag': 'e'}) as create_mock:
+            ret = self.api.object_create_many(
+                container='qaz',
+                objects=paths,
+                workers=2,
+                skip_unchanged=True,
+            )
+
+        self.assertEqual(
+            [(paths[0], {'etag': 'e'}, None), (paths[1], None, None),
+             (paths[2], None, None)],
+            ret,
+        )
+        iter_mock.assert_called_once_with(
+            container='qaz',
+            prefix=os.path.join(tmp, ''),
+            workers=2,
+        )
+        create_mock.assert_called_once_with(
+            container='qaz',
+            object=paths[0],
+            name=paths[0],
+            segment_size=None,
+            workers=1,
+        )
+
     def test_object_delete(self):
         self.requests_mock.register_uri(
             'DELETE',
@@ -221,6 +438,121 @@ class TestObject(TestObjectAPIv1):
         )
         self.assertIsNone(ret)
 
+    def test_object_delete_many_bulk(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            json={'bulk_delete': {'max_deletes_per_request': 2}},
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'POST',
+            FAKE_URL + '?bulk-delete=true',
+            [
+                {'json': {'Response Status': '200 OK', 'Errors': []}},
+                {'json': {
+                    'Response Status': '400 Bad Request',
+                    'Errors': [['/qaz/c%20d', '409 Conflict']],
+                }},
+            ],
+        )
+        ret = self.api.object_delete_many(
+            container='qaz',
+            objects=iter(['a', 'b', 'c d']),
+        )
+        self.assertEqual([('c d', '409 Conflict')], ret)
+        posts = [r for r in self.requests_mock.request_history
+                 if r.method == 'POST']
+        self.assertEqual(
+            [b'/qaz/a\n/qaz/b', b'/qaz/c%20d'],
+            [r.body for r in posts],
+        )
+        self.assertEqual('text/plain', posts[0].headers['Content-Type'])
+
+    @mock.patch('time.sleep')
+    def test_object_delete_many_retry(self, sleep_mock):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_INFO_URL,
+            status_code=404,
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/a',
+            [{'status_code': 409}, {'status_code': 204}],
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/b',
+            status_code=404,
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/c',
+            status_code=503,
+        )
+        ret = self.api.object_delete_many(
+            container='qaz',
+            objects=['a', 'b', 'c'],
+        )
+        self.assertEqual(['c'], [name for name, e in ret])
+        self.assertEqual(
+            [mock.call(1), mock.call(1), mock.call(2)],
+            sleep_mock.call_args_list,
+        )
+
+    def test_object_save_resume(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'wsx')
+        with open(path + '.part', 'wb') as f:
+            f.write(b'hello ')
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/wsx',
+            request_headers={'Range': 'bytes=6-'},
+            content=b'world',
+            headers={'etag': hashlib.md5(b'hello world').hexdigest()},
+            status_code=206,
+        )
+        self.api.object_save(
+            container='qaz',
+            object='wsx',
+            file=path,
+            resume=True,
+        )
+        with open(path, 'rb') as f:
+            self.assertEqual(b'hello world', f.read())
+        self.assertFalse(os.path.exists(path + '.part'))
+
+    def test_object_save_resume_stale(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'wsx')
+        with open(path + '.part', 'wb') as f:
+            f.write(b'HELLO ')
+        headers = {'etag': hashlib.md5(b'hello world').hexdigest()}
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/wsx',
+            content=b'hello world',
+            headers=headers,
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/wsx',
+            request_headers={'Range': 'bytes=6-'},
+            content=b'world',
+            headers=headers,
+            status_code=206,
+        )
+        self.api.object_save(
+            container='qaz',
+            object='wsx',
+            file=path,
+            resume=True,
+        )
+        with open(path, 'rb') as f:
+            self.assertEqual(b'hello world', f.read())
+        self.assertEqual(2, self.requests_mock.call_count)
+
     def test_object_list_no_options(self):
         self.requests_mock.register_uri(
             'GET',
@@ -272,6 +604,108 @@ class TestObject(TestObjectAPIv1):
         )
         self.assertEqual(LIST_CONTAINER_RESP, ret)
 
+    def test_object_iter(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz',
+            json=LIST_OBJECT_RESP,
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz?marker=wilma',
+            json=[],
+            status_code=200,
+        )
+        ret = self.api.object_iter(container='qaz')
+        self.assertEqual(0, self.requests_mock.call_count)
+        self.assertEqual(LIST_OBJECT_RESP, list(ret))
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_object_list_all_data(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz',
+            json=LIST_OBJECT_RESP,
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz?marker=wilma',
+            json=[],
+            status_code=200,
+        )
+        ret = self.api.object_list(container='qaz', all_data=True)
+        self.assertEqual(LIST_OBJECT_RESP, ret)
+
+    def test_object_iter_parallel(self):
+        wide = ['a/y/%s%03d' % (c, i)
+                for c in string.ascii_letters for i in range(20)]
+        names = sorted(['a/', 'a/x/1', 'b', 'n'] + wide)
+
+        def _object_list(container=None, prefix=None, delimiter=None,
+                         marker=None, end_marker=None, limit=None,
+                         **kwargs):
+            # A listing with the semantics of Swift
+            self.assertEqual('qaz', container)
+            self.assertLessEqual(end_marker, 'm')
+            rows = []
+            for name in names:
+                if (not name.startswith(prefix or '') or
+                        (marker and name <= marker) or
+                        (end_marker and name >= end_marker)):
+                    continue
+                index = name.find(delimiter or '/', len(prefix or ''))
+                if delimiter and index >= 0:
+                    if rows and rows[-1].get('subdir') == name[:index + 1]:
+                        continue
+                    rows.append({'subdir': name[:index + 1]})
+                else:
+                    rows.append({'name': name})
+                if limit and len(rows) >= limit:
+                    break
+            return rows
+
+        with mock.patch.object(self.api, 'object_list',
+                               side_effect=_object_list) as list_mock:
+            ret = self.api.object_iter_parallel(
+                container='qaz',
+                workers=3,
+                end_marker='m',
+            )
+            self.assertEqual(
+                [n for n in names if n < 'm'],
+                [o['name'] for o in ret],
+            )
+        # The wide level is split into ranges bounded by sampled objects
+        list_mock.assert_any_call(
+            container='qaz',
+            prefix='a/y/',
+            marker='a/y/U000',
+            end_marker='a/y/j000',
+            limit=None,
+            delimiter=None,
+        )
+
+    def test_object_iter_parallel_serial(self):
+        pages = [LIST_OBJECT_RESP, []]
+        with mock.patch.object(self.api, 'object_list',
+                               side_effect=pages) as list_mock:
+            ret = self.api.object_iter_parallel(
+                container='qaz',
+                workers=4,
+                delimiter='/',
+            )
+            self.assertEqual(LIST_OBJECT_RESP, list(ret))
+        list_mock.assert_called_with(
+            container='qaz',
+            marker='wilma',
+            limit=None,
+            end_marker=None,
+            prefix=None,
+            delimiter='/',
+        )
+
 #     def test_list_objects_full_listing(self):
 #         sess = self.app.client_manager.session
 #
@@ -0,0 +1,111 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import os
+
+import fixtures
+import mock
+from osc_lib import exceptions
+
+from openstackclient.common import batch
+from openstackclient.tests.unit import utils
+
+
+class TestRunBatch(utils.TestCommand):
+
+    columns = ('Line', 'Command', 'Exit Code', 'Time')
+
+    def setUp(self):
+        super(TestRunBatch, self).setUp()
+        self.app.run_subcommand = mock.Mock(return_value=0)
+        self.cmd = batch.RunBatch(self.app, None)
+
+    def _write_batch(self, content):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path,
+            'batch.txt',
+        )
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _run(self, content, *args):
+        arglist = [self._write_batch(content)] + list(args)
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        return self.cmd.take_action(parsed_args)
+
+    def test_batch(self):
+        columns, data = self._run(
+            '# comment\n'
+            'server list --long\n'
+            '\n'
+            'openstack server show "my server"\n'
+        )
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            [mock.call(['server', 'list', '--long']),
+             mock.call(['server', 'show', 'my server'])],
+            self.app.run_subcommand.call_args_list,
+        )
+        self.assertEqual([2, 4], [row[0] for row in data])
+        self.assertEqual([0, 0], [row[2] for row in data])
+        self.assertEqual(0, self.cmd.failed)
+
+    def test_batch_continue_after_failure(self):
+        self.app.run_subcommand.side_effect = [
+            1,
+            SystemExit(2),
+            Exception('boom'),
+            0,
+        ]
+        columns, data = self._run(
+            'server show a\n'
+            'server show --bad\n'
+            'server show c\n'
+            'server show d\n'
+        )
+
+        self.assertEqual([1, 2, 1, 0], [row[2] for row in data])
+        self.assertEqual(3, self.cmd.failed)
+
+    def test_batch_stop_on_error(self):
+        self.app.run_subcommand.return_value = 1
+        columns, data = self._run(
+            'server show a\n'
+            'server show b\n',
+            '--stop-on-error',
+        )
+
+        self.app.run_subcommand.assert_called_once_with(
+            ['server', 'show', 'a'])
+        self.assertEqual(1, len(data))
+
+    def test_batch_invalid_lines(self):
+        columns, data = self._run(
+            'server show "unterminated\n'
+            'batch other.txt\n'
+        )
+
+        self.assertNotCalled(self.app.run_subcommand)
+        self.assertEqual([2, 2], [row[2] for row in data])
+        self.assertEqual(2, self.cmd.failed)
+
+    def test_batch_missing_file(self):
+        parsed_args = self.check_parser(
+            self.cmd, ['/nonexistent/batch.txt'], [])
+        self.assertRaises(
+            exceptions.CommandError,
+            self.cmd.take_action,
+            parsed_args,
+        )
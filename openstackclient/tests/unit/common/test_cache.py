@@ -0,0 +1,169 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import json
+import os
+import stat
+
+import fixtures
+import mock
+
+from openstackclient.common import cache
+from openstackclient.tests.unit import utils
+
+
+class TestCacheDir(utils.TestCase):
+
+    def test_get_cache_dir_xdg(self):
+        self.useFixture(fixtures.EnvironmentVariable(
+            'XDG_CACHE_HOME',
+            '/var/cache/me',
+        ))
+        self.assertEqual(
+            '/var/cache/me/openstack/auth',
+            cache.get_cache_dir('auth'),
+        )
+
+    def test_get_cache_dir_default(self):
+        self.useFixture(fixtures.EnvironmentVariable('XDG_CACHE_HOME'))
+        self.assertEqual(
+            os.path.join(os.path.expanduser('~'), '.cache', 'openstack'),
+            cache.get_cache_dir(),
+        )
+
+    def test_safe_name(self):
+        self.assertEqual('my_cloud.1', cache.safe_name('my/cloud.1'))
+        self.assertEqual('', cache.safe_name(None))
+
+
+class TestFileCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestFileCache, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path,
+            'sub',
+            'entry',
+        )
+        self.cache = cache.FileCache(self.path)
+
+    def test_read_missing(self):
+        self.assertIsNone(self.cache.read())
+
+    def test_write_read(self):
+        with self.cache.lock(exclusive=True):
+            self.cache.write('data')
+        with self.cache.lock():
+            self.assertEqual('data', self.cache.read())
+
+        mode = os.stat(self.path).st_mode
+        self.assertEqual(0o600, stat.S_IMODE(mode))
+        mode = os.stat(os.path.dirname(self.path)).st_mode
+        self.assertEqual(0o700, stat.S_IMODE(mode) & 0o700)
+
+    def test_write_replaces(self):
+        self.cache.write('one')
+        self.cache.write('two')
+        self.assertEqual('two', self.cache.read())
+        self.assertEqual(
+            ['entry'],
+            [f for f in os.listdir(os.path.dirname(self.path))],
+        )
+
+    def test_delete(self):
+        self.cache.write('data')
+        self.cache.delete()
+        self.assertIsNone(self.cache.read())
+        # Deleting a missing file is not an error
+        self.cache.delete()
+
+
+class TestExpiringCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestExpiringCache, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path,
+            'names.json',
+        )
+        self.cache = cache.ExpiringCache(self.path, 60)
+
+    @mock.patch('time.time')
+    def test_get_set_many(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.set_many({'a': 'name-a', 'b': 'name-b'})
+        mock_time.return_value = 1030
+        self.cache.set_many({'c': 'name-c'})
+
+        self.assertEqual(
+            {'a': 'name-a', 'c': 'name-c'},
+            self.cache.get_many(['a', 'c', 'd']),
+        )
+        mock_time.return_value = 1070
+        self.assertEqual({'c': 'name-c'}, self.cache.get_many(['a', 'c']))
+
+        # Expired entries are dropped on the next write
+        self.cache.set_many({})
+        with open(self.path) as f:
+            self.assertEqual(['c'], list(json.load(f)))
+
+    def test_get_many_invalid(self):
+        self.cache.write('not json')
+        self.assertEqual({}, self.cache.get_many(['a']))
+
+    def test_delete_many(self):
+        self.cache.set_many({'a': 'name-a', 'b': 'name-b'})
+
+        self.cache.delete_many(['a', 'c'])
+
+        self.assertEqual({'b': 'name-b'}, self.cache.get_many(['a', 'b']))
+
+    def test_get_name_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable(
+            'XDG_CACHE_HOME',
+            '/var/cache/me',
+        ))
+        client_manager = mock.Mock()
+        client_manager.auth_ref.project_id = 'project-id'
+
+        name_cache = cache.get_name_cache(client_manager, 'image')
+
+        self.assertEqual(
+            '/var/cache/me/openstack/names/image-project-id.json',
+            name_cache.path,
+        )
+        self.assertEqual(cache.NAME_CACHE_TTL, name_cache.ttl)
+
+    def test_get_name_cache_no_project(self):
+        client_manager = mock.Mock(auth_ref=None)
+        self.assertIsNone(cache.get_name_cache(client_manager, 'image'))
+
+
+class TestMemoryCache(utils.TestCase):
+
+    @mock.patch('time.time')
+    def test_get_set(self, mock_time):
+        memo = cache.MemoryCache(60)
+        mock_time.return_value = 1000
+        memo.set('a', 'value-a')
+        mock_time.return_value = 1030
+        memo.set('b', 'value-b')
+
+        self.assertEqual('value-a', memo.get('a'))
+        self.assertIsNone(memo.get('c'))
+        mock_time.return_value = 1070
+        self.assertEqual('missing', memo.get('a', 'missing'))
+        self.assertEqual('value-b', memo.get('b'))
+
+        memo.clear()
+        self.assertIsNone(memo.get('b'))
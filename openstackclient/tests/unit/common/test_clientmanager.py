@@ -14,11 +14,17 @@
 #
 
 import copy
+import os
+import stat
 
+import fixtures
+from keystoneauth1 import session as ks_session
 from keystoneauth1 import token_endpoint
+import mock
 from osc_lib.tests import utils as osc_lib_test_utils
 
 from openstackclient.common import clientmanager
+from openstackclient.common import session
 from openstackclient.tests.unit import fakes
 
 
@@ -67,3 +73,105 @@ class TestClientManager(osc_lib_test_utils.TestClientManager):
 
         self.assertFalse(client_manager.is_service_available('network'))
         self.assertFalse(client_manager.is_network_endpoint_enabled())
+
+    def test_client_manager_http_pool(self):
+        client_manager = self._make_clientmanager(
+            config_args={'http_pool_size': '25'},
+        )
+
+        adapter = client_manager.session.session.get_adapter(
+            fakes.AUTH_URL)
+        self.assertIsInstance(adapter, ks_session.TCPKeepAliveAdapter)
+        self.assertEqual(25, adapter._pool_maxsize)
+
+    def test_client_manager_user_agent(self):
+        def _osc_session(**kwargs):
+            osc_session = ks_session.Session(auth=kwargs.get('auth'))
+            osc_session.user_agent = 'osc-test'
+            osc_session.app_name = 'test-app'
+            return osc_session
+
+        with mock.patch('osc_lib.session.TimingSession',
+                        side_effect=_osc_session):
+            client_manager = self._make_clientmanager()
+
+        self.assertIsInstance(client_manager.session, session.TimingSession)
+        self.assertEqual('osc-test', client_manager.session.user_agent)
+        self.assertEqual('test-app', client_manager.session.app_name)
+
+    def _auth_cache_dir(self):
+        cache_home = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.EnvironmentVariable(
+            'XDG_CACHE_HOME',
+            cache_home,
+        ))
+        return os.path.join(cache_home, 'openstack', 'auth')
+
+    def _token_requests(self):
+        return [r for r in self.requests.request_history
+                if r.method == 'POST']
+
+    def test_client_manager_auth_cache(self):
+        cache_dir = self._auth_cache_dir()
+        client_manager = self._make_clientmanager(
+            config_args={'auth_cache': 'true'},
+            auth_required=True,
+        )
+        self.assertEqual(1, len(self._token_requests()))
+
+        cache_files = [f for f in os.listdir(cache_dir)
+                       if not f.endswith('.lock')]
+        self.assertEqual(1, len(cache_files))
+        self.assertTrue(cache_files[0].startswith('t1-'))
+        mode = os.stat(os.path.join(cache_dir, cache_files[0])).st_mode
+        self.assertEqual(0o600, stat.S_IMODE(mode))
+
+        # A second invocation re-uses the cached token
+        client_manager_2 = self._make_clientmanager(
+            config_args={'auth_cache': 'true'},
+            auth_required=True,
+        )
+        self.assertEqual(1, len(self._token_requests()))
+        self.assertEqual(
+            client_manager.auth_ref.auth_token,
+            client_manager_2.auth_ref.auth_token,
+        )
+
+    def test_client_manager_auth_cache_auth_not_required(self):
+        self._auth_cache_dir()
+        client_manager = self._make_clientmanager(
+            config_args={'auth_cache': 'true'},
+            auth_required=False,
+        )
+
+        self.assertIsNone(client_manager.auth_ref)
+        self.assertEqual(0, len(self._token_requests()))
+
+    def test_client_manager_auth_cache_disabled(self):
+        cache_dir = self._auth_cache_dir()
+        self._make_clientmanager(auth_required=True)
+        self._make_clientmanager(auth_required=True)
+
+        self.assertEqual(2, len(self._token_requests()))
+        self.assertFalse(os.path.exists(cache_dir))
+
+    def test_client_manager_auth_cache_corrupt(self):
+        cache_dir = self._auth_cache_dir()
+        self._make_clientmanager(
+            config_args={'auth_cache': True},
+            auth_required=True,
+        )
+        for f in os.listdir(cache_dir):
+            if not f.endswith('.lock'):
+                with open(os.path.join(cache_dir, f), 'w') as cache_file:
+                    cache_file.write('not json')
+
+        client_manager = self._make_clientmanager(
+            config_args={'auth_cache': True},
+            auth_required=True,
+        )
+        self.assertEqual(2, len(self._token_requests()))
+        self.assertEqual(
+            fakes.AUTH_TOKEN,
+            client_manager.auth_ref.auth_token,
+        )
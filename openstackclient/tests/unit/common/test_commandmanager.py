@@ -13,6 +13,10 @@
 #   under the License.
 #
 
+import json
+import os
+
+import fixtures
 import mock
 
 from openstackclient.common import commandmanager
@@ -50,6 +54,17 @@ class FakeCommandManager(commandmanager.CommandManager):
 
 class TestCommandManager(utils.TestCase):
 
+    def setUp(self):
+        super(TestCommandManager, self).setUp()
+        self.useFixture(fixtures.EnvironmentVariable(
+            'XDG_CACHE_HOME',
+            self.useFixture(fixtures.TempDir()).path,
+        ))
+        # Start each test with an empty entry point index
+        self.addCleanup(setattr, commandmanager, '_INDEX',
+                        commandmanager._INDEX)
+        commandmanager._INDEX = None
+
     def test_add_command_group(self):
         mgr = FakeCommandManager('test')
 
@@ -90,9 +105,9 @@ class TestCommandManager(utils.TestCase):
         self.assertEqual(['test', 'greek'], gl)
 
     def test_get_command_names(self):
-        mock_cmd_one = mock.Mock()
+        mock_cmd_one = mock.Mock(module_name='one', attrs=('One',))
         mock_cmd_one.name = 'one'
-        mock_cmd_two = mock.Mock()
+        mock_cmd_two = mock.Mock(module_name='two', attrs=('Two',))
         mock_cmd_two.name = 'cmd two'
         mock_pkg_resources = mock.Mock(
             return_value=[mock_cmd_one, mock_cmd_two],
@@ -105,3 +120,65 @@ class TestCommandManager(utils.TestCase):
             iter_entry_points.assert_called_once_with('test')
             cmds = mgr.get_command_names('test')
             self.assertEqual(['one', 'cmd two'], cmds)
+
+
+class TestEntryPointIndex(utils.TestCase):
+
+    def setUp(self):
+        super(TestEntryPointIndex, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path,
+            'entry-points.json',
+        )
+        ep = mock.Mock(module_name='openstackclient.common.commandmanager',
+                       attrs=('CommandManager',))
+        ep.name = 'cmd_one'
+        self.iter_entry_points = self.useFixture(fixtures.MockPatch(
+            'pkg_resources.iter_entry_points',
+            return_value=[ep],
+        )).mock
+
+    def test_index_scan_and_reuse(self):
+        index = commandmanager.EntryPointIndex(self.path)
+        eps = index.get('test')
+        self.iter_entry_points.assert_called_once_with('test')
+        self.assertEqual(['cmd_one'], [ep.name for ep in eps])
+        self.assertEqual(
+            'openstackclient.common.commandmanager:CommandManager',
+            eps[0].value,
+        )
+
+        # A new index, as in the next process, reads the saved groups
+        index = commandmanager.EntryPointIndex(self.path)
+        eps = index.get('test')
+        self.iter_entry_points.assert_called_once_with('test')
+        self.assertEqual(['cmd_one'], [ep.name for ep in eps])
+
+    def test_index_fingerprint_changed(self):
+        commandmanager.EntryPointIndex(self.path).get('test')
+        with mock.patch.object(
+            commandmanager,
+            '_distributions_fingerprint',
+            return_value='changed',
+        ):
+            commandmanager.EntryPointIndex(self.path).get('test')
+        self.assertEqual(2, self.iter_entry_points.call_count)
+        with open(self.path) as f:
+            self.assertEqual('changed', json.load(f)['fingerprint'])
+
+    def test_index_corrupt(self):
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        eps = commandmanager.EntryPointIndex(self.path).get('test')
+        self.assertEqual(['cmd_one'], [ep.name for ep in eps])
+
+    def test_lazy_entry_point(self):
+        ep = commandmanager.LazyEntryPoint(
+            'cmd_one',
+            'openstackclient.common.commandmanager:CommandManager',
+        )
+        self.assertEqual('openstackclient.common.commandmanager',
+                         ep.module_name)
+        self.assertEqual(('CommandManager',), ep.attrs)
+        self.assertIs(commandmanager.CommandManager, ep.load())
+        self.assertIs(commandmanager.CommandManager, ep.resolve())
@@ -0,0 +1,167 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import argparse
+import threading
+
+from openstackclient.common import parallel
+from openstackclient.tests.unit import utils
+
+
+def _double(i):
+    if i < 0:
+        raise ValueError(i)
+    return i * 2
+
+
+class TestParallel(utils.TestCase):
+
+    def test_positive_int(self):
+        self.assertEqual(4, parallel.positive_int('4'))
+        self.assertRaises(argparse.ArgumentTypeError,
+                          parallel.positive_int, '0')
+        self.assertRaises(argparse.ArgumentTypeError,
+                          parallel.positive_int, 'x')
+
+    def test_add_parallel_option(self):
+        parser = parallel.add_parallel_option(argparse.ArgumentParser())
+        self.assertEqual(1, parser.parse_args([]).parallel)
+        self.assertEqual(8, parser.parse_args(['--parallel', '8']).parallel)
+
+    def test_execute_serial(self):
+        results = parallel.execute(_double, [1, -2, 3])
+
+        self.assertEqual([1, -2, 3], [r[0] for r in results])
+        self.assertEqual([2, None, 6], [r[1] for r in results])
+        self.assertIsNone(results[0][2])
+        self.assertIsInstance(results[1][2], ValueError)
+
+    def test_execute_parallel(self):
+        threads = set()
+
+        def _func(i):
+            threads.add(threading.current_thread().name)
+            return _double(i)
+
+        items = list(range(-2, 20))
+        results = parallel.execute(_func, items, 4)
+
+        # Results come back in the order of the items
+        self.assertEqual(items, [r[0] for r in results])
+        self.assertEqual([None, None] + [i * 2 for i in items[2:]],
+                         [r[1] for r in results])
+        self.assertNotIn(threading.current_thread().name, threads)
+        self.assertEqual(
+            [-2, -1],
+            [i for i, e in parallel.failures(results)],
+        )
+
+    def test_add_parallel_option_help(self):
+        parser = parallel.add_parallel_option(
+            argparse.ArgumentParser(), help='Listing requests')
+        self.assertIn('Listing requests', parser.format_help())
+
+    def test_imap_bounded(self):
+        started = []
+
+        def _items():
+            for i in range(10):
+                started.append(i)
+                yield i
+
+        results = parallel.imap(_double, _items(), 2)
+
+        self.assertEqual((0, 0, None), next(results))
+        # Only a few items are taken ahead of the consumer
+        self.assertLessEqual(len(started), 4)
+        self.assertEqual([i * 2 for i in range(1, 10)],
+                         [r[1] for r in results])
+
+    def test_imap_serial_failure(self):
+        results = list(parallel.imap(_double, [-1, 1]))
+
+        self.assertIsInstance(results[0][2], ValueError)
+        self.assertEqual((1, 2, None), results[1])
+
+    def test_iter_chain(self):
+        threads = set()
+
+        def _pages(i):
+            threads.add(threading.current_thread().name)
+            for j in range(3):
+                yield [i, j]
+
+        self.assertEqual(
+            [[i, j] for i in range(5) for j in range(3)],
+            list(parallel.iter_chain(_pages, range(5), 3)),
+        )
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_iter_chain_bounded(self):
+        produced = []
+
+        def _pages(i):
+            for j in range(100):
+                produced.append((i, j))
+                yield j
+
+        values = parallel.iter_chain(_pages, range(2), 2, buffer=2)
+
+        self.assertEqual(0, next(values))
+        values.close()
+        # Producers stop once their queue is full and the consumer left
+        self.assertLess(len(produced), 10)
+
+    def test_iter_chain_failure(self):
+        def _pages(i):
+            yield i
+            if i == 1:
+                raise ValueError(i)
+
+        values = parallel.iter_chain(_pages, range(3), 2)
+
+        self.assertEqual([0, 1], [next(values), next(values)])
+        self.assertRaises(ValueError, next, values)
+
+    def test_execute_empty(self):
+        self.assertEqual([], parallel.execute(_double, [], 4))
+
+    def test_call_all(self):
+        barrier = threading.Barrier(2) if hasattr(threading, 'Barrier') \
+            else None
+
+        def _service(value):
+            def _call():
+                # Both calls must be running at the same time
+                if barrier:
+                    barrier.wait(5)
+                return value
+            return _call
+
+        self.assertEqual(
+            ['compute', 'volume'],
+            parallel.call_all([_service('compute'), _service('volume')]),
+        )
+
+    def test_call_all_failure(self):
+        called = []
+
+        def _fail():
+            raise ValueError('compute')
+
+        self.assertRaises(
+            ValueError,
+            parallel.call_all,
+            [_fail, lambda: called.append('volume')],
+        )
+        self.assertEqual(['volume'], called)
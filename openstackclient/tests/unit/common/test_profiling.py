@@ -0,0 +1,247 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import json
+
+import mock
+from osc_lib import utils as osc_utils
+from requests_mock.contrib import fixture
+import six
+
+from openstackclient.common import profiling
+from openstackclient.common import session
+from openstackclient.tests.unit import utils
+
+
+def _record(**kwargs):
+    record = {
+        'start': 10.0,
+        'method': 'GET',
+        'url': 'https://image.example.com/v2/images',
+        'service': 'image',
+        'endpoint': 'https://image.example.com',
+        'phase': 'action',
+        'elapsed': 0.5,
+        'bytes_in': 100,
+        'bytes_out': 0,
+        'retries': 0,
+        'thread': 1,
+    }
+    record.update(kwargs)
+    return record
+
+
+class TestPhase(utils.TestCase):
+
+    def setUp(self):
+        super(TestPhase, self).setUp()
+        self.addCleanup(profiling.set_phase, 'action')
+
+    def test_phase(self):
+        profiling.set_phase('auth')
+        self.assertEqual('auth', profiling.current_phase())
+        with profiling.phase('resolve'):
+            with profiling.phase('format'):
+                self.assertEqual('format', profiling.current_phase())
+            self.assertEqual('resolve', profiling.current_phase())
+        self.assertEqual('auth', profiling.current_phase())
+
+    def test_in_phase(self):
+        @profiling.in_phase('resolve')
+        def find():
+            return profiling.current_phase()
+
+        self.assertEqual('resolve', find())
+        self.assertEqual('action', profiling.current_phase())
+
+    def test_record_lookups(self):
+        def find_resource(manager, name_or_id, **kwargs):
+            return profiling.current_phase()
+
+        with mock.patch.object(osc_utils, 'find_resource', find_resource):
+            profiling.record_lookups()
+            wrapped = osc_utils.find_resource
+            profiling.record_lookups()
+
+            # Wrapped only once
+            self.assertIs(wrapped, osc_utils.find_resource)
+            self.assertEqual(
+                'resolve', osc_utils.find_resource(None, 'qaz'))
+        self.assertEqual('action', profiling.current_phase())
+
+
+class TestCollect(utils.TestCase):
+
+    def test_collect(self):
+        profiling.record_send()
+        with profiling.collect() as outer:
+            profiling.record_send()
+            with profiling.collect() as inner:
+                profiling.record_send()
+                profiling.record_connect(0.25, tls=0.125)
+            profiling.record_connect(0.5)
+
+        self.assertFalse(outer.nested)
+        self.assertEqual(1, outer.sends)
+        self.assertEqual(0.5, outer.connect)
+        self.assertEqual(0.0, outer.tls)
+        self.assertTrue(inner.nested)
+        self.assertEqual(1, inner.sends)
+        self.assertEqual(0.25, inner.connect)
+        self.assertEqual(0.125, inner.tls)
+
+
+class TestRecords(utils.TestCase):
+
+    def test_get_service_map(self):
+        auth_ref = mock.Mock()
+        auth_ref.service_catalog.catalog = [
+            {'type': 'image', 'endpoints': [
+                {'url': 'https://image.example.com:9292/v2'},
+            ]},
+            {'type': 'identity', 'endpoints': [
+                {'publicURL': 'https://example.com/identity/v2.0'},
+            ]},
+        ]
+
+        self.assertEqual(
+            {
+                'https://image.example.com:9292': 'image',
+                'https://example.com': 'identity',
+            },
+            profiling.get_service_map(auth_ref),
+        )
+
+    def test_fill_services(self):
+        records = [
+            _record(service=None),
+            _record(service='volume'),
+            _record(service=None, endpoint='https://other.example.com'),
+        ]
+
+        profiling.fill_services(
+            records,
+            {'https://image.example.com': 'image'},
+        )
+
+        self.assertEqual(
+            ['image', 'volume', None],
+            [r['service'] for r in records],
+        )
+
+    def test_summarize(self):
+        records = [
+            _record(),
+            _record(elapsed=0.25, bytes_out=10, retries=1),
+            _record(
+                service='compute',
+                endpoint='https://compute.example.com',
+                elapsed=2.0,
+                bytes_in=None,
+            ),
+        ]
+
+        self.assertEqual(
+            [
+                ('compute', 'https://compute.example.com', 1, 2.0, 0, 0, 0),
+                ('image', 'https://image.example.com', 2, 0.75, 200, 10, 1),
+            ],
+            profiling.summarize(records),
+        )
+
+    def test_write_json_lines(self):
+        records = [_record(), _record(method='POST')]
+        f = six.StringIO()
+
+        profiling.write_json_lines(records, f)
+
+        self.assertEqual(
+            records,
+            [json.loads(line) for line in f.getvalue().splitlines()],
+        )
+
+    def test_write_trace_events(self):
+        f = six.StringIO()
+
+        profiling.write_trace_events([_record()], f)
+
+        event = json.loads(f.getvalue())['traceEvents'][0]
+        self.assertEqual(
+            'GET https://image.example.com/v2/images',
+            event['name'],
+        )
+        self.assertEqual('X', event['ph'])
+        self.assertEqual(10000000, event['ts'])
+        self.assertEqual(500000, event['dur'])
+        self.assertEqual(1, event['tid'])
+        self.assertEqual('action', event['args']['phase'])
+        self.assertNotIn('url', event['args'])
+
+
+class TestTimingSession(utils.TestCase):
+
+    def setUp(self):
+        super(TestTimingSession, self).setUp()
+        self.requests_mock = self.useFixture(fixture.Fixture())
+        self.session = session.TimingSession()
+
+    def test_request_records(self):
+        self.requests_mock.register_uri(
+            'POST',
+            'https://image.example.com/v2/images',
+            text='{"id": "1"}',
+            status_code=201,
+        )
+
+        with profiling.phase('resolve'):
+            self.session.request(
+                'https://image.example.com/v2/images',
+                'POST',
+                json={'name': 'x'},
+                endpoint_filter={'service_type': 'image'},
+            )
+
+        self.assertEqual(1, len(self.session.get_timings()))
+        record = self.session.get_records()[0]
+        self.assertEqual('POST', record['method'])
+        self.assertEqual(201, record['status'])
+        self.assertEqual('image', record['service'])
+        self.assertEqual('https://image.example.com', record['endpoint'])
+        self.assertEqual('resolve', record['phase'])
+        self.assertEqual(len('{"name": "x"}'), record['bytes_out'])
+        self.assertEqual(len('{"id": "1"}'), record['bytes_in'])
+        self.assertEqual(0, record['retries'])
+        self.assertGreaterEqual(record['transfer'], 0.0)
+
+        self.session.reset_timings()
+        self.assertEqual([], self.session.get_records())
+
+    def test_request_stream(self):
+        self.requests_mock.register_uri(
+            'GET',
+            'https://image.example.com/v2/images/1/file',
+            content=b'abcd',
+            headers={'Content-Length': '4'},
+        )
+
+        self.session.request(
+            'https://image.example.com/v2/images/1/file',
+            'GET',
+            stream=True,
+        )
+
+        record = self.session.get_records()[0]
+        self.assertIsNone(record['service'])
+        self.assertEqual('action', record['phase'])
+        self.assertEqual(4, record['bytes_in'])
+        self.assertIsNone(record['transfer'])
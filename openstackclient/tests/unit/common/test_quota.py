@@ -13,6 +13,9 @@
 import copy
 import mock
 
+from openstack.network.v2 import quota as network_quota
+from osc_lib import exceptions
+
 from openstackclient.common import quota
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit import fakes
@@ -518,3 +521,130 @@ class TestQuotaShow(TestQuota):
         self.network.get_quota.assert_called_once_with(
             identity_fakes.project_id)
         self.assertNotCalled(self.network.get_quota_default)
+
+
+class TestQuotaList(TestQuota):
+
+    compute_quota = {'id': 'p', 'cores': 20, 'instances': 10, 'ram': 51200}
+    volume_quota = {'id': 'p', 'volumes': 11, 'gigabytes_lvm': -1}
+
+    def setUp(self):
+        super(TestQuotaList, self).setUp()
+
+        self.projects = [
+            fakes.FakeResource(None, {'id': 'p%d' % i, 'name': 'n%d' % i},
+                               loaded=True)
+            for i in range(3)
+        ]
+        self.projects_mock.list.return_value = self.projects
+        self.quotas_mock.get.return_value = FakeQuotaResource(
+            None, copy.deepcopy(self.compute_quota), loaded=True)
+        self.volume_quotas_mock.get.return_value = FakeQuotaResource(
+            None, copy.deepcopy(self.volume_quota), loaded=True)
+
+        self.network_mock = self.app.client_manager.network
+        self.network_mock.quotas = mock.Mock(return_value=[
+            network_quota.Quota(project_id='p1', networks=5, subnets=2),
+        ])
+        self.network_mock.get_quota_default = mock.Mock(
+            return_value=network_quota.Quota(networks=10, subnets=10))
+
+        self.cmd = quota.ListQuota(self.app, None)
+
+    def _index(self, columns, name):
+        return list(columns).index(name)
+
+    def test_quota_list(self):
+        parsed_args = self.check_parser(self.cmd, [], [('parallel', 10)])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['ID', 'Name'], columns[:2])
+        self.assertIn('cores', columns)
+        self.assertIn('volumes', columns)
+        self.assertIn('networks', columns)
+        self.assertNotIn('secgroups in use', columns)
+        self.assertEqual(['p0', 'p1', 'p2'], [row[0] for row in data])
+        cores = self._index(columns, 'cores')
+        networks = self._index(columns, 'networks')
+        self.assertEqual([20, 20, 20], [row[cores] for row in data])
+        subnets = self._index(columns, 'subnets')
+        self.assertEqual([10, 5, 10], [row[networks] for row in data])
+        self.assertEqual([10, 2, 10], [row[subnets] for row in data])
+        # Network quotas are listed at once, not per project
+        self.network_mock.quotas.assert_called_once_with()
+        self.network_mock.get_quota_default.assert_called_once_with('p0')
+        self.quotas_mock.get.assert_has_calls(
+            [mock.call('p0'), mock.call('p1'), mock.call('p2')],
+            any_order=True,
+        )
+
+    def test_quota_list_detail(self):
+        self.quotas_mock.get.return_value = FakeQuotaResource(
+            None,
+            {'cores': {'limit': 20, 'in_use': 4, 'reserved': 0}},
+            loaded=True,
+        )
+        self.projects_mock.get.return_value = self.projects[1]
+        arglist = [
+            '--project', 'n1',
+            '--compute',
+            '--detail',
+        ]
+        verifylist = [
+            ('project', ['n1']),
+            ('compute', True),
+            ('detail', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertNotIn('volumes', columns)
+        self.assertNotIn('networks', columns)
+        self.assertEqual(1, len(data))
+        self.assertEqual(20, data[0][self._index(columns, 'cores')])
+        self.assertEqual(4, data[0][self._index(columns, 'cores in use')])
+        self.quotas_mock.get.assert_called_once_with('p1', detail=True)
+        self.projects_mock.list.assert_not_called()
+
+    def test_quota_list_network_detail_old_sdk(self):
+        def get_quota(quota):
+            return network_quota.Quota(project_id=quota, networks=5)
+
+        self.network_mock.get_quota = mock.Mock(side_effect=get_quota)
+        self.projects_mock.get.return_value = self.projects[1]
+        arglist = [
+            '--project', 'n1',
+            '--network',
+            '--detail',
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(1, len(data))
+        self.assertEqual(5, data[0][self._index(columns, 'networks')])
+        self.assertIsNone(data[0][self._index(columns, 'networks in use')])
+        self.network_mock.get_quota.assert_called_with('p1')
+
+    def test_quota_list_failure(self):
+        self.quotas_mock.get.side_effect = [
+            FakeQuotaResource(None, copy.deepcopy(self.compute_quota),
+                              loaded=True),
+            exceptions.CommandError('boom'),
+        ]
+        self.projects_mock.list.return_value = self.projects[:2]
+        parsed_args = self.check_parser(
+            self.cmd, ['--compute', '--parallel', '1'], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['p0'], [row[0] for row in data])
+
+        self.quotas_mock.get.side_effect = exceptions.CommandError('boom')
+        self.assertRaises(
+            exceptions.CommandError,
+            self.cmd.take_action,
+            parsed_args,
+        )
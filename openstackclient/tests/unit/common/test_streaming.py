@@ -0,0 +1,153 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import json
+import random
+
+import mock
+import six
+
+from openstackclient.common import streaming
+from openstackclient.tests.unit import utils
+
+
+class TestIterPages(utils.TestCase):
+
+    def test_iter_pages(self):
+        list_f = mock.Mock(side_effect=[
+            [{'id': 'a'}, {'id': 'b'}],
+            [{'id': 'c'}],
+            [],
+        ])
+
+        rows = streaming.iter_pages(list_f, public=True)
+
+        # Nothing is fetched until the rows are read
+        list_f.assert_not_called()
+        self.assertEqual({'id': 'a'}, next(rows))
+        list_f.assert_called_once_with(marker=None, public=True)
+        self.assertEqual([{'id': 'b'}, {'id': 'c'}], list(rows))
+        list_f.assert_has_calls([
+            mock.call(marker=None, public=True),
+            mock.call(marker='b', public=True),
+            mock.call(marker='c', public=True),
+        ])
+
+    def test_iter_pages_marker_ignored(self):
+        list_f = mock.Mock(return_value=[{'id': 'a'}])
+
+        rows = list(streaming.iter_pages(list_f))
+
+        self.assertEqual([{'id': 'a'}], rows)
+        self.assertEqual(2, list_f.call_count)
+
+    def test_iter_pages_marker_ignored_page(self):
+        list_f = mock.Mock(return_value=[{'id': 'a'}, {'id': 'b'}])
+
+        rows = list(streaming.iter_pages(list_f))
+
+        # The repeated page is not yielded again
+        self.assertEqual([{'id': 'a'}, {'id': 'b'}], rows)
+        self.assertEqual(2, list_f.call_count)
+
+    def test_iter_pages_marker_f(self):
+        list_f = mock.Mock(side_effect=[[{'name': 'x'}], []])
+
+        rows = list(streaming.iter_pages(
+            list_f,
+            marker='start',
+            marker_f=lambda row: row['name'],
+        ))
+
+        self.assertEqual([{'name': 'x'}], rows)
+        list_f.assert_has_calls([
+            mock.call(marker='start'),
+            mock.call(marker='x'),
+        ])
+
+
+class TestSortItems(utils.TestCase):
+
+    def setUp(self):
+        super(TestSortItems, self).setUp()
+        rand = random.Random(42)
+        self.items = [
+            {'name': 'image-%d' % rand.randint(0, 20), 'size': i}
+            for i in range(100)
+        ]
+
+    def test_sort_items_no_sort(self):
+        self.assertIs(self.items, streaming.sort_items(self.items, None))
+
+    def test_sort_items_in_memory(self):
+        self.assertEqual(
+            sorted(self.items, key=lambda i: i['name']),
+            list(streaming.sort_items(iter(self.items), 'name')),
+        )
+
+    def test_sort_items_merge(self):
+        expected = sorted(self.items, key=lambda i: i['size'], reverse=True)
+        expected = sorted(expected, key=lambda i: i['name'])
+
+        result = streaming.sort_items(
+            iter(self.items),
+            'name:asc,size:desc',
+            chunk_size=7,
+        )
+
+        self.assertEqual(expected, list(result))
+
+    def test_sort_items_merge_stable(self):
+        expected = sorted(self.items, key=lambda i: i['name'], reverse=True)
+
+        result = streaming.sort_items(self.items, 'name:desc', chunk_size=10)
+
+        self.assertEqual(expected, list(result))
+
+    def test_sort_presorted_items(self):
+        expected = sorted(self.items, key=lambda i: i['size'], reverse=True)
+        expected = sorted(expected, key=lambda i: i['name'])
+        presorted = sorted(self.items, key=lambda i: i['name'])
+
+        result = streaming.sort_presorted_items(
+            iter(presorted), 'name,size:desc', 1)
+
+        self.assertEqual(expected, list(result))
+
+    def test_sort_presorted_items_all_keys(self):
+        self.assertIs(
+            self.items,
+            streaming.sort_presorted_items(self.items, 'name:desc', 1),
+        )
+
+    def test_sort_presorted_items_none(self):
+        self.assertEqual(
+            sorted(self.items, key=lambda i: i['size'], reverse=True),
+            list(streaming.sort_presorted_items(
+                iter(self.items), 'size:desc', 0)),
+        )
+
+
+class TestJSONLinesFormatter(utils.TestCase):
+
+    def test_emit_list(self):
+        output = six.StringIO()
+        data = iter([('a', 1), ('b', None)])
+
+        streaming.JSONLinesFormatter().emit_list(
+            ('Name', 'Size'), data, output, None)
+
+        self.assertEqual(
+            [{'Name': 'a', 'Size': 1}, {'Name': 'b', 'Size': None}],
+            [json.loads(line) for line in output.getvalue().splitlines()],
+        )
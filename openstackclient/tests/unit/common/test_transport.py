@@ -0,0 +1,90 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+from keystoneauth1 import session as ks_session
+import mock
+import requests
+
+from openstackclient.common import profiling
+from openstackclient.common import transport
+from openstackclient.tests.unit import utils
+
+
+class TestTransport(utils.TestCase):
+
+    def test_configure(self):
+        session = requests.Session()
+
+        transport.configure(session, pool_size=32, max_retries=3)
+
+        adapter = session.get_adapter('https://example.com')
+        self.assertIs(adapter, session.get_adapter('http://example.com'))
+        self.assertIsInstance(adapter, ks_session.TCPKeepAliveAdapter)
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.connect)
+        self.assertEqual(3, adapter.max_retries.read)
+        self.assertEqual(0, getattr(adapter.max_retries, 'status', 0))
+
+    def test_make_retry_old_urllib3(self):
+        def old_retry(total=10, connect=None, read=None, redirect=None):
+            return mock.sentinel.retry
+
+        with mock.patch.object(
+            transport.retry, 'Retry', side_effect=old_retry,
+        ) as retry:
+            self.assertIs(mock.sentinel.retry, transport._make_retry(2))
+
+        retry.assert_called_with(total=2, connect=2, read=2)
+
+    def test_configure_from_config(self):
+        session = requests.Session()
+
+        transport.configure_from_config(session, {
+            'http_pool_size': '4',
+            'http_max_retries': 'bogus',
+            'http_no_keepalive': True,
+        })
+
+        adapter = session.get_adapter('https://example.com')
+        self.assertNotIsInstance(adapter, ks_session.TCPKeepAliveAdapter)
+        self.assertEqual(4, adapter._pool_maxsize)
+        self.assertEqual(
+            transport.DEFAULT_MAX_RETRIES,
+            adapter.max_retries.total,
+        )
+
+    @mock.patch.object(transport, '_default_session', None)
+    def test_get_default_session(self):
+        session = transport.get_default_session()
+
+        self.assertIsInstance(session, ks_session.Session)
+        self.assertIs(session, transport.get_default_session())
+        self.assertEqual(
+            transport.DEFAULT_POOL_SIZE,
+            session.session.get_adapter('https://example.com')._pool_maxsize,
+        )
+
+    def test_adapter_timing(self):
+        adapter = transport.make_adapter()
+
+        self.assertIs(
+            transport._TimedHTTPSConnectionPool,
+            adapter.poolmanager.pool_classes_by_scheme['https'],
+        )
+        with profiling.collect() as stats:
+            with mock.patch.object(
+                requests.adapters.HTTPAdapter, 'send',
+            ) as send:
+                adapter.send(mock.sentinel.request)
+        send.assert_called_once_with(mock.sentinel.request)
+        self.assertEqual(1, stats.sends)
@@ -0,0 +1,172 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from openstackclient.common import waiter
+from openstackclient.tests.unit import utils
+
+
+class NotFound(Exception):
+    pass
+
+
+def _res(res_id, status, updated=None, progress=None):
+    return mock.Mock(id=res_id, status=status, updated=updated,
+                     progress=progress)
+
+
+class TestWaiter(utils.TestCase):
+
+    def setUp(self):
+        super(TestWaiter, self).setUp()
+        self.sleep = mock.patch('time.sleep').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_wait_get_only(self):
+        get_f = mock.Mock(side_effect=[
+            _res('a', 'BUILD', progress=50),
+            _res('a', 'ACTIVE'),
+        ])
+        callback = mock.Mock()
+
+        result = waiter.Waiter(get_f, callback=callback).wait(['a'])
+
+        self.assertEqual({'a': True}, result)
+        get_f.assert_has_calls([mock.call('a'), mock.call('a')])
+        callback.assert_has_calls([
+            mock.call(0, 1, 50),
+            mock.call(1, 1, 100),
+        ])
+        self.sleep.assert_called_once_with(2)
+
+    def test_wait_list_per_cycle(self):
+        servers = [_res(str(i), 'BUILD', updated='2016-01-01T00:00:00Z')
+                   for i in range(200)]
+        list_f = mock.Mock(side_effect=[
+            [_res(s.id, 'BUILD', updated='2016-01-01T00:00:05Z')
+             for s in servers],
+            [_res(s.id, 'ACTIVE', updated='2016-01-01T00:00:09Z')
+             for s in servers[:150]] +
+            [_res('other', 'ACTIVE', updated='2016-01-01T00:00:10Z')],
+            [_res(s.id, 'ERROR', updated='2016-01-01T00:00:12Z')
+             for s in servers[150:]],
+        ])
+        get_f = mock.Mock()
+
+        result = waiter.Waiter(get_f, list_f=list_f).wait(servers)
+
+        self.assertEqual(200, len(result))
+        self.assertEqual(150, sum(result.values()))
+        self.assertNotIn('other', result)
+        get_f.assert_not_called()
+        list_f.assert_has_calls([
+            mock.call('2016-01-01T00:00:00Z'),
+            mock.call('2016-01-01T00:00:05Z'),
+            mock.call('2016-01-01T00:00:10Z'),
+        ])
+
+    def test_wait_unlisted_uses_get(self):
+        list_f = mock.Mock(return_value=[])
+        get_f = mock.Mock(side_effect=[
+            _res('a', 'BUILD', updated='2016-01-01T00:00:01Z'),
+            _res('a', 'ACTIVE', updated='2016-01-01T00:00:02Z'),
+        ])
+
+        result = waiter.Waiter(get_f, list_f=list_f).wait(['a'])
+
+        self.assertEqual({'a': True}, result)
+        self.assertEqual(2, get_f.call_count)
+        # Listed from the updated time of the first GET on
+        list_f.assert_called_once_with('2016-01-01T00:00:01Z')
+
+    def test_wait_idle_listed_not_fetched(self):
+        ids = [str(i) for i in range(200)]
+        get_f = mock.Mock(side_effect=[
+            _res(i, 'BUILD', updated='2016-01-01T00:00:0%s' % (int(i) % 2))
+            for i in ids
+        ])
+        list_f = mock.Mock(side_effect=[
+            [_res(i, 'BUILD', updated='2016-01-01T00:00:01Z') for i in ids],
+            [],
+            [_res(i, 'ACTIVE', updated='2016-01-01T00:00:09Z') for i in ids],
+        ])
+
+        result = waiter.Waiter(get_f, list_f=list_f).wait(ids)
+
+        self.assertEqual(200, sum(result.values()))
+        # Servers from create have no 'updated', they are fetched once
+        # and then only listed
+        self.assertEqual(200, get_f.call_count)
+        list_f.assert_has_calls([
+            mock.call('2016-01-01T00:00:00'),
+            mock.call('2016-01-01T00:00:01Z'),
+            mock.call('2016-01-01T00:00:01Z'),
+        ])
+        self.assertEqual(3, list_f.call_count)
+
+    def test_wait_oldest_marker(self):
+        list_f = mock.Mock(return_value=[
+            _res('a', 'ACTIVE', updated='2016-01-01T00:00:05Z'),
+            _res('b', 'ACTIVE', updated='2016-01-01T00:00:06Z'),
+        ])
+        get_f = mock.Mock()
+
+        result = waiter.Waiter(get_f, list_f=list_f).wait([
+            _res('a', 'BUILD', updated='2016-01-01T00:00:03Z'),
+            _res('b', 'BUILD', updated='2016-01-01T00:00:01Z'),
+        ])
+
+        self.assertEqual({'a': True, 'b': True}, result)
+        list_f.assert_called_once_with('2016-01-01T00:00:01Z')
+        get_f.assert_not_called()
+
+    def test_wait_deleted(self):
+        list_f = mock.Mock(return_value=[
+            _res('a', 'DELETED', updated='2016-01-01T00:00:01Z'),
+        ])
+        get_f = mock.Mock(side_effect=NotFound())
+
+        result = waiter.Waiter(
+            get_f,
+            list_f=list_f,
+            deleted=True,
+        ).wait([
+            _res('a', 'ACTIVE', updated='2016-01-01T00:00:00Z'),
+            _res('b', 'ACTIVE', updated='2016-01-01T00:00:00Z'),
+        ])
+
+        self.assertEqual({'a': True, 'b': True}, result)
+        get_f.assert_called_once_with('b')
+
+    def test_wait_unexpected_exception(self):
+        get_f = mock.Mock(side_effect=NotFound())
+
+        self.assertRaises(NotFound, waiter.Waiter(get_f).wait, ['a'])
+
+    def test_wait_backoff_and_timeout(self):
+        get_f = mock.Mock(return_value=_res('a', 'BUILD'))
+
+        result = waiter.Waiter(
+            get_f,
+            sleep_time=1,
+            max_sleep_time=4,
+            timeout=10,
+        ).wait(['a'])
+
+        self.assertEqual({'a': False}, result)
+        self.assertEqual(
+            [mock.call(1), mock.call(1), mock.call(2), mock.call(4),
+             mock.call(4)],
+            self.sleep.call_args_list,
+        )
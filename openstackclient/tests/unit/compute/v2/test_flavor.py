@@ -495,6 +495,46 @@ class TestFlavorList(TestFlavor):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(tuple(self.data_long), tuple(data))
 
+    def test_flavor_list_long_embedded_extra_specs(self):
+        flavors = compute_fakes.FakeFlavor.create_flavors(
+            attrs={'extra_specs': {'embedded': 'value'}},
+        )
+        self.flavors_mock.list.return_value = flavors
+        parsed_args = self.check_parser(self.cmd, ['--long'], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            [u"embedded='value'"] * 2,
+            [row[-1] for row in data],
+        )
+        for f in flavors:
+            f.get_keys.assert_not_called()
+
+    @mock.patch.object(flavor, '_get_extra_specs_cache')
+    def test_flavor_list_long_cached_extra_specs(self, mock_cache):
+        flavors = compute_fakes.FakeFlavor.create_flavors(count=3)
+        flavors[2].get_keys.side_effect = Exception('Forbidden')
+        self.flavors_mock.list.return_value = flavors
+        mock_cache.return_value.get_many.return_value = {
+            flavors[0].id: {'cached': 'value'},
+        }
+        parsed_args = self.check_parser(self.cmd, ['--long'], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            [u"cached='value'", u"property='value'", u''],
+            [row[-1] for row in data],
+        )
+        flavors[0].get_keys.assert_not_called()
+        mock_cache.return_value.get_many.assert_called_once_with(
+            [f.id for f in flavors],
+        )
+        mock_cache.return_value.set_many.assert_called_once_with(
+            {flavors[1].id: {'property': 'value'}},
+        )
+
 
 class TestFlavorSet(TestFlavor):
 
@@ -512,7 +552,9 @@ class TestFlavorSet(TestFlavor):
         self.projects_mock.get.return_value = self.project
         self.cmd = flavor.SetFlavor(self.app, None)
 
-    def test_flavor_set_property(self):
+    @mock.patch(
+        'openstackclient.compute.v2.flavor._get_extra_specs_cache')
+    def test_flavor_set_property(self, mock_cache):
         arglist = [
             '--property', 'FOO="B A R"',
             'baremetal'
@@ -527,6 +569,9 @@ class TestFlavorSet(TestFlavor):
         self.flavors_mock.find.assert_called_with(name=parsed_args.flavor,
                                                   is_public=None)
         self.flavor.set_keys.assert_called_with({'FOO': '"B A R"'})
+        mock_cache.return_value.delete_many.assert_called_once_with(
+            [self.flavor.id],
+        )
         self.assertIsNone(result)
 
     def test_flavor_set_project(self):
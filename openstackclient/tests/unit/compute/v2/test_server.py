@@ -18,7 +18,6 @@ import mock
 from mock import call
 
 from osc_lib import exceptions
-from osc_lib import utils as common_utils
 
 from openstackclient.compute.v2 import server
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
@@ -575,8 +574,31 @@ class TestServerDelete(TestServer):
         self.servers_mock.delete.assert_has_calls(calls)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=True)
-    def test_server_delete_wait_ok(self, mock_wait_for_delete):
+    def test_server_delete_multi_servers_parallel_fail(self):
+        servers = self.setup_servers_mock(count=3)
+        self.servers_mock.delete.side_effect = [
+            None,
+            exceptions.CommandError('fail'),
+            None,
+        ]
+
+        arglist = [s.id for s in servers] + ['--parallel', '1']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('parallel', 1),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaisesRegex(
+            exceptions.CommandError,
+            '1 of 3 servers failed to delete.',
+            self.cmd.take_action,
+            parsed_args,
+        )
+        self.servers_mock.delete.assert_has_calls(
+            [call(s.id) for s in servers])
+
+    def test_server_delete_wait_ok(self):
         servers = self.setup_servers_mock(count=1)
 
         arglist = [
@@ -587,18 +609,20 @@ class TestServerDelete(TestServer):
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        result = self.cmd.take_action(parsed_args)
+        with mock.patch.object(server, '_wait_for_servers',
+                               return_value={servers[0].id: True}) as wait:
+            result = self.cmd.take_action(parsed_args)
 
         self.servers_mock.delete.assert_called_with(servers[0].id)
-        mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
-            callback=server._show_progress
+        wait.assert_called_once_with(
+            self.app.client_manager.compute,
+            [servers[0]],
+            deleted=True,
+            timeout=300,
         )
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=False)
-    def test_server_delete_wait_fails(self, mock_wait_for_delete):
+    def test_server_delete_wait_fails(self):
         servers = self.setup_servers_mock(count=1)
 
         arglist = [
@@ -609,13 +633,16 @@ class TestServerDelete(TestServer):
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
+        with mock.patch.object(server, '_wait_for_servers',
+                               return_value={servers[0].id: False}) as wait:
+            self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
 
         self.servers_mock.delete.assert_called_with(servers[0].id)
-        mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
-            callback=server._show_progress
+        wait.assert_called_once_with(
+            self.app.client_manager.compute,
+            [servers[0]],
+            deleted=True,
+            timeout=300,
         )
 
 
@@ -761,9 +788,59 @@ class TestServerList(TestServer):
         columns, data = self.cmd.take_action(parsed_args)
 
         self.servers_mock.list.assert_called_with(**self.kwargs)
+        self.images_mock.list.assert_called_once_with(filters={
+            'id': 'in:' + ','.join(sorted(s.image['id']
+                                          for s in self.servers)),
+        })
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
 
+    def test_server_list_no_name_lookup(self):
+        arglist = [
+            '--no-name-lookup',
+        ]
+        verifylist = [
+            ('no_name_lookup', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.list.assert_called_with(**self.kwargs)
+        self.images_mock.list.assert_not_called()
+        self.assertEqual(self.columns[:-1] + ('Image ID',), columns)
+        self.assertEqual(
+            tuple(d[:-1] + (s.image['id'],)
+                  for d, s in zip(self.data, self.servers)),
+            tuple(data),
+        )
+
+    def test_server_list_image_name_not_selected(self):
+        arglist = [
+            '-c', 'ID',
+        ]
+        verifylist = [
+            ('columns', ['ID']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.images_mock.list.assert_not_called()
+        self.images_mock.get.assert_not_called()
+
+    def test_server_list_image_name_get_fallback(self):
+        self.images_mock.list.return_value = []
+        self.images_mock.get.return_value = self.image
+        arglist = []
+        verifylist = []
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.images_mock.get.assert_has_calls(
+            [call(i) for i in sorted(s.image['id'] for s in self.servers)])
+
     def test_server_list_long_option(self):
         arglist = [
             '--long',
@@ -930,8 +1007,9 @@ class TestServerRebuild(TestServer):
         self.cimages_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, password)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
-    def test_rebuild_with_wait_ok(self, mock_wait_for_status):
+    @mock.patch.object(server, '_wait_for_servers',
+                       return_value={'server-id': True})
+    def test_rebuild_with_wait_ok(self, mock_wait_for_servers):
         arglist = [
             '--wait',
             self.server.id,
@@ -945,21 +1023,18 @@ class TestServerRebuild(TestServer):
         # Get the command object to test.
         self.cmd.take_action(parsed_args)
 
-        # kwargs = dict(success_status=['active', 'verify_resize'],)
-
-        mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
-            self.server.id,
-            callback=server._show_progress,
-            # **kwargs
+        mock_wait_for_servers.assert_called_once_with(
+            self.app.client_manager.compute,
+            [self.server.rebuild.return_value],
         )
 
         self.servers_mock.get.assert_called_with(self.server.id)
         self.cimages_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, None)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
-    def test_rebuild_with_wait_fails(self, mock_wait_for_status):
+    @mock.patch.object(server, '_wait_for_servers',
+                       return_value={'server-id': False})
+    def test_rebuild_with_wait_fails(self, mock_wait_for_servers):
         arglist = [
             '--wait',
             self.server.id,
@@ -972,10 +1047,9 @@ class TestServerRebuild(TestServer):
 
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
 
-        mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
-            self.server.id,
-            callback=server._show_progress
+        mock_wait_for_servers.assert_called_once_with(
+            self.app.client_manager.compute,
+            [self.server.rebuild.return_value],
         )
 
         self.servers_mock.get.assert_called_with(self.server.id)
@@ -1204,8 +1278,9 @@ class TestServerResize(TestServer):
         self.servers_mock.revert_resize.assert_called_with(self.server)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
-    def test_server_resize_with_wait_ok(self, mock_wait_for_status):
+    @mock.patch.object(server, '_wait_for_servers',
+                       return_value={'server-id': True})
+    def test_server_resize_with_wait_ok(self, mock_wait_for_servers):
 
         arglist = [
             '--flavor', self.flavors_get_return_value.id,
@@ -1230,10 +1305,9 @@ class TestServerResize(TestServer):
 
         kwargs = dict(success_status=['active', 'verify_resize'],)
 
-        mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
-            self.server.id,
-            callback=server._show_progress,
+        mock_wait_for_servers.assert_called_once_with(
+            self.app.client_manager.compute,
+            [self.server],
             **kwargs
         )
 
@@ -1244,8 +1318,9 @@ class TestServerResize(TestServer):
         self.assertNotCalled(self.servers_mock.confirm_resize)
         self.assertNotCalled(self.servers_mock.revert_resize)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
-    def test_server_resize_with_wait_fails(self, mock_wait_for_status):
+    @mock.patch.object(server, '_wait_for_servers',
+                       return_value={'server-id': False})
+    def test_server_resize_with_wait_fails(self, mock_wait_for_servers):
 
         arglist = [
             '--flavor', self.flavors_get_return_value.id,
@@ -1270,10 +1345,9 @@ class TestServerResize(TestServer):
 
         kwargs = dict(success_status=['active', 'verify_resize'],)
 
-        mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
-            self.server.id,
-            callback=server._show_progress,
+        mock_wait_for_servers.assert_called_once_with(
+            self.app.client_manager.compute,
+            [self.server],
             **kwargs
         )
 
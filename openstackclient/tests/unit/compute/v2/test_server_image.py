@@ -15,6 +15,7 @@ import mock
 from osc_lib import exceptions
 from osc_lib import utils as common_utils
 
+from openstackclient.common import waiter
 from openstackclient.compute.v2 import server_image
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -159,10 +160,11 @@ class TestServerImageCreate(TestServerImage):
         self.assertEqual(self.image_columns(images[0]), columns)
         self.assertEqual(self.image_data(images[0]), data)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
-    def test_server_create_image_wait_fail(self, mock_wait_for_status):
+    @mock.patch.object(waiter.Waiter, 'wait')
+    def test_server_create_image_wait_fail(self, mock_wait):
         servers = self.setup_servers_mock(count=1)
         images = self.setup_images_mock(count=1, servers=servers)
+        mock_wait.return_value = {images[0].id: False}
 
         arglist = [
             '--wait',
@@ -186,16 +188,13 @@ class TestServerImageCreate(TestServerImage):
             servers[0].name,
         )
 
-        mock_wait_for_status.assert_called_once_with(
-            self.images_mock.get,
-            images[0].id,
-            callback=mock.ANY
-        )
+        mock_wait.assert_called_once_with([images[0].id])
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
-    def test_server_create_image_wait_ok(self, mock_wait_for_status):
+    @mock.patch.object(waiter.Waiter, 'wait')
+    def test_server_create_image_wait_ok(self, mock_wait):
         servers = self.setup_servers_mock(count=1)
         images = self.setup_images_mock(count=1, servers=servers)
+        mock_wait.return_value = {images[0].id: True}
 
         arglist = [
             '--wait',
@@ -218,11 +217,7 @@ class TestServerImageCreate(TestServerImage):
             servers[0].name,
         )
 
-        mock_wait_for_status.assert_called_once_with(
-            self.images_mock.get,
-            images[0].id,
-            callback=mock.ANY
-        )
+        mock_wait.assert_called_once_with([images[0].id])
 
         self.assertEqual(self.image_columns(images[0]), columns)
         self.assertEqual(self.image_data(images[0]), data)
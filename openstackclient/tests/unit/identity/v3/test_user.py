@@ -643,6 +643,7 @@ class TestUserList(TestUser):
 
         kwargs = {
             'project': self.project.id,
+            'include_names': True,
         }
 
         self.role_assignments_mock.list.assert_called_with(**kwargs)
@@ -651,6 +652,78 @@ class TestUserList(TestUser):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist, tuple(data))
 
+    def test_user_list_project_names(self):
+        self.role_assignments_mock.list.return_value = [
+            identity_fakes.FakeRoleAssignment.create_one_role_assignment(
+                attrs={'user': {'id': self.user.id, 'name': self.user.name}}),
+            identity_fakes.FakeRoleAssignment.create_one_role_assignment(
+                attrs={'user': {'id': self.user.id, 'name': self.user.name}}),
+        ]
+        arglist = [
+            '--project', self.project.name,
+        ]
+        verifylist = [
+            ('project', self.project.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.users_mock.get.assert_not_called()
+        self.users_mock.list.assert_not_called()
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.datalist, tuple(data))
+
+    @mock.patch('openstackclient.identity.v3.user.USER_LIST_THRESHOLD', 1)
+    def test_user_list_project_long_domain(self):
+        users = [identity_fakes.FakeUser.create_one_user() for i in range(4)]
+        members = [
+            {'id': u.id, 'name': u.name, 'domain': {'id': 'domain-a'}}
+            for u in users[:2]
+        ] + [
+            {'id': users[2].id, 'name': users[2].name,
+             'domain': {'id': 'domain-b'}},
+            {'id': users[3].id},
+        ]
+        self.role_assignments_mock.list.return_value = [
+            identity_fakes.FakeRoleAssignment.create_one_role_assignment(
+                attrs={'user': m}) for m in members
+        ]
+        other = identity_fakes.FakeUser.create_one_user()
+        self.users_mock.list.return_value = [other, users[1], users[0]]
+
+        def _get(user_id):
+            if user_id != users[2].id:
+                raise Exception('Not Found')
+            return users[2]
+
+        self.users_mock.get.side_effect = _get
+        arglist = [
+            '--project', self.project.name,
+            '--long',
+        ]
+        verifylist = [
+            ('project', self.project.name),
+            ('long', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.users_mock.list.assert_called_once_with(domain='domain-a')
+        self.users_mock.get.assert_has_calls(
+            [mock.call(users[2].id), mock.call(users[3].id)],
+            any_order=True,
+        )
+        data = list(data)
+        self.assertEqual(
+            [u.id for u in users],
+            [row[0] for row in data],
+        )
+        self.assertEqual(users[0].email, data[0][5])
+        self.assertEqual(users[2].email, data[2][5])
+        self.assertEqual('', data[3][1])
+
 
 class TestUserSet(TestUser):
 
@@ -313,6 +313,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             detailed=True,
             marker=self._image.id,
@@ -336,6 +338,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             detailed=True,
             public=True,
@@ -360,6 +364,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             detailed=True,
             private=True,
@@ -382,6 +388,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             detailed=True,
             marker=self._image.id,
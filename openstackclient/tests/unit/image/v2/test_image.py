@@ -14,6 +14,11 @@
 #
 
 import copy
+import hashlib
+import io
+import os
+
+import fixtures
 import mock
 
 from glanceclient.v2 import schemas
@@ -337,6 +342,150 @@ class TestImageCreate(TestImage):
             self.cmd.take_action, parsed_args)
 
 
+class TestUploadReader(TestImage):
+
+    def test_read(self):
+        data = os.urandom(image.UPLOAD_BUFFER_SIZE + 100)
+        callback = mock.Mock()
+        reader = image._UploadReader(io.BytesIO(data), len(data), callback)
+
+        # The HTTP client reads smaller chunks than the buffer
+        chunks = list(iter(lambda: reader.read(65536), b''))
+
+        self.assertEqual(data, b''.join(chunks))
+        self.assertTrue(reader.eof)
+        self.assertEqual(len(data), reader.bytes_read)
+        self.assertEqual(hashlib.md5(data).hexdigest(),
+                         reader.md5.hexdigest())
+        self.assertEqual(hashlib.sha512(data).hexdigest(),
+                         reader.sha512.hexdigest())
+        self.assertEqual(
+            [image.UPLOAD_BUFFER_SIZE, len(data)],
+            [c[0][0] for c in callback.call_args_list],
+        )
+
+
+class TestImageCreateUpload(TestImage):
+
+    data = b'image data'
+
+    def setUp(self):
+        super(TestImageCreateUpload, self).setUp()
+
+        self.new_image = image_fakes.FakeImage.create_one_image()
+        self.images_mock.create.return_value = self.new_image
+        self.images_mock.get.return_value = self.new_image
+        self.api_mock = mock.Mock()
+        self.app.client_manager.image.api = self.api_mock
+
+        self.file = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'image')
+        with open(self.file, 'wb') as f:
+            f.write(self.data)
+
+        # Get the command object to test
+        self.cmd = image.CreateImage(self.app, None)
+
+    def _upload(self, image_id, reader):
+        while reader.read(65536):
+            pass
+
+    def test_image_create_verify_checksum(self):
+        self.new_image.checksum = hashlib.md5(self.data).hexdigest()
+        self.images_mock.upload.side_effect = self._upload
+
+        arglist = [
+            '--file', self.file,
+            '--progress',
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('file', self.file),
+            ('progress', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch('sys.stderr') as stderr:
+            self.cmd.take_action(parsed_args)
+
+        self.images_mock.upload.assert_called_once_with(
+            self.new_image.id, mock.ANY)
+        self.assertIn('100% of', stderr.write.call_args_list[0][0][0])
+
+    def test_image_create_checksum_mismatch(self):
+        self.new_image.checksum = 'bad'
+        self.images_mock.upload.side_effect = self._upload
+
+        arglist = [
+            '--file', self.file,
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
+    def test_image_create_import_uri(self):
+        self.api_mock.image_import_methods.return_value = [
+            'glance-direct', 'web-download']
+
+        arglist = [
+            '--uri', 'http://example.com/image.qcow2',
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('uri', 'http://example.com/image.qcow2'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.api_mock.image_import.assert_called_once_with(
+            self.new_image.id,
+            'web-download',
+            uri='http://example.com/image.qcow2',
+        )
+        self.images_mock.upload.assert_not_called()
+        self.api_mock.image_stage.assert_not_called()
+
+    def test_image_create_import_file(self):
+        self.api_mock.image_import_methods.return_value = ['glance-direct']
+        staged = []
+        self.api_mock.image_stage.side_effect = (
+            lambda image_id, data: staged.extend(data))
+
+        arglist = [
+            '--import',
+            '--file', self.file,
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('use_import', True),
+            ('file', self.file),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.data, b''.join(staged))
+        self.api_mock.image_import.assert_called_once_with(
+            self.new_image.id, 'glance-direct')
+        self.images_mock.upload.assert_not_called()
+
+    def test_image_create_import_unsupported(self):
+        self.api_mock.image_import_methods.return_value = []
+
+        arglist = [
+            '--uri', 'http://example.com/image.qcow2',
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.images_mock.create.assert_not_called()
+
+
 class TestAddProjectToImage(TestImage):
 
     project = identity_fakes.FakeProject.create_one_project()
@@ -535,6 +684,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
         )
@@ -558,6 +709,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             public=True,
             marker=self._image.id,
@@ -582,6 +735,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             private=True,
             marker=self._image.id,
@@ -606,6 +761,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             shared=True,
             marker=self._image.id,
@@ -627,6 +784,8 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        # The pages are only fetched as the data is read
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
         )
@@ -661,10 +820,7 @@ class TestImageList(TestImage):
         ), )
         self.assertEqual(datalist, tuple(data))
 
-    @mock.patch('openstackclient.api.utils.simple_filter')
-    def test_image_list_property_option(self, sf_mock):
-        sf_mock.return_value = [copy.deepcopy(self._image)]
-
+    def test_image_list_property_option(self):
         arglist = [
             '--property', 'a=1',
         ]
@@ -677,41 +833,86 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
-        self.api_mock.image_list.assert_called_with(
-            marker=self._image.id,
-        )
-        sf_mock.assert_called_with(
-            [self._image],
-            attr='a',
-            value='1',
-            property_field='properties',
-        )
+        data = list(data)
+        # The filter is sent to the server with every page
+        self.api_mock.image_list.assert_has_calls([
+            mock.call(a='1', marker=None),
+            mock.call(a='1', marker=self._image.id),
+        ])
 
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist, tuple(data))
 
     @mock.patch('osc_lib.utils.sort_items')
     def test_image_list_sort_option(self, si_mock):
-        si_mock.return_value = [copy.deepcopy(self._image)]
-
-        arglist = ['--sort', 'name:asc']
-        verifylist = [('sort', 'name:asc')]
+        arglist = ['--sort', 'name:asc,created_at']
+        verifylist = [('sort', 'name:asc,created_at')]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         # In base command class Lister in cliff, abstract method take_action()
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
         self.api_mock.image_list.assert_called_with(
+            sort='name:asc,created_at:asc',
             marker=self._image.id,
         )
-        si_mock.assert_called_with(
-            [self._image],
-            'name:asc'
-        )
+        # The keys are checked, nothing is sorted locally
+        si_mock.assert_called_once_with([], 'name:asc,created_at')
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist, tuple(data))
 
+    def test_image_list_sort_option_partial(self):
+        images = [
+            {'id': '1', 'name': 'a', 'owner': 'y', 'status': 'active'},
+            {'id': '2', 'name': 'a', 'owner': 'x', 'status': 'active'},
+            {'id': '3', 'name': 'b', 'owner': 'z', 'status': 'active'},
+            {'id': '4', 'name': 'b', 'owner': 'w', 'status': 'active'},
+        ]
+        self.api_mock.image_list.side_effect = [images[:3], images[3:], []]
+
+        arglist = ['--sort', 'name:desc,owner', '--limit', '3']
+        verifylist = [('sort', 'name:desc,owner'), ('limit', 3)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Images of equal name are sorted by owner as they arrive
+        self.assertEqual(['2', '1', '4'], [row[0] for row in data])
+        # The last run only ends with the listing
+        self.api_mock.image_list.assert_called_with(
+            sort='name:desc',
+            limit=3,
+            marker='4',
+        )
+
+    def test_image_list_sort_option_client_side(self):
+        images = [
+            {'id': '1', 'name': 'a', 'owner': 'y', 'status': 'active'},
+            {'id': '2', 'name': 'b', 'owner': 'x', 'status': 'active'},
+        ]
+        self.api_mock.image_list.side_effect = [images, []]
+
+        arglist = ['--sort', 'owner', '--limit', '1']
+        verifylist = [('sort', 'owner'), ('limit', 1)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['2'], [row[0] for row in data])
+        # Every image is fetched in full pages to be sorted
+        self.api_mock.image_list.assert_called_with(marker='2')
+
+    def test_image_list_sort_option_invalid(self):
+        arglist = ['--sort', 'name:up']
+        verifylist = [('sort', 'name:up')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.api_mock.image_list.assert_not_called()
+
     def test_image_list_limit_option(self):
         arglist = [
             '--limit', str(1),
@@ -722,8 +923,11 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
-        self.api_mock.image_list.assert_called_with(
-            limit=1, marker=self._image.id
+        # The pages are only fetched as the data is read
+        data = list(data)
+        # No page past the limit is fetched
+        self.api_mock.image_list.assert_called_once_with(
+            limit=1, marker=None
         )
 
         self.assertEqual(self.columns, columns)
@@ -810,6 +1014,111 @@ class TestRemoveProjectImage(TestImage):
         self.assertIsNone(result)
 
 
+class TestImageSave(TestImage):
+
+    image = image_fakes.FakeImage.create_one_image(
+        {'size': 300, 'checksum': 'abc'})
+
+    def setUp(self):
+        super(TestImageSave, self).setUp()
+
+        self.images_mock.get.return_value = self.image
+        self.api_mock = mock.Mock()
+        self.app.client_manager.image.api = self.api_mock
+        self.file = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'image')
+
+        # Get the command object to test
+        self.cmd = image.SaveImage(self.app, None)
+
+    @mock.patch('glanceclient.common.utils.save_image')
+    def test_image_save(self, save_image):
+        arglist = ['--file', self.file, self.image.id]
+        verifylist = [
+            ('file', self.file),
+            ('parallel', 1),
+            ('image', self.image.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.images_mock.data.assert_called_once_with(self.image.id)
+        save_image.assert_called_once_with(
+            self.images_mock.data.return_value, self.file)
+        self.api_mock.image_download.assert_not_called()
+
+    @mock.patch('glanceclient.common.utils.save_image')
+    def test_image_save_parallel(self, save_image):
+        self.api_mock.image_download.return_value = mock.Mock(
+            hexdigest=mock.Mock(return_value=self.image.checksum))
+        arglist = ['--file', self.file, '--parallel', '4', self.image.id]
+        verifylist = [
+            ('file', self.file),
+            ('parallel', 4),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.api_mock.image_download.assert_called_once_with(
+            self.image.id,
+            self.file,
+            300,
+            checksum=self.image.checksum,
+            workers=4,
+        )
+        save_image.assert_not_called()
+
+    @mock.patch('glanceclient.common.utils.save_image')
+    def test_image_save_resume(self, save_image):
+        open(self.file + '.progress', 'w').close()
+        self.api_mock.image_download.return_value = mock.Mock(
+            hexdigest=mock.Mock(return_value=self.image.checksum))
+        arglist = ['--file', self.file, self.image.id]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.cmd.take_action(parsed_args)
+
+        self.api_mock.image_download.assert_called_once_with(
+            self.image.id,
+            self.file,
+            300,
+            checksum=self.image.checksum,
+            workers=1,
+        )
+        save_image.assert_not_called()
+
+    @mock.patch('glanceclient.common.utils.save_image')
+    def test_image_save_parallel_checksum_mismatch(self, save_image):
+        self.api_mock.image_download.return_value = mock.Mock(
+            hexdigest=mock.Mock(return_value='bad'))
+        arglist = ['--file', self.file, '--parallel', '4', self.image.id]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
+    @mock.patch('glanceclient.common.utils.save_image')
+    def test_image_save_parallel_ranges_not_supported(self, save_image):
+        self.api_mock.image_download.return_value = None
+        arglist = ['--file', self.file, '--parallel', '4', self.image.id]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.cmd.take_action(parsed_args)
+
+        save_image.assert_called_once_with(
+            self.images_mock.data.return_value, self.file)
+
+    def test_image_save_parallel_requires_file(self):
+        arglist = ['--parallel', '4', self.image.id]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.api_mock.image_download.assert_not_called()
+
+
 class TestImageSet(TestImage):
 
     project = identity_fakes.FakeProject.create_one_project()
@@ -0,0 +1,91 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import copy
+import json
+import os
+
+import fixtures
+from osc_lib.tests import utils as osc_lib_utils
+
+from openstackclient import shell
+from openstackclient.tests.unit.integ import base as test_base
+from openstackclient.tests.unit import test_shell
+
+
+PROJECT = {
+    'id': 'p1',
+    'name': 'qaz',
+    'domain_id': 'default',
+    'enabled': True,
+    'description': '',
+    'is_domain': False,
+    'parent_id': 'default',
+}
+
+
+class TestIntegTimingPhases(test_base.TestInteg):
+
+    def setUp(self):
+        super(TestIntegTimingPhases, self).setUp()
+        env = {
+            "OS_AUTH_URL": test_base.V3_AUTH_URL,
+            "OS_PROJECT_NAME": test_shell.DEFAULT_PROJECT_NAME,
+            "OS_USERNAME": test_shell.DEFAULT_USERNAME,
+            "OS_PASSWORD": test_shell.DEFAULT_PASSWORD,
+            "OS_IDENTITY_API_VERSION": "3",
+        }
+        self.useFixture(osc_lib_utils.EnvFixture(copy.deepcopy(env)))
+
+        self.token = test_base.make_v3_token(self.requests_mock)
+        self.token.add_service('identity').add_standard_endpoints(
+            public=test_base.V3_AUTH_URL,
+            admin=test_base.V3_AUTH_URL,
+            internal=test_base.V3_AUTH_URL,
+        )
+        self.requests_mock.register_uri(
+            'POST',
+            test_base.V3_AUTH_URL + 'auth/tokens',
+            json=self.token,
+            status_code=200,
+        )
+
+        # The project is looked up by ID first, then by name
+        self.requests_mock.register_uri(
+            'GET',
+            test_base.V3_AUTH_URL + 'projects/qaz',
+            status_code=404,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            test_base.V3_AUTH_URL + 'projects?name=qaz',
+            json={'projects': [PROJECT]},
+            status_code=200,
+        )
+        self.timing_file = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'timing.json')
+
+    def test_resolve_phase(self):
+        _shell = shell.OpenStackShell()
+        _shell.run(
+            ['--timing-file', self.timing_file, 'project', 'show', 'qaz'])
+
+        with open(self.timing_file) as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertIn('auth', [r['phase'] for r in records])
+        lookups = [r for r in records if '/projects' in r['url']]
+        self.assertEqual(2, len(lookups))
+        self.assertEqual(
+            ['resolve', 'resolve'],
+            [r['phase'] for r in lookups],
+        )
@@ -101,6 +101,26 @@ class FakeNetworkAndComputeShowOne(common.NetworkAndComputeShowOne):
         return client.compute_action(parsed_args)
 
 
+class FakeNetworkAndComputeDelete(common.NetworkAndComputeDelete):
+
+    resource = 'thing'
+
+    def update_parser_common(self, parser):
+        parser.add_argument(
+            'thing',
+            metavar='<thing>',
+            nargs='+',
+            help='Things to delete',
+        )
+        return parser
+
+    def take_action_network(self, client, parsed_args):
+        return client.network_action(self.r)
+
+    def take_action_compute(self, client, parsed_args):
+        return client.compute_action(self.r)
+
+
 class TestNetworkAndCompute(utils.TestCommand):
 
     def setUp(self):
@@ -186,3 +206,73 @@ class TestNetworkAndComputeShowOne(TestNetworkAndCompute):
             m_action.side_effect = openstack.exceptions.HttpException("bar")
             self.assertRaisesRegex(exceptions.CommandError, "bar",
                                    self.cmd.take_action, mock.Mock())
+
+
+class TestNetworkAndComputeDelete(utils.TestCommand):
+
+    def setUp(self):
+        super(TestNetworkAndComputeDelete, self).setUp()
+        self.app.client_manager.network = mock.Mock()
+        self.network = self.app.client_manager.network
+        self.app.client_manager.compute = mock.Mock()
+        self.compute = self.app.client_manager.compute
+        self.cmd = FakeNetworkAndComputeDelete(self.app, argparse.Namespace())
+
+    def test_delete_network(self):
+        arglist = ['a', 'b', 'c']
+        verifylist = [('thing', arglist), ('parallel', 1)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertIsNone(self.cmd.take_action(parsed_args))
+        self.assertEqual(
+            [mock.call('a'), mock.call('b'), mock.call('c')],
+            self.network.network_action.call_args_list,
+        )
+        self.assertNotCalled(self.compute.compute_action)
+
+    def test_delete_compute_parallel(self):
+        arglist = ['a', 'b', 'c', '--parallel', '3']
+        verifylist = [('thing', ['a', 'b', 'c']), ('parallel', 3)]
+        self.app.client_manager.network_endpoint_enabled = False
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertIsNone(self.cmd.take_action(parsed_args))
+        self.assertEqual(
+            ['a', 'b', 'c'],
+            sorted(c[0][0] for c in
+                   self.compute.compute_action.call_args_list),
+        )
+
+    def test_delete_parallel_partial_failure(self):
+        def _action(r):
+            if r == 'b':
+                raise exceptions.NotFound('b')
+
+        self.network.network_action.side_effect = _action
+        arglist = ['a', 'b', 'c', '--parallel', '2']
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaisesRegex(
+            exceptions.CommandError,
+            '1 of 3 things failed to delete.',
+            self.cmd.take_action,
+            parsed_args,
+        )
+        self.assertEqual(3, self.network.network_action.call_count)
+
+    def test_delete_resource_per_instance(self):
+        other = FakeNetworkAndComputeDelete(self.app, argparse.Namespace())
+        self.cmd.r = 'a'
+        other.r = 'b'
+
+        self.assertEqual('a', self.cmd.r)
+        self.assertEqual('b', other.r)
+
+    def test_delete_parallel_invalid(self):
+        self.assertRaises(
+            utils.ParserException,
+            self.check_parser,
+            self.cmd,
+            ['a', '--parallel', '0'],
+            [],
+        )
@@ -1074,6 +1074,27 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
+    def test_list_streams_rules(self):
+        read = []
+
+        def _rules(**query):
+            for rule in self._security_group_rules:
+                read.append(rule)
+                yield rule
+
+        self.network.security_group_rules.side_effect = _rules
+        parsed_args = self.check_parser(self.cmd, [], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Nothing is read until the output is written
+        self.assertEqual([], read)
+        self.assertEqual(self.expected_data_no_group[0], next(data))
+        self.assertEqual(1, len(read))
+        self.assertEqual(self.expected_data_no_group[1:], list(data))
+        # The rules are not modified
+        self.assertEqual(80, self._security_group_rule_tcp.port_range_min)
+
     def test_list_with_group_and_long(self):
         self._security_group_rule_tcp.port_range_min = 80
         arglist = [
@@ -15,6 +15,7 @@
 
 import copy
 import mock
+from osc_lib import exceptions
 
 from openstackclient.api import object_store_v1 as object_store
 from openstackclient.object.v1 import container
@@ -80,7 +81,7 @@ class TestContainerDelete(TestContainer):
 
     def test_recursive_delete(self, c_mock, o_list_mock, o_delete_mock):
         c_mock.return_value = None
-        o_list_mock.return_value = [object_fakes.OBJECT]
+        o_list_mock.side_effect = [[object_fakes.OBJECT], []]
         o_delete_mock.return_value = None
 
         arglist = [
@@ -100,7 +101,14 @@ class TestContainerDelete(TestContainer):
             container=object_fakes.container_name,
             **kwargs
         )
-        o_list_mock.assert_called_with(container=object_fakes.container_name)
+        o_list_mock.assert_called_with(
+            container=object_fakes.container_name,
+            marker=object_fakes.OBJECT['name'],
+            limit=None,
+            end_marker=None,
+            prefix=None,
+            delimiter=None,
+        )
         o_delete_mock.assert_called_with(
             container=object_fakes.container_name,
             object=object_fakes.OBJECT['name'],
@@ -108,7 +116,7 @@ class TestContainerDelete(TestContainer):
 
     def test_r_delete(self, c_mock, o_list_mock, o_delete_mock):
         c_mock.return_value = None
-        o_list_mock.return_value = [object_fakes.OBJECT]
+        o_list_mock.side_effect = [[object_fakes.OBJECT], []]
         o_delete_mock.return_value = None
 
         arglist = [
@@ -128,12 +136,111 @@ class TestContainerDelete(TestContainer):
             container=object_fakes.container_name,
             **kwargs
         )
-        o_list_mock.assert_called_with(container=object_fakes.container_name)
+        o_list_mock.assert_called_with(
+            container=object_fakes.container_name,
+            marker=object_fakes.OBJECT['name'],
+            limit=None,
+            end_marker=None,
+            prefix=None,
+            delimiter=None,
+        )
         o_delete_mock.assert_called_with(
             container=object_fakes.container_name,
             object=object_fakes.OBJECT['name'],
         )
 
+    @mock.patch('openstackclient.api.object_store_v1.APIv1.'
+                'object_iter_parallel')
+    def test_recursive_delete_parallel(self, o_iter_mock, c_mock,
+                                       o_list_mock, o_delete_mock):
+        o_iter_mock.return_value = iter([object_fakes.OBJECT])
+
+        arglist = [
+            '--recursive',
+            '--parallel', '4',
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('containers', [object_fakes.container_name]),
+            ('recursive', True),
+            ('parallel', 4),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertIsNone(self.cmd.take_action(parsed_args))
+
+        o_iter_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            workers=4,
+        )
+        o_delete_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            object=object_fakes.OBJECT['name'],
+        )
+        c_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+        )
+
+    @mock.patch('openstackclient.api.object_store_v1.APIv1.'
+                'object_delete_many')
+    def test_recursive_delete_failed(self, o_delete_many_mock, c_mock,
+                                     o_list_mock, o_delete_mock):
+        o_list_mock.side_effect = [[object_fakes.OBJECT], []]
+        o_delete_many_mock.side_effect = [
+            [(object_fakes.object_name_1, '409 Conflict')],
+            [],
+        ]
+
+        arglist = [
+            '--recursive',
+            'c1',
+            'c2',
+        ]
+        verifylist = [
+            ('containers', ['c1', 'c2']),
+            ('recursive', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 of 2 containers failed to delete.', str(e))
+
+        # The container still holding objects is not deleted
+        c_mock.assert_called_once_with(container='c2')
+
+    @mock.patch('openstackclient.api.object_store_v1.APIv1.'
+                'object_iter_parallel')
+    def test_recursive_delete_list_and_delete_failed(
+            self, o_iter_mock, c_mock, o_list_mock, o_delete_mock):
+        def _objects(container=None, workers=1):
+            if container == 'c1':
+                raise exceptions.NotFound('c1')
+            return iter([])
+
+        o_iter_mock.side_effect = _objects
+        c_mock.side_effect = [exceptions.Conflict('c2'), None]
+
+        arglist = [
+            '--recursive',
+            'c1',
+            'c2',
+            'c3',
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('2 of 3 containers failed to delete.', str(e))
+
+        # Every container is still tried
+        c_mock.assert_has_calls(
+            [mock.call(container='c2'), mock.call(container='c3')])
+
 
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.container_list'
@@ -325,10 +432,15 @@ class TestContainerList(TestContainer):
         self.assertEqual(datalist, tuple(data))
 
     def test_object_list_containers_all(self, c_mock):
-        c_mock.return_value = [
-            copy.deepcopy(object_fakes.CONTAINER),
-            copy.deepcopy(object_fakes.CONTAINER_2),
-            copy.deepcopy(object_fakes.CONTAINER_3),
+        c_mock.side_effect = [
+            [
+                copy.deepcopy(object_fakes.CONTAINER),
+                copy.deepcopy(object_fakes.CONTAINER_2),
+            ],
+            [
+                copy.deepcopy(object_fakes.CONTAINER_3),
+            ],
+            [],
         ]
 
         arglist = [
@@ -344,14 +456,8 @@ class TestContainerList(TestContainer):
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
 
-        # Set expected values
-        kwargs = {
-            'full_listing': True,
-        }
-        c_mock.assert_called_with(
-            **kwargs
-        )
-
+        # The listing is fetched as the data is read
+        c_mock.assert_not_called()
         self.assertEqual(self.columns, columns)
         datalist = (
             (object_fakes.container_name, ),
@@ -360,6 +466,70 @@ class TestContainerList(TestContainer):
         )
         self.assertEqual(datalist, tuple(data))
 
+        kwargs = {
+            'limit': None,
+            'end_marker': None,
+            'prefix': None,
+        }
+        c_mock.assert_has_calls([
+            mock.call(marker=None, **kwargs),
+            mock.call(marker=object_fakes.container_name_2, **kwargs),
+            mock.call(marker=object_fakes.container_name_3, **kwargs),
+        ])
+
+
+@mock.patch(
+    'openstackclient.api.object_store_v1.APIv1.container_save'
+)
+class TestContainerSave(TestContainer):
+
+    def setUp(self):
+        super(TestContainerSave, self).setUp()
+
+        # Get the command object to test
+        self.cmd = container.SaveContainer(self.app, None)
+
+    def test_container_save(self, c_mock):
+        c_mock.return_value = []
+
+        arglist = [
+            '--parallel', '8',
+            '--chunk-size', '65536',
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('parallel', 8),
+            ('chunk_size', 65536),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertIsNone(self.cmd.take_action(parsed_args))
+
+        c_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            workers=8,
+            chunk_size=65536,
+        )
+
+    def test_container_save_failed(self, c_mock):
+        c_mock.return_value = [(object_fakes.object_name_1, 'Not Found')]
+
+        arglist = [
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('parallel', 1),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 objects failed to save.', str(e))
+
 
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.container_show'
@@ -14,7 +14,11 @@
 #
 
 import copy
+import os
+
+import fixtures
 import mock
+from osc_lib import exceptions
 
 from openstackclient.api import object_store_v1 as object_store
 from openstackclient.object.v1 import object as obj
@@ -36,6 +40,136 @@ class TestObject(object_fakes.TestObjectv1):
         self.api = self.app.client_manager.object_store
 
 
+@mock.patch(
+    'openstackclient.api.object_store_v1.APIv1.object_create'
+)
+class TestObjectCreate(TestObject):
+
+    def setUp(self):
+        super(TestObjectCreate, self).setUp()
+
+        # Get the command object to test
+        self.cmd = obj.CreateObject(self.app, None)
+
+    def test_object_create_segmented(self, o_mock):
+        o_mock.return_value = {
+            'object': object_fakes.object_name_1,
+            'container': object_fakes.container_name,
+            'etag': 'manifest',
+        }
+
+        arglist = [
+            '--segment-size', '1048576',
+            '--parallel', '4',
+            object_fakes.container_name,
+            object_fakes.object_name_1,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('objects', [object_fakes.object_name_1]),
+            ('segment_size', 1048576),
+            ('parallel', 4),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        o_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            object=object_fakes.object_name_1,
+            name=object_fakes.object_name_1,
+            segment_size=1048576,
+            workers=4,
+        )
+        self.assertEqual(('object', 'container', 'etag'), columns)
+        self.assertEqual(
+            [(object_fakes.object_name_1, object_fakes.container_name,
+              'manifest')],
+            list(data),
+        )
+
+
+class TestObjectCreateRecursive(TestObject):
+
+    def setUp(self):
+        super(TestObjectCreateRecursive, self).setUp()
+
+        self.tmp = self.useFixture(fixtures.TempDir()).path
+        os.mkdir(os.path.join(self.tmp, 'sub'))
+        self.files = [
+            os.path.join(self.tmp, 'a'),
+            os.path.join(self.tmp, 'sub', 'b'),
+            os.path.join(self.tmp, 'z'),
+        ]
+        for path in self.files:
+            with open(path, 'wb') as f:
+                f.write(b'data')
+        self.create_mock = mock.patch.object(
+            self.api, 'object_create_many').start()
+        self.stderr = mock.patch('sys.stderr').start()
+        self.addCleanup(mock.patch.stopall)
+
+        # Get the command object to test
+        self.cmd = obj.CreateObject(self.app, None)
+
+    def test_object_create_recursive(self):
+        self.create_mock.return_value = [
+            (self.files[0], {'object': self.files[0], 'etag': 'e'}, None),
+            (self.files[1], None, None),
+            (self.files[2], {'object': self.files[2], 'etag': 'f'}, None),
+        ]
+
+        arglist = [
+            '--recursive',
+            '--parallel', '8',
+            object_fakes.container_name,
+            self.tmp,
+        ]
+        verifylist = [
+            ('recursive', True),
+            ('parallel', 8),
+            ('objects', [self.tmp]),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.create_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            objects=self.files,
+            segment_size=None,
+            workers=8,
+            skip_unchanged=True,
+        )
+        self.assertEqual(
+            [(self.files[0], '', 'e'), (self.files[2], '', 'f')],
+            list(data),
+        )
+        report = self.stderr.write.call_args[0][0]
+        self.assertIn('Uploaded 2 files (8 bytes)', report)
+        self.assertIn('1 unchanged files skipped', report)
+
+    def test_object_create_recursive_failed(self):
+        self.create_mock.return_value = [
+            (self.files[0], None, Exception('Conflict')),
+            (self.files[1], None, None),
+            (self.files[2], {'object': self.files[2], 'etag': 'f'}, None),
+        ]
+
+        arglist = [
+            '--recursive',
+            object_fakes.container_name,
+            self.tmp,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 of 3 files failed to upload.', str(e))
+
+
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.object_list'
 )
@@ -294,9 +428,12 @@ class TestObjectList(TestObject):
         self.assertEqual(datalist, tuple(data))
 
     def test_object_list_objects_all(self, o_mock):
-        o_mock.return_value = [
-            copy.deepcopy(object_fakes.OBJECT),
-            copy.deepcopy(object_fakes.OBJECT_2),
+        o_mock.side_effect = [
+            [
+                copy.deepcopy(object_fakes.OBJECT),
+                copy.deepcopy(object_fakes.OBJECT_2),
+            ],
+            [],
         ]
 
         arglist = [
@@ -314,15 +451,8 @@ class TestObjectList(TestObject):
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
 
-        # Set expected values
-        kwargs = {
-            'full_listing': True,
-        }
-        o_mock.assert_called_with(
-            container=object_fakes.container_name,
-            **kwargs
-        )
-
+        # The listing is fetched as the data is read
+        o_mock.assert_not_called()
         self.assertEqual(self.columns, columns)
         datalist = (
             (object_fakes.object_name_1, ),
@@ -330,6 +460,60 @@ class TestObjectList(TestObject):
         )
         self.assertEqual(datalist, tuple(data))
 
+        kwargs = {
+            'container': object_fakes.container_name,
+            'limit': None,
+            'end_marker': None,
+            'prefix': None,
+            'delimiter': None,
+        }
+        o_mock.assert_has_calls([
+            mock.call(marker=None, **kwargs),
+            mock.call(marker=object_fakes.object_name_2, **kwargs),
+        ])
+
+    def test_object_list_objects_all_parallel(self, o_mock):
+        listing = {
+            # The pseudo-directory level used to split the listing
+            ('', '/'): [{'subdir': 'a/'}, {'name': 'b'}, {'subdir': 'c/'}],
+            ('a/', None): [{'name': 'a/1'}, {'name': 'a/2'}],
+            ('c/', None): [{'name': 'c/1'}],
+        }
+
+        def _object_list(container, prefix, delimiter, marker=None,
+                         **kwargs):
+            if marker:
+                return []
+            return listing[(prefix, delimiter)]
+
+        o_mock.side_effect = _object_list
+
+        arglist = [
+            '--all',
+            '--parallel', '2',
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('all', True),
+            ('parallel', 2),
+            ('container', object_fakes.container_name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            (('a/1', ), ('a/2', ), ('b', ), ('c/1', )),
+            tuple(data),
+        )
+        o_mock.assert_any_call(
+            container=object_fakes.container_name,
+            prefix='',
+            delimiter='/',
+            limit=1000,
+        )
+
 
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.object_show'
@@ -601,6 +601,42 @@ class TestVolumeList(TestVolume):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist, tuple(data))
 
+    def test_volume_list_server_name_lookup(self):
+        compute_client = mock.Mock()
+        compute_client.servers.get.return_value = mock.Mock()
+        compute_client.servers.get.return_value.name = 'server-name'
+        self.app.client_manager.compute = compute_client
+        arglist = []
+        verifylist = [
+            ('no_name_lookup', False),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        compute_client.servers.list.assert_not_called()
+        compute_client.servers.get.assert_called_once_with(self.server)
+        self.assertEqual(
+            'Attached to server-name on %s ' % self.device,
+            tuple(data)[0][4],
+        )
+
+    def test_volume_list_no_name_lookup(self):
+        compute_client = mock.Mock()
+        self.app.client_manager.compute = compute_client
+        arglist = [
+            '--no-name-lookup',
+        ]
+        verifylist = [
+            ('no_name_lookup', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.datalist, tuple(data))
+        compute_client.servers.get.assert_not_called()
+
     def test_volume_list_name(self):
         arglist = [
             '--name', self._volume.display_name,
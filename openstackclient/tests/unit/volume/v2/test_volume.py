@@ -689,6 +689,49 @@ class TestVolumeList(TestVolume):
         ), )
         self.assertEqual(datalist, tuple(data))
 
+    def test_volume_list_server_name_lookup(self):
+        compute_client = mock.Mock()
+        compute_client.servers.get.return_value = mock.Mock()
+        compute_client.servers.get.return_value.name = 'server-name'
+        self.app.client_manager.compute = compute_client
+        arglist = []
+        verifylist = [
+            ('no_name_lookup', False),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        compute_client.servers.list.assert_not_called()
+        server = self.mock_volume.attachments[0]['server_id']
+        device = self.mock_volume.attachments[0]['device']
+        compute_client.servers.get.assert_called_once_with(server)
+        self.assertEqual(
+            'Attached to server-name on %s ' % device,
+            tuple(data)[0][4],
+        )
+
+    def test_volume_list_no_name_lookup(self):
+        compute_client = mock.Mock()
+        self.app.client_manager.compute = compute_client
+        arglist = [
+            '--no-name-lookup',
+        ]
+        verifylist = [
+            ('no_name_lookup', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        server = self.mock_volume.attachments[0]['server_id']
+        device = self.mock_volume.attachments[0]['device']
+        self.assertEqual(
+            'Attached to %s on %s ' % (server, device),
+            tuple(data)[0][4],
+        )
+        compute_client.servers.get.assert_not_called()
+
     def test_volume_list_project(self):
         arglist = [
             '--project', self.project.name,
@@ -0,0 +1,64 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Common helpers for the Volume v1 and v2 commands"""
+
+import logging
+
+from openstackclient.common import parallel
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+# Concurrent requests when looking up the servers volumes are attached to
+SERVER_LOOKUP_WORKERS = 8
+
+
+def add_no_name_lookup_option(parser):
+    parser.add_argument(
+        '--no-name-lookup',
+        action='store_true',
+        default=False,
+        help=_('Skip server name lookup, show server IDs instead'),
+    )
+
+
+def get_attached_server_names(compute_client, volumes):
+    """Return a dict mapping the IDs of attached servers to their names
+
+    Only the servers the volumes are attached to are fetched, each one
+    once and several at a time.  Servers that cannot be fetched are left
+    out so their IDs are shown instead.
+
+    :param compute_client: a compute client
+    :param volumes: a list of volumes
+    """
+
+    server_ids = set()
+    for volume in volumes:
+        for attachment in getattr(volume, 'attachments', None) or []:
+            if attachment.get('server_id'):
+                server_ids.add(attachment['server_id'])
+
+    def _get_name(server_id):
+        return compute_client.servers.get(server_id).name
+
+    names = {}
+    for server_id, name, e in parallel.execute(
+            _get_name, sorted(server_ids), SERVER_LOOKUP_WORKERS):
+        if e is None:
+            names[server_id] = name
+        else:
+            LOG.debug("Unable to look up server %s: %s", server_id, e)
+    return names
@@ -24,7 +24,9 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
+from openstackclient.volume import common as volume_common
 
 
 LOG = logging.getLogger(__name__)
@@ -195,25 +197,27 @@ class DeleteVolume(command.Command):
             help=_('Attempt forced removal of volume(s), regardless of state '
                    '(defaults to False)'),
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         volume_client = self.app.client_manager.volume
-        result = 0
 
-        for i in parsed_args.volumes:
-            try:
-                volume_obj = utils.find_resource(
-                    volume_client.volumes, i)
-                if parsed_args.force:
-                    volume_client.volumes.force_delete(volume_obj.id)
-                else:
-                    volume_client.volumes.delete(volume_obj.id)
-            except Exception as e:
-                result += 1
-                LOG.error(_("Failed to delete volume with "
-                            "name or ID '%(volume)s': %(e)s"),
-                          {'volume': i, 'e': e})
+        def _delete(i):
+            volume_obj = utils.find_resource(
+                volume_client.volumes, i)
+            if parsed_args.force:
+                volume_client.volumes.force_delete(volume_obj.id)
+            else:
+                volume_client.volumes.delete(volume_obj.id)
+
+        result = 0
+        for i, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.volumes, parsed_args.parallel)):
+            result += 1
+            LOG.error(_("Failed to delete volume with "
+                        "name or ID '%(volume)s': %(e)s"),
+                      {'volume': i, 'e': e})
 
         if result > 0:
             total = len(parsed_args.volumes)
@@ -256,6 +260,7 @@ class ListVolume(command.Lister):
             metavar='<limit>',
             help=_('Maximum number of volumes to display'),
         )
+        volume_common.add_no_name_lookup_option(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -273,8 +278,7 @@ class ListVolume(command.Lister):
             msg = ''
             for attachment in attachments:
                 server = attachment['server_id']
-                if server in server_cache.keys():
-                    server = server_cache[server].name
+                server = server_names.get(server, server)
                 device = attachment['device']
                 msg += 'Attached to %s on %s ' % (server, device)
             return msg
@@ -316,15 +320,6 @@ class ListVolume(command.Lister):
                 'Attached to',
             )
 
-        # Cache the server list
-        server_cache = {}
-        try:
-            for s in compute_client.servers.list():
-                server_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-
         search_opts = {
             'all_tenants': parsed_args.all_projects,
             'display_name': parsed_args.name,
@@ -336,6 +331,19 @@ class ListVolume(command.Lister):
             limit=parsed_args.limit,
         )
 
+        # Only look up the names of the servers the volumes are attached
+        # to, and only if the "Attached to" column is going to be shown.
+        server_names = {}
+        selected = getattr(parsed_args, 'columns', None)
+        if not parsed_args.no_name_lookup and (
+                not selected or 'Attached to' in selected):
+            try:
+                server_names = volume_common.get_attached_server_names(
+                    compute_client, data)
+            except Exception:
+                # Just forget it if there's any trouble
+                pass
+
         return (column_headers,
                 (utils.get_item_properties(
                     s, columns,
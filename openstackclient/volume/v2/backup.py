@@ -23,6 +23,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -128,22 +129,24 @@ class DeleteVolumeBackup(command.Command):
             default=False,
             help=_("Allow delete in state other than error or available")
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         volume_client = self.app.client_manager.volume
-        result = 0
 
-        for i in parsed_args.backups:
-            try:
-                backup_id = utils.find_resource(
-                    volume_client.backups, i).id
-                volume_client.backups.delete(backup_id, parsed_args.force)
-            except Exception as e:
-                result += 1
-                LOG.error(_("Failed to delete backup with "
-                            "name or ID '%(backup)s': %(e)s")
-                          % {'backup': i, 'e': e})
+        def _delete(i):
+            backup_id = utils.find_resource(
+                volume_client.backups, i).id
+            volume_client.backups.delete(backup_id, parsed_args.force)
+
+        result = 0
+        for i, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.backups, parsed_args.parallel)):
+            result += 1
+            LOG.error(_("Failed to delete backup with "
+                        "name or ID '%(backup)s': %(e)s")
+                      % {'backup': i, 'e': e})
 
         if result > 0:
             total = len(parsed_args.backups)
@@ -23,6 +23,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -98,22 +99,24 @@ class DeleteVolumeSnapshot(command.Command):
             nargs="+",
             help=_("Snapshot(s) to delete (name or ID)")
         )
+        parallel.add_parallel_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         volume_client = self.app.client_manager.volume
-        result = 0
 
-        for i in parsed_args.snapshots:
-            try:
-                snapshot_id = utils.find_resource(
-                    volume_client.volume_snapshots, i).id
-                volume_client.volume_snapshots.delete(snapshot_id)
-            except Exception as e:
-                result += 1
-                LOG.error(_("Failed to delete snapshot with "
-                            "name or ID '%(snapshot)s': %(e)s")
-                          % {'snapshot': i, 'e': e})
+        def _delete(i):
+            snapshot_id = utils.find_resource(
+                volume_client.volume_snapshots, i).id
+            volume_client.volume_snapshots.delete(snapshot_id)
+
+        result = 0
+        for i, e in parallel.failures(parallel.execute(
+                _delete, parsed_args.snapshots, parsed_args.parallel)):
+            result += 1
+            LOG.error(_("Failed to delete snapshot with "
+                        "name or ID '%(snapshot)s': %(e)s")
+                      % {'snapshot': i, 'e': e})
 
         if result > 0:
             total = len(parsed_args.snapshots)
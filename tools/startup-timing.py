@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Measure OpenStackClient startup latency
+
+Runs a command that needs no cloud, ``server list --help`` by default,
+several times with an empty cache directory (cold) and with a primed
+entry point index (warm) and prints the minimum, median and maximum
+wall-clock time of each.
+
+Usage: tools/startup-timing.py [--runs N] [command words...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_once(argv, cache_home):
+    env = dict(os.environ)
+    env['XDG_CACHE_HOME'] = cache_home
+    start = time.time()
+    with open(os.devnull, 'w') as devnull:
+        subprocess.check_call(argv, env=env, stdout=devnull, stderr=devnull)
+    return time.time() - start
+
+
+def report(label, times):
+    times = sorted(times)
+    print('%-5s min %.3fs  median %.3fs  max %.3fs' % (
+        label,
+        times[0],
+        times[len(times) // 2],
+        times[-1],
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('command', nargs='*',
+                        default=['server', 'list', '--help'])
+    args = parser.parse_args()
+
+    argv = [sys.executable, '-m', 'openstackclient.shell'] + args.command
+    print('Timing: openstack %s' % ' '.join(args.command))
+
+    cold = []
+    for _ in range(args.runs):
+        cache_home = tempfile.mkdtemp()
+        try:
+            cold.append(run_once(argv, cache_home))
+        finally:
+            shutil.rmtree(cache_home)
+
+    warm = []
+    cache_home = tempfile.mkdtemp()
+    try:
+        # Prime the index
+        run_once(argv, cache_home)
+        for _ in range(args.runs):
+            warm.append(run_once(argv, cache_home))
+    finally:
+        shutil.rmtree(cache_home)
+
+    report('cold', cold)
+    report('warm', warm)
+
+
+if __name__ == '__main__':
+    main()